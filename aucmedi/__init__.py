@@ -72,9 +72,16 @@ Build your state-of-the-art medical image classification pipeline with the 3 AUC
 #-----------------------------------------------------#
 #                   Library imports                   #
 #-----------------------------------------------------#
-from aucmedi.data_processing.io_data import input_interface
-from aucmedi.data_processing.data_generator import DataGenerator
-from aucmedi.data_processing.augmentation import ImageAugmentation, \
-                                                 VolumeAugmentation, \
-                                                 BatchgeneratorsAugmentation
-from aucmedi.neural_network.model import NeuralNetwork
+# Pillars are imported on first access for a fast startup (PEP 562)
+from aucmedi.utils.lazy_import import lazy_attributes
+__getattr__, __dir__ = lazy_attributes(globals(), {
+    "input_interface": "aucmedi.data_processing.io_data",
+    "DataGenerator": "aucmedi.data_processing.data_generator",
+    "ImageAugmentation": "aucmedi.data_processing.augmentation",
+    "VolumeAugmentation": "aucmedi.data_processing.augmentation",
+    "BatchgeneratorsAugmentation": "aucmedi.data_processing.augmentation",
+    "NeuralNetwork": "aucmedi.neural_network.model",
+})
+__all__ = ["input_interface", "DataGenerator", "ImageAugmentation",
+           "VolumeAugmentation", "BatchgeneratorsAugmentation",
+           "NeuralNetwork", "data_processing", "neural_network"]
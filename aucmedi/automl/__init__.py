@@ -45,10 +45,15 @@ More information can be found in the docs: [Documentation - AutoML](../../automl
 #-----------------------------------------------------#
 #                   Library imports                   #
 #-----------------------------------------------------#
-# Block functions
-from aucmedi.automl.block_train import block_train
-from aucmedi.automl.block_pred import block_predict
-from aucmedi.automl.block_eval import block_evaluate
-# Parser
-from aucmedi.automl.parser_yaml import parse_yaml
-from aucmedi.automl.parser_cli import parse_cli
+# Block functions & parser are imported on first access (PEP 562)
+from aucmedi.utils.lazy_import import lazy_attributes
+__getattr__, __dir__ = lazy_attributes(globals(), {
+    "block_train": "aucmedi.automl.block_train",
+    "block_predict": "aucmedi.automl.block_pred",
+    "block_evaluate": "aucmedi.automl.block_eval",
+    "parse_yaml": "aucmedi.automl.parser_yaml",
+    "parse_cli": "aucmedi.automl.parser_cli",
+})
+__all__ = ["block_train", "block_predict", "block_evaluate", "parse_yaml",
+           "parse_cli", "block_pred", "block_eval", "parser_yaml",
+           "parser_cli"]
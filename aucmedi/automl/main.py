@@ -33,8 +33,9 @@ More information can be found in the docs: [Documentation - AutoML](../../../aut
 # External libraries
 import sys
 # Internal libraries
-from aucmedi.automl import *
 from aucmedi.automl.cli import *
+from aucmedi.automl.parser_yaml import parse_yaml
+from aucmedi.automl.parser_cli import parse_cli
 
 #-----------------------------------------------------#
 #                Main Method - Runner                 #
@@ -63,11 +64,17 @@ def main():
     else : config = parse_cli(args)
 
     # Run training pipeline
-    if config["hub"] == "training" : block_train(config)
+    if config["hub"] == "training":
+        from aucmedi.automl.block_train import block_train
+        block_train(config)
     # Run prediction pipeline
-    if config["hub"] == "prediction" : block_predict(config)
+    if config["hub"] == "prediction":
+        from aucmedi.automl.block_pred import block_predict
+        block_predict(config)
     # Run evaluation pipeline
-    if config["hub"] == "evaluation" : block_evaluate(config)
+    if config["hub"] == "evaluation":
+        from aucmedi.automl.block_eval import block_evaluate
+        block_evaluate(config)
 
 # Runner for direct script call
 if __name__ == "__main__":
@@ -85,6 +85,14 @@ instead of meaningless characteristics due to a small data set size.
 #-----------------------------------------------------#
 #                   Library imports                   #
 #-----------------------------------------------------#
-from aucmedi.data_processing.augmentation.aug_image import ImageAugmentation
-from aucmedi.data_processing.augmentation.aug_volume import VolumeAugmentation
-from aucmedi.data_processing.augmentation.aug_batchgenerators import BatchgeneratorsAugmentation
+# Augmentation backends are imported on first access (PEP 562)
+from aucmedi.utils.lazy_import import lazy_attributes
+__getattr__, __dir__ = lazy_attributes(globals(), {
+    "ImageAugmentation": "aucmedi.data_processing.augmentation.aug_image",
+    "VolumeAugmentation": "aucmedi.data_processing.augmentation.aug_volume",
+    "BatchgeneratorsAugmentation": \
+        "aucmedi.data_processing.augmentation.aug_batchgenerators",
+})
+__all__ = ["ImageAugmentation", "VolumeAugmentation",
+           "BatchgeneratorsAugmentation", "aug_image", "aug_volume",
+           "aug_batchgenerators"]
@@ -21,15 +21,22 @@
 #-----------------------------------------------------#
 # External libraries
 from tensorflow.keras.utils import Sequence
+import tensorflow as tf
 import numpy as np
 from multiprocessing.pool import ThreadPool
+from multiprocessing import shared_memory
+import multiprocessing as mp
 from itertools import repeat
+import threading
 import tempfile
-import pickle
-import os
+import weakref
 # Internal libraries
-from aucmedi.data_processing.io_loader import image_loader
-from aucmedi.data_processing.subfunctions import Standardize, Resize
+from aucmedi.data_processing.io_loader import image_loader, archive_loader
+from aucmedi.data_processing.prepared_store import PreparedImageStore
+from aucmedi.data_processing.preprocessing_cache import PreprocessingCache, \
+                                                    MemoryCache
+from aucmedi.data_processing.subfunctions import Standardize, Resize, \
+                                                 SubfunctionPipeline
 
 #-----------------------------------------------------#
 #                 Keras Data Generator                #
@@ -89,6 +96,8 @@ class DataGenerator(Sequence):
 
     It supports real-time batch generation as well as beforehand preprocessing of images,
     which are then temporarily stored on disk (requires enough disk space!).
+    Prepared images are stored in a single memory-mapped file via the
+    [PreparedImageStore][aucmedi.data_processing.prepared_store.PreparedImageStore].
 
     The resulting batches are created based the following pipeline:
 
@@ -132,8 +141,11 @@ class DataGenerator(Sequence):
                  image_format=None, subfunctions=[], batch_size=32,
                  resize=(224, 224), standardize_mode="z-score", data_aug=None,
                  shuffle=False, grayscale=False, sample_weights=None, workers=1,
-                 prepare_images=False, loader=image_loader, seed=None,
-                 **kwargs):
+                 worker_backend="thread", prefetch=0, prepare_images=False,
+                 cache_dir=None, memory_cache_size=None, standardize_batch=False,
+                 standardize_validate=True, patch_shape=None,
+                 patch_mode="random", batch_dtype=None, loader=image_loader,
+                 seed=None, **kwargs):
         """ Initialization function of the DataGenerator which acts as a configuration hub.
 
         If using for prediction, the 'labels' parameter has to be `None`.
@@ -156,6 +168,7 @@ class DataGenerator(Sequence):
             | [sitk_loader()][aucmedi.data_processing.io_loader.sitk_loader]   | SimpleITK Loader for loading NIfTI (nii) or Metafile (mha) formats.    |
             | [numpy_loader()][aucmedi.data_processing.io_loader.numpy_loader] | NumPy Loader for image loading of .npy files.    |
             | [cache_loader()][aucmedi.data_processing.io_loader.cache_loader] | Cache Loader for passing already loaded images. |
+            | [archive_loader()][aucmedi.data_processing.io_loader.archive_loader] | Archive Loader for loading samples from a sharded dataset archive. |
 
             More information on IO_loader functions can be found here: [aucmedi.data_processing.io_loader][]. <br>
             Parameters defined in `**kwargs` are passed down to IO_loader functions.
@@ -181,11 +194,46 @@ class DataGenerator(Sequence):
             sample_weights (list of float):     List of weights for samples. Can be computed via
                                                 [compute_sample_weights()][aucmedi.utils.class_weights.compute_sample_weights].
             workers (int):                      Number of workers. If n_workers > 1 = use multi-threading for image preprocessing.
+                                                The thread pool is created once and reused for all batches until
+                                                [shutdown()][aucmedi.data_processing.data_generator.DataGenerator.shutdown] is called.
+            worker_backend (str):               Backend for the workers. Possible backends are: `["thread", "process"]`.
+                                                The `"process"` backend runs the preprocessing in separate processes, which write
+                                                the samples directly into a shared memory batch buffer.
+            prefetch (int):                     Number of upcoming batches which are prepared in the background while the current
+                                                batch is processed. If `0` is provided, no prefetching will be performed.
             prepare_images (bool):              Boolean, whether all images should be prepared and backup to disk before training.
                                                 Recommended for large images or volumes to reduce CPU computing time.
+            cache_dir (str):                    Path to a persistent cache directory for preprocessed images (after Subfunctions & resizing).
+                                                The cache can be reused across DataGenerators, processes and runs. Entries are keyed by
+                                                a fingerprint of sample, file and preprocessing pipeline
+                                                (see [PreprocessingCache][aucmedi.data_processing.preprocessing_cache.PreprocessingCache]).
+                                                If `None` is provided, no persistent cache will be used.
+            memory_cache_size (int):            Byte budget of an in-memory LRU cache for preprocessed images (after Subfunctions & resizing).
+                                                Allows skipping image loading and preprocessing for already seen samples in later epochs.
+                                                Statistics can be obtained via `memory_cache.stats()`
+                                                (see [MemoryCache][aucmedi.data_processing.preprocessing_cache.MemoryCache]).
+                                                If `None` is provided, no in-memory cache will be used.
+            standardize_batch (bool):           Boolean, whether the standardization should be applied once on the complete stacked batch
+                                                instead of on each image. Batches are standardized in-place as float32.
+            standardize_validate (bool or float):   Option whether the [0,255] range of images should be verified for the
+                                                standardization modes `["tf", "caffe", "torch"]`. If a float is provided,
+                                                only the corresponding fraction of samples is verified.
+            patch_shape (tuple of int):         Shape of a patch, which should be loaded instead of the complete image.
+                                                The patch coordinates are passed to the IO_loader function, which reads only the
+                                                region of the patch (supported by the
+                                                [sitk_loader()][aucmedi.data_processing.io_loader.sitk_loader]).
+                                                If `None` is provided, the complete image will be loaded.
+            patch_mode (str):                   Mode for patch sampling. Possible modes are: `["random", "center"]`.
+                                                Random patches can not be combined with `prepare_images` or caching.
+            batch_dtype (str):                  Dtype of the image batches, e.g. `"float16"` or `"bfloat16"` for half-precision batches
+                                                which reduce memory and host-to-device transfer for mixed precision models
+                                                (see `meta_batch_dtype` of [NeuralNetwork][aucmedi.neural_network.model.NeuralNetwork]).
+                                                Images are cast after standardization. If `None` is provided, the dtype is not changed.
             loader (io_loader function):        Function for loading samples/images from disk.
             seed (int):                         Seed to ensure reproducibility for random function.
             **kwargs (dict):                    Additional parameters for the sample loader.
+                                                For the [image_loader][aucmedi.data_processing.io_loader.image_loader],
+                                                the 2D `resize` shape is used as `decode_size` by default (if no Subfunctions are used).
         """
         # Cache class variables
         self.samples = samples
@@ -193,8 +241,24 @@ class DataGenerator(Sequence):
         self.metadata = metadata
         self.sample_weights = sample_weights
         self.prepare_images = prepare_images
+        self.cache_dir = cache_dir
+        self.memory_cache_size = memory_cache_size
+        self.standardize_batch = standardize_batch
+        self.standardize_validate = standardize_validate
+        self.patch_shape = patch_shape
+        self.patch_mode = patch_mode
+        self.batch_dtype = batch_dtype
         self.workers = workers
+        self.worker_backend = worker_backend
+        self.prefetch = prefetch
         self.sample_loader = loader
+        # Decode images at the (minimum) resizing shape, if the resolution is not
+        # required by Subfunctions or patches beforehand
+        if loader in [image_loader, archive_loader] and \
+                "decode_size" not in kwargs and resize is not None and \
+                len(resize) == 2 and len(subfunctions) == 0 and \
+                patch_shape is None:
+            kwargs = dict(kwargs, decode_size=tuple(resize))
         self.kwargs = kwargs
         self.path_imagedir = path_imagedir
         self.image_format = image_format
@@ -212,14 +276,60 @@ class DataGenerator(Sequence):
         self.iterations = self.max_iterations
         self.seed_walk = 0
         self.index_array = None
-
+        # Initialize persistent worker pool and prefetch queue
+        self.pool = None
+        self.prefetch_pool = None
+        self.prefetch_queue = {}
+        self.prefetch_lock = threading.Lock()
+        # Initialize shared memory batch buffer for the process backend
+        self.shm_buffer = None
+        self.shm_spec = None
+        self.shm_lock = threading.Lock()
+        # Initialize finalizers for releasing pools & buffers on garbage collection
+        self.finalizers = {}
+
+        # Identify NumPy dtype of the image batches (bfloat16 via TensorFlow)
+        if batch_dtype is not None:
+            self.batch_dtype_np = tf.as_dtype(batch_dtype).as_numpy_dtype
+        else : self.batch_dtype_np = None
         # Initialize Standardization Subfunction
         if standardize_mode is not None:
-            self.sf_standardize = Standardize(mode=standardize_mode)
+            self.sf_standardize = Standardize(mode=standardize_mode,
+                                              validate=standardize_validate)
         else : self.sf_standardize = None
         # Initialize Resizing Subfunction
         if resize is not None : self.sf_resize = Resize(shape=resize)
         else : self.sf_resize = None
+        # Compile Subfunctions and resizing into a fused pipeline
+        self.sf_pipeline = SubfunctionPipeline(subfunctions,
+                                               resize=self.sf_resize)
+        # Initialize persistent preprocessing cache
+        if cache_dir is not None:
+            if patch_shape is not None:
+                cache_kwargs = dict(kwargs, patch_shape=patch_shape)
+            else : cache_kwargs = kwargs
+            self.cache = PreprocessingCache(cache_dir, path_imagedir,
+                                            image_format, loader, cache_kwargs,
+                                            subfunctions, resize, grayscale)
+        else : self.cache = None
+        # Initialize in-memory cache
+        if memory_cache_size is not None:
+            self.memory_cache = MemoryCache(memory_cache_size)
+        else : self.memory_cache = None
+        # Sanity check for worker backend
+        if worker_backend not in ["thread", "process"]:
+            raise ValueError("Unknown worker backend for DataGenerator",
+                             worker_backend,
+                             "Possible backends are: ['thread', 'process']")
+        # Sanity check for patch mode
+        if patch_mode not in ["random", "center"]:
+            raise ValueError("Unknown patch mode for DataGenerator", patch_mode,
+                             "Possible modes are: ['random', 'center']")
+        if patch_shape is not None and patch_mode == "random" and \
+                (prepare_images or cache_dir is not None or \
+                 memory_cache_size is not None):
+            raise ValueError("Random patches can not be combined with " + \
+                             "prepare_images or caching!")
         # Sanity check for full sample list
         if samples is not None and len(samples) == 0:
             raise ValueError("Provided sample list is empty!", len(samples))
@@ -251,20 +361,29 @@ class DataGenerator(Sequence):
                                                prefix="aucmedi.tmp.",
                                                suffix=".data")
             self.prepare_dir = self.prepare_dir_object.name
+            self.prepare_store = PreparedImageStore(self.prepare_dir, self.n)
 
+            # Preprocess first image for defining the layout of the store
+            self.preprocess_image(index=0, prepared_image=False,
+                                  run_aug=False, run_standardize=False,
+                                  dump_pickle=True)
             # Preprocess image for each index - Sequential
             if self.workers == 0 or self.workers == 1:
-                for i in range(0, len(samples)):
+                for i in range(1, len(samples)):
                     self.preprocess_image(index=i, prepared_image=False,
                                           run_aug=False, run_standardize=False,
                                           dump_pickle=True)
-            # Preprocess image for each index - Multi-threading
+            # Preprocess image for each index - Multi-threading/processing
             else:
-                with ThreadPool(self.workers) as pool:
-                    index_array = list(range(0, len(samples)))
-                    mp_params = zip(index_array, repeat(False), repeat(False),
-                                    repeat(False), repeat(True))
-                    pool.starmap(self.preprocess_image, mp_params)
+                index_array = list(range(1, len(samples)))
+                mp_params = zip(index_array, repeat(False), repeat(False),
+                                repeat(False), repeat(True))
+                if self.worker_backend == "process":
+                    self._get_pool().starmap(__worker_preprocess__, mp_params)
+                else:
+                    self._get_pool().starmap(self.preprocess_image, mp_params)
+            # Finish writing and build the offset index of the store
+            self.prepare_store.finalize()
             print("A directory for image preparation was created:",
                   self.prepare_dir)
 
@@ -275,6 +394,7 @@ class DataGenerator(Sequence):
     def _get_batches_of_transformed_samples(self, index_array):
         # Initialize Batch stack
         batch_stack = ([],)
+        input_stack = None
         if self.labels is not None : batch_stack += ([],)
         if self.sample_weights is not None : batch_stack += ([],)
 
@@ -284,11 +404,14 @@ class DataGenerator(Sequence):
                 batch_img = self.preprocess_image(index=i,
                                                   prepared_image=self.prepare_images)
                 batch_stack[0].append(batch_img)
+        # Process image for each index - Multi-processing via shared memory
+        elif self.worker_backend == "process":
+            input_stack = self.__assemble_batch_shm__(index_array)
         # Process image for each index - Multi-threading
         else:
-            with ThreadPool(self.workers) as pool:
-                mp_params = zip(index_array, repeat(self.prepare_images))
-                batches_img = pool.starmap(self.preprocess_image, mp_params)
+            mp_params = zip(index_array, repeat(self.prepare_images))
+            batches_img = self._get_pool().starmap(self.preprocess_image,
+                                                   mp_params)
             batch_stack[0].extend(batches_img)
 
         # Add classification to batch if available
@@ -299,7 +422,13 @@ class DataGenerator(Sequence):
             batch_stack[2].extend(self.sample_weights[index_array])
 
         # Stack images and optional metadata together into a batch
-        input_stack = np.stack(batch_stack[0], axis=0)
+        if input_stack is None : input_stack = np.stack(batch_stack[0], axis=0)
+        # Apply standardization on complete batch if activated
+        if self.sf_standardize is not None and self.standardize_batch:
+            input_stack = self.sf_standardize.transform_batch(input_stack)
+        # Cast image batch to the selected dtype (e.g. half precision)
+        if self.batch_dtype_np is not None:
+            input_stack = input_stack.astype(self.batch_dtype_np, copy=False)
         if self.metadata is not None:
             input_stack = [input_stack, self.metadata[index_array]]
         batch = (input_stack, )
@@ -325,45 +454,70 @@ class DataGenerator(Sequence):
         Activating the prepared_image option also allows loading a beforehand preprocessed image from disk.
 
         Deactivating the run_aug & run_standardize option to output image without augmentation and standardization.
+        If `standardize_batch` is active, the standardization is performed on the stacked batch instead.
 
-        Activating dump_pickle will store the preprocessed image as pickle on disk instead of returning.
+        Activating dump_pickle will store the preprocessed image in the prepared image store on disk instead of returning.
         """
         # Load prepared image from disk
         if prepared_image:
-            # Load from disk
-            path_img = os.path.join(self.prepare_dir, "img_" + str(index))
-            with open(path_img + ".pickle", "rb") as pickle_loader:
-                img = pickle.load(pickle_loader)
+            # Load from disk (zero-copy view for memory-mapped samples)
+            img = self.prepare_store.read(index)
+            # Obtain writeable copy of the read-only view for in-place stages
+            if (self.data_aug is not None and run_aug) or \
+                    (self.sf_standardize is not None and run_standardize \
+                     and not self.standardize_batch):
+                img = np.array(img)
             # Apply image augmentation on image if activated
             if self.data_aug is not None and run_aug:
                 img = self.data_aug.apply(img)
             # Apply standardization on image if activated
-            if self.sf_standardize is not None and run_standardize:
+            if self.sf_standardize is not None and run_standardize \
+                    and not self.standardize_batch:
                 img = self.sf_standardize.transform(img)
         # Preprocess image during runtime
         else:
-            # Load image from disk
-            img = self.sample_loader(self.samples[index], self.path_imagedir,
-                                     image_format=self.image_format,
-                                     grayscale=self.grayscale,
-                                     **self.kwargs)
-            # Apply subfunctions on image
-            for sf in self.subfunctions:
-                img = sf.transform(img)
-            # Apply resizing on image if activated
-            if self.sf_resize is not None:
-                img = self.sf_resize.transform(img)
+            # Load preprocessed image from in-memory cache if available
+            if self.memory_cache is not None : img = self.memory_cache.load(index)
+            else : img = None
+            # Load preprocessed image from persistent cache if available
+            if img is None and self.cache is not None:
+                img = self.cache.load(self.samples[index])
+                # Keep cached image in memory for later usage
+                if img is not None and self.memory_cache is not None:
+                    self.memory_cache.store(index, img)
+            # Preprocess image if not cached
+            if img is None:
+                # Pass patch coordinates to the loader if patch mode is active
+                kwargs = self.kwargs
+                if self.patch_shape is not None:
+                    if self.patch_mode == "random":
+                        position = np.random.rand(len(self.patch_shape))
+                    else : position = None
+                    kwargs = dict(kwargs, patch_shape=self.patch_shape,
+                                  patch_position=position)
+                # Load image from disk
+                img = self.sample_loader(self.samples[index], self.path_imagedir,
+                                         image_format=self.image_format,
+                                         grayscale=self.grayscale,
+                                         **kwargs)
+                # Apply subfunctions and resizing on image
+                img = self.sf_pipeline.transform(img)
+                # Store preprocessed image in persistent cache
+                if self.cache is not None:
+                    self.cache.store(self.samples[index], img)
+                # Store preprocessed image in in-memory cache
+                if self.memory_cache is not None:
+                    self.memory_cache.store(index, img)
             # Apply image augmentation on image if activated
             if self.data_aug is not None and run_aug:
                 img = self.data_aug.apply(img)
             # Apply standardization on image if activated
-            if self.sf_standardize is not None and run_standardize:
+            if self.sf_standardize is not None and run_standardize \
+                    and not self.standardize_batch:
                 img = self.sf_standardize.transform(img)
         # Dump preprocessed image to disk (for later usage via prepared_image)
         if dump_pickle:
-            path_img = os.path.join(self.prepare_dir, "img_" + str(index))
-            with open(path_img + ".pickle", "wb") as pickle_writer:
-                pickle.dump(img, pickle_writer)
+            self.prepare_store.write(index, img)
         # Return preprocessed image
         else : return img
 
@@ -377,12 +531,137 @@ class DataGenerator(Sequence):
         # Build index array for the start
         if self.index_array is None:
             self.__set_index_array__()
-        # Select samples for next batch
-        index_array = self.index_array[
-            self.batch_size * idx : self.batch_size * (idx + 1)
-        ]
-        # Generate batch
-        return self._get_batches_of_transformed_samples(index_array)
+        # Generate batch directly if prefetching is deactivated
+        if not self.prefetch:
+            index_array = self.__get_index_slice__(idx)
+            return self._get_batches_of_transformed_samples(index_array)
+        # Obtain batch from prefetch queue or schedule it
+        with self.prefetch_lock:
+            if idx in self.prefetch_queue:
+                async_batch = self.prefetch_queue.pop(idx)
+            else : async_batch = self.__schedule_batch__(idx)
+            # Schedule upcoming batches in the background (bounded queue)
+            for k in range(1, self.prefetch + 1):
+                next_idx = (idx + k) % self.max_iterations
+                if len(self.prefetch_queue) >= self.prefetch : break
+                if next_idx == idx or next_idx in self.prefetch_queue : continue
+                self.prefetch_queue[next_idx] = self.__schedule_batch__(next_idx)
+        # Wait for batch generation and return it
+        return async_batch.get()
+
+    """ Internal function for obtaining the sample indices of a batch. """
+    def __get_index_slice__(self, idx):
+        return self.index_array[self.batch_size * idx : \
+                                self.batch_size * (idx + 1)]
+
+    """ Internal function for scheduling the generation of a batch in the background. """
+    def __schedule_batch__(self, idx):
+        # Initialize prefetch thread if required
+        if self.prefetch_pool is None:
+            self.__register_resource__("prefetch_pool", ThreadPool(1),
+                                       __release_pool__)
+        # Submit batch generation
+        index_array = self.__get_index_slice__(idx)
+        return self.prefetch_pool.apply_async(
+                                    self._get_batches_of_transformed_samples,
+                                    (index_array,))
+
+    #-----------------------------------------------------#
+    #                  Worker Management                  #
+    #-----------------------------------------------------#
+    """ Internal function for obtaining the persistent worker pool. """
+    def _get_pool(self):
+        # Initialize process pool which receives the DataGenerator state once
+        # (passing the state instead of the instance avoids that the pool keeps it alive)
+        if self.pool is None and self.worker_backend == "process":
+            mp_context = mp.get_context("spawn")
+            pool = mp_context.Pool(self.workers,
+                                   initializer=__worker_initialize__,
+                                   initargs=(self.__getstate__(),))
+            # Close gracefully for releasing the worker-side shared memory
+            self.__register_resource__("pool", pool, __release_pool__, True)
+        # Initialize thread pool
+        elif self.pool is None:
+            self.__register_resource__("pool", ThreadPool(self.workers),
+                                       __release_pool__)
+        return self.pool
+
+    """ Internal function for storing a pool/buffer and releasing it on garbage collection.
+
+    The release function is registered via `weakref.finalize` and must not reference the DataGenerator.
+    Thus, the finalizer is also executed if the DataGenerator is collected within a pool thread.
+    """
+    def __register_resource__(self, name, resource, release, *args):
+        setattr(self, name, resource)
+        self.finalizers[name] = weakref.finalize(self, release, resource, *args)
+
+    """ Internal function for batch assembly via the process pool and a shared memory buffer. """
+    def __assemble_batch_shm__(self, index_array):
+        pool = self._get_pool()
+        with self.shm_lock:
+            # Process first batch without buffer in order to identify the sample shape
+            if self.shm_spec is None:
+                mp_params = zip(index_array, repeat(self.prepare_images))
+                batches_img = pool.starmap(__worker_preprocess__, mp_params)
+                # Allocate shared memory buffer for a complete batch
+                self.shm_spec = (batches_img[0].shape, batches_img[0].dtype)
+                buffer_size = self.batch_size * batches_img[0].nbytes
+                self.__register_resource__("shm_buffer",
+                                    shared_memory.SharedMemory(create=True,
+                                                    size=max(buffer_size, 1)),
+                                    __release_shm__)
+                return np.stack(batches_img, axis=0)
+            # Let the workers write the samples directly into the buffer
+            mp_params = zip(index_array, repeat(self.prepare_images),
+                            repeat(self.shm_buffer.name), range(len(index_array)),
+                            repeat(self.shm_spec))
+            results = pool.starmap(__worker_preprocess_shm__, mp_params)
+            batch_view = np.ndarray((self.batch_size,) + self.shm_spec[0],
+                                    dtype=self.shm_spec[1],
+                                    buffer=self.shm_buffer.buf)
+            # Copy batch out of the buffer if all samples match the buffer shape
+            if all(img is None for img in results):
+                return batch_view[:len(index_array)].copy()
+            # Otherwise, combine buffered and directly returned samples
+            batches_img = [batch_view[i] if img is None else img \
+                           for i, img in enumerate(results)]
+            return np.stack(batches_img, axis=0)
+
+    def shutdown(self):
+        """ Terminate the worker pool and the prefetch thread of the DataGenerator.
+
+        Already prefetched batches are discarded. The pools are recreated automatically,
+        if the DataGenerator is used again afterwards.
+
+        The shutdown is also performed, if the DataGenerator is garbage collected.
+        """
+        # Discard prefetched batches
+        self.prefetch_queue = {}
+        # Terminate prefetch thread, worker pool and release shared memory batch buffer
+        for name in ["prefetch_pool", "pool", "shm_buffer"]:
+            if name in self.finalizers : self.finalizers.pop(name)()
+            setattr(self, name, None)
+        self.shm_spec = None
+
+    """ Internal function for excluding pools from pickling (e.g. for multiprocessing). """
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["pool"] = None
+        state["prefetch_pool"] = None
+        state["prefetch_queue"] = {}
+        state["shm_buffer"] = None
+        state["shm_spec"] = None
+        state["finalizers"] = {}
+        if "prepare_dir_object" in state : state["prepare_dir_object"] = None
+        del state["prefetch_lock"]
+        del state["shm_lock"]
+        return state
+
+    """ Internal function for restoring a DataGenerator after unpickling. """
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.prefetch_lock = threading.Lock()
+        self.shm_lock = threading.Lock()
 
     #-----------------------------------------------------#
     #                 Generator Functions                 #
@@ -414,4 +693,156 @@ class DataGenerator(Sequence):
 
     """ Internal function at the end of an epoch. """
     def on_epoch_end(self):
-        self.__set_index_array__()
\ No newline at end of file
+        # Discard prefetched batches which are based on the previous index array
+        with self.prefetch_lock:
+            self.prefetch_queue = {}
+        self.__set_index_array__()
+
+    #-----------------------------------------------------#
+    #                 TensorFlow Data Export              #
+    #-----------------------------------------------------#
+    def to_tf_dataset(self, cache=False, num_parallel_calls=tf.data.AUTOTUNE,
+                      prefetch=tf.data.AUTOTUNE):
+        """ Export the DataGenerator pipeline as a native `tf.data.Dataset`.
+
+        The same pipeline as in the DataGenerator is applied (image loading, Subfunctions, resizing,
+        augmentation and standardization). However, TensorFlow parallelizes the preprocessing
+        and overlaps it with the model computation via prefetching.
+
+        The resulting batches are identical in structure to the DataGenerator batches:
+        `(input, labels, sample_weights)`, whereas the input is a tuple `(images, metadata)`
+        if metadata is available. Images are encoded as float32 or the selected `batch_dtype`.
+
+        ???+ example
+            ```python
+            datagen = DataGenerator(samples, "images_dir/", labels=class_ohe,
+                                    resize=model.meta_input,
+                                    standardize_mode=model.meta_standardize)
+            ds_train = datagen.to_tf_dataset(cache=True)
+            model.train(ds_train, epochs=50)
+            ```
+
+        ???+ info
+            The optional cache is applied on the images after loading, Subfunctions and resizing.
+            Thus, augmentation and standardization are still performed in every epoch.
+
+        Args:
+            cache (bool or str):                Option whether preprocessed images (before augmentation) should be cached by
+                                                TensorFlow. If a string is provided, it is used as file path for caching on disk.
+            num_parallel_calls (int):           Number of parallel preprocessing calls. By default, tuned by TensorFlow (AUTOTUNE).
+            prefetch (int):                     Number of batches which are prefetched. By default, tuned by TensorFlow (AUTOTUNE).
+
+        Returns:
+            dataset (tf.data.Dataset):          TensorFlow dataset providing the batches of the DataGenerator.
+        """
+        # Identify sample shape and dtype before augmentation by preprocessing the first image
+        img_probe = self.preprocess_image(0, prepared_image=self.prepare_images,
+                                          run_aug=False, run_standardize=False)
+        shape_probe = img_probe.shape
+        dtype_probe = tf.as_dtype(img_probe.dtype)
+
+        # Internal function for loading & preprocessing (Subfunctions + resizing)
+        def load_image(index):
+            return self.preprocess_image(int(index),
+                                         prepared_image=self.prepare_images,
+                                         run_aug=False, run_standardize=False)
+        # Internal function for augmentation & standardization
+        def transform_image(img):
+            if self.data_aug is not None : img = self.data_aug.apply(img)
+            if self.sf_standardize is not None:
+                img = self.sf_standardize.transform(img)
+            return np.asarray(img, dtype=np.float32)
+
+        # Build dataset of sample indices with loaded and preprocessed images
+        ds = tf.data.Dataset.range(self.n)
+        ds = ds.map(lambda i: (i, tf.numpy_function(load_image, [i],
+                                                    dtype_probe)),
+                    num_parallel_calls=num_parallel_calls,
+                    deterministic=True)
+        # Cache preprocessed images
+        if isinstance(cache, str) : ds = ds.cache(cache)
+        elif cache : ds = ds.cache()
+        # Shuffle samples for each iteration
+        if self.shuffle:
+            ds = ds.shuffle(self.n, seed=self.seed,
+                            reshuffle_each_iteration=True)
+
+        # Wrap constant annotation data
+        labels = None if self.labels is None else tf.constant(self.labels)
+        metadata = None if self.metadata is None else tf.constant(self.metadata)
+        weights = None if self.sample_weights is None else \
+                  tf.constant(self.sample_weights)
+        # Internal function for augmentation, standardization and assembly of a sample
+        def assemble_sample(i, img):
+            img = tf.numpy_function(transform_image, [img], tf.float32)
+            img.set_shape(shape_probe)
+            if self.batch_dtype is not None:
+                img = tf.cast(img, self.batch_dtype)
+            sample = (img, ) if metadata is None else \
+                     ((img, tf.gather(metadata, i)), )
+            if labels is not None : sample += (tf.gather(labels, i), )
+            if weights is not None : sample += (tf.gather(weights, i), )
+            return sample
+        ds = ds.map(assemble_sample, num_parallel_calls=num_parallel_calls,
+                    deterministic=True)
+
+        # Stack samples to batches and prefetch them
+        ds = ds.batch(self.batch_size)
+        if prefetch : ds = ds.prefetch(prefetch)
+        # Return dataset
+        return ds
+
+#-----------------------------------------------------#
+#                Resource Subroutines                 #
+#-----------------------------------------------------#
+# Internal function for terminating (or gracefully closing) a worker or prefetch pool
+def __release_pool__(pool, graceful=False):
+    if graceful : pool.close()
+    else : pool.terminate()
+    # Pool threads cannot join themselves (e.g. if the DataGenerator is garbage
+    # collected within a prefetch task) -> terminated threads exit on their own
+    try : pool.join()
+    except RuntimeError : pass
+
+# Internal function for releasing a shared memory batch buffer
+def __release_shm__(shm):
+    shm.close()
+    shm.unlink()
+
+#-----------------------------------------------------#
+#               Process Backend Subroutines           #
+#-----------------------------------------------------#
+# Worker state of the process backend (DataGenerator copy & shared memory buffers)
+__worker_state__ = {"generator": None, "shm": {}}
+
+# Internal function for initializing a worker process with a DataGenerator copy
+def __worker_initialize__(state):
+    # Reseed random generator to avoid identical augmentations between workers
+    np.random.seed()
+    # Restore DataGenerator from its state
+    generator = DataGenerator.__new__(DataGenerator)
+    generator.__setstate__(state)
+    __worker_state__["generator"] = generator
+
+# Internal function for preprocessing an image in a worker process
+def __worker_preprocess__(index, *args):
+    return __worker_state__["generator"].preprocess_image(index, *args)
+
+# Internal function for preprocessing an image directly into a shared memory buffer
+def __worker_preprocess_shm__(index, prepared_image, shm_name, position, spec):
+    # Preprocess image
+    img = __worker_state__["generator"].preprocess_image(index, prepared_image)
+    # Return image directly if it does not match the buffer layout
+    (shape, dtype) = spec
+    if img.shape != shape or img.dtype != dtype : return img
+    # Attach to shared memory buffer (cached for all following batches)
+    if shm_name not in __worker_state__["shm"]:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        __worker_state__["shm"][shm_name] = shm
+        # Detach from the buffer at worker exit
+        mp.util.Finalize(None, shm.close, exitpriority=0)
+    else : shm = __worker_state__["shm"][shm_name]
+    # Write image into the batch buffer at its position
+    batch_view = np.ndarray((position + 1,) + shape, dtype=dtype,
+                            buffer=shm.buf)
+    batch_view[position] = img
@@ -21,8 +21,12 @@
 #-----------------------------------------------------#
 # External libraries
 import os
+import json
+import tempfile
+import numpy as np
 # Internal libraries
 import aucmedi.data_processing.io_interfaces as io
+from aucmedi.data_processing.io_interfaces.io_scan import stat_samples
 
 #-----------------------------------------------------#
 #                   Static Variables                  #
@@ -35,7 +39,8 @@ ACCEPTABLE_IMAGE_FORMATS = ["jpeg", "jpg", "tif", "tiff", "png", "bmp", "gif",
 #             Input Interface for AUCMEDI             #
 #-----------------------------------------------------#
 def input_interface(interface, path_imagedir, path_data=None, training=True,
-                    ohe=False, image_format=None, **kwargs):
+                    ohe=False, image_format=None, workers=8, index_file=None,
+                    index_validate="paths", **kwargs):
     """ Data Input Interface for all automatically extract various information of dataset structures.
 
     Different image file structures and annotation information are processed by
@@ -88,6 +93,16 @@ def input_interface(interface, path_imagedir, path_data=None, training=True,
         training (bool):                Boolean option whether annotation data is available.
         ohe (bool):                     Boolean option whether annotation data is sparse categorical or one-hot encoded.
         image_format (str):             Force to use a specific image format. By default, image format is determined automatically.
+        workers (int):                  Number of threads for scanning the image directories.
+        index_file (str):               Path to a persisted index file (NumPy `.npz`) of the dataset. If the file exists and the dataset
+                                        is unchanged, the parsed information is directly loaded from the index file.
+                                        Otherwise, the dataset is parsed and the index file is (re)created.
+                                        If `None` is provided, no index file will be used.
+        index_validate (str):           Validation of the index file. Possible modes: `["paths", "files"]`.
+                                        By default (`"paths"`), only the modification of the sample directories and the annotation
+                                        file is checked, which detects added, removed or renamed samples in milliseconds.
+                                        In-place overwrites of sample files are only detected via `"files"`, which checks the
+                                        size & modification time of each sample file (one `os.stat` call per sample).
         **kwargs (dict):                Additional parameters for the format interfaces.
 
     Returns:
@@ -108,16 +123,23 @@ def input_interface(interface, path_imagedir, path_data=None, training=True,
     # Verify that annotation file is available if CSV/JSON interface is used
     if interface in ["csv", "json"] and path_data is None:
         raise Exception("No annotation file provided for CSV/JSON interface!")
+    # Verify if provided index validation mode is valid
+    if index_validate not in ["paths", "files"]:
+        raise ValueError("Unknown index validation mode. Possible modes: " + \
+                         "['paths', 'files']", index_validate)
 
     # Initialize parameter dictionary
     parameters = {"path_data": path_data,
                   "path_imagedir": path_imagedir,
                   "allowed_image_formats": allowed_image_formats,
                   "training": training, "ohe": ohe}
+    # Add number of threads for scanning the image directories
+    parameters["workers"] = workers
     # Identify correct dataset loader and parameters for CSV format
     if interface == "csv":
         ds_loader = io.csv_loader
-        additional_parameters = ["ohe_range", "col_sample", "col_class"]
+        additional_parameters = ["ohe_range", "col_sample", "col_class",
+                                 "chunksize"]
         for para in additional_parameters:
             if para in kwargs : parameters[para] = kwargs[para]
     # Identify correct dataset loader and parameters for JSON format
@@ -128,5 +150,105 @@ def input_interface(interface, path_imagedir, path_data=None, training=True,
         del parameters["ohe"]
         del parameters["path_data"]
 
-    # Load the dataset with the selected format interface and return results
-    return ds_loader(**parameters)
+    # Load the dataset from a persisted index file if unchanged
+    if index_file is not None:
+        signature = json.dumps({"interface": interface,
+                                "parameters": {k: parameters[k] for k in \
+                                               sorted(parameters) \
+                                               if k != "workers"}},
+                               default=str)
+        ds = load_index(index_file, signature, path_imagedir, workers,
+                        index_validate)
+        if ds is not None : return ds
+
+    # Load the dataset with the selected format interface
+    ds = ds_loader(**parameters)
+    # Persist parsed dataset information in an index file
+    if index_file is not None:
+        store_index(index_file, signature, ds, path_imagedir, path_data,
+                    interface, workers)
+    # Return results
+    return ds
+
+#-----------------------------------------------------#
+#                 Persisted Index File                #
+#-----------------------------------------------------#
+# Obtain modification time & size of paths (for detecting dataset changes)
+def stat_paths(paths):
+    stats = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stats.append([stat.st_mtime_ns, stat.st_size])
+        except OSError : stats.append([-1, -1])
+    return np.array(stats, dtype=np.int64)
+
+# Load dataset information from an index file if the dataset is unchanged
+def load_index(index_file, signature, path_imagedir, workers,
+               validate="paths"):
+    if not os.path.exists(index_file) : return None
+    with np.load(index_file, allow_pickle=False) as index:
+        # Verify parameters and modification of directories & annotation file
+        if str(index["signature"]) != signature : return None
+        paths = index["paths"].tolist()
+        if not np.array_equal(stat_paths(paths), index["paths_stat"]):
+            return None
+        meta = json.loads(str(index["meta"]))
+        index_list = index["samples"]
+        # Verify modification of the sample files (in-place overwrites)
+        if validate == "files":
+            try:
+                sizes, mtimes = stat_samples(index_list.tolist(),
+                                             path_imagedir,
+                                             meta["image_format"], workers)
+            except OSError : return None
+            if not np.array_equal(sizes, index["file_sizes"]) or \
+                    not np.array_equal(mtimes, index["file_mtimes"]):
+                return None
+        # Parse dataset information
+        if not meta.get("samples_array", False):
+            index_list = index_list.tolist()
+        if "class_ohe" in index : class_ohe = index["class_ohe"]
+        else : class_ohe = None
+    return (index_list, class_ohe, meta["class_n"], meta["class_names"],
+            meta["image_format"])
+
+# Store dataset information in an index file
+def store_index(index_file, signature, ds, path_imagedir, path_data,
+                interface, workers):
+    (index_list, class_ohe, class_n, class_names, image_format) = ds
+    # Identify directories containing samples and the annotation file
+    paths = set([path_imagedir])
+    for sample in index_list:
+        paths.add(os.path.dirname(os.path.join(path_imagedir, sample)))
+    if interface == "directory" and class_ohe is not None:
+        paths.update(os.path.join(path_imagedir, d) \
+                     for d in os.listdir(path_imagedir))
+    paths = sorted(paths)
+    if path_data is not None : paths.append(path_data)
+    # Obtain file sizes and modification times of all samples
+    sizes, mtimes = stat_samples(index_list, path_imagedir, image_format,
+                                 workers)
+    # Gather index data
+    index = {"signature": np.array(signature),
+             "paths": np.array(paths, dtype=str),
+             "paths_stat": stat_paths(paths),
+             "meta": np.array(json.dumps({"class_n": class_n,
+                                          "class_names": class_names,
+                                          "image_format": image_format,
+                                          "samples_array": isinstance(
+                                              index_list, np.ndarray)})),
+             "samples": np.array(index_list, dtype=str),
+             "file_sizes": sizes,
+             "file_mtimes": mtimes}
+    if class_ohe is not None : index["class_ohe"] = np.asarray(class_ohe)
+    # Write index into a temporary file and move it atomically into place
+    dir_index = os.path.dirname(os.path.abspath(index_file))
+    fd, path_tmp = tempfile.mkstemp(dir=dir_index, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file_writer:
+            np.savez(file_writer, **index)
+        os.replace(path_tmp, index_file)
+    except BaseException:
+        if os.path.exists(path_tmp) : os.remove(path_tmp)
+        raise
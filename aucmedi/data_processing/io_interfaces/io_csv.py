@@ -23,13 +23,17 @@
 import os
 import numpy as np
 import pandas as pd
+# Internal libraries
+from aucmedi.data_processing.io_interfaces.io_scan import identify_format, \
+                                                         verify_samples
 
 #-----------------------------------------------------#
 #          Data Loader Interface based on CSV         #
 #-----------------------------------------------------#
 def csv_loader(path_data, path_imagedir, allowed_image_formats,
                training=True, ohe=True, ohe_range=None,
-               col_sample="SAMPLE", col_class="CLASS"):
+               col_sample="SAMPLE", col_class="CLASS", workers=1,
+               chunksize=None):
     """ Data Input Interface for loading a dataset via a CSV and an image directory.
 
     This **internal** function allows simple parsing of class annotations encoded in a CSV,
@@ -51,6 +55,12 @@ def csv_loader(path_data, path_imagedir, allowed_image_formats,
            - Optional Meta Columns only possible if OHE parameter provided
         ```
 
+    ???+ info "Streaming Mode"
+        For large annotation files (e.g. millions of rows and hundreds of classes), a `chunksize` can be provided.
+        The CSV is then streamed in chunks of rows and only the required columns are parsed.
+        The labels are stored compactly as uint8 matrix (instead of int64) and the sample indices
+        as NumPy string array (instead of a list of Python strings).
+
     **Expected structure:**
     ```
     dataset/
@@ -71,6 +81,9 @@ def csv_loader(path_data, path_imagedir, allowed_image_formats,
         ohe_range (list of str):                List of column name values if annotation encoded in OHE. Example: ["classA", "classB", "classC"]
         col_sample (str):                       Index column name for the sample name column. Default: 'SAMPLE'
         col_class (str):                        Index column name for the sparse categorical classes column. Default: 'CLASS'
+        workers (int):                          Number of threads for verifying the existence of images.
+        chunksize (int):                        Number of rows per chunk for streaming the CSV file.
+                                                If `None` is provided, the complete CSV file is loaded at once.
 
     Returns:
         index_list (list of str):               List of sample/index encoded as Strings. Required in DataGenerator as `samples`.
@@ -79,6 +92,21 @@ def csv_loader(path_data, path_imagedir, allowed_image_formats,
         class_names (list of str):              List of names for corresponding classes. Used for later prediction storage or evaluation.
         image_format (str):                     Image format to add at the end of the sample index for image loading. Required in DataGenerator.
     """
+    # Stream CSV file in chunks
+    if chunksize is not None:
+        (index_list, class_ohe, class_n, class_names) = stream_csv(path_data,
+                                    training, ohe, ohe_range, col_sample,
+                                    col_class, chunksize)
+        # Identify image format and verify if all images are existing
+        image_format = identify_format(path_imagedir, allowed_image_formats)
+        if image_format is None:
+            raise Exception("Unknown image format.", path_imagedir)
+        if len(index_list) > 0 and index_list[0].endswith("." + image_format):
+            image_format = None
+        verify_samples(index_list, path_imagedir, image_format, workers)
+        # Return parsed CSV data
+        return index_list, class_ohe, class_n, class_names, image_format
+
     # Load CSV file
     dt = pd.read_csv(path_data, sep=",", header=0)
     # Check if image index column exist and parse it
@@ -88,28 +116,14 @@ def csv_loader(path_data, path_imagedir, allowed_image_formats,
     # Ensure index list to contain strings
     index_list = [str(index) for index in index_list]
     # Identify image format by peaking first image
-    image_format = None
-    for file in os.listdir(path_imagedir):
-        format = file.split(".")[-1]
-        if format.lower() in allowed_image_formats or \
-           format.upper() in allowed_image_formats:
-           image_format = format
-           break
+    image_format = identify_format(path_imagedir, allowed_image_formats)
     # Raise Exception if image format is unknown
     if image_format is None:
         raise Exception("Unknown image format.", path_imagedir)
     # Check if image ending is already in sample name by peaking first one
     if index_list[0].endswith("." + image_format) : image_format = None
     # Verify if all images are existing
-    for sample in index_list:
-        # Obtain image file path
-        if image_format : img_file = sample + "." + image_format
-        else : img_file = sample
-        path_img = os.path.join(path_imagedir, img_file)
-        # Check existance
-        if not os.path.exists(path_img):
-            raise Exception("Image does not exist / not accessible!",
-                            'Sample: "' + sample + '"', path_img)
+    verify_samples(index_list, path_imagedir, image_format, workers)
 
     # If CSV is for inference (no annotation data) -> return parsing
     if not training : return index_list, None, None, None, image_format
@@ -141,3 +155,74 @@ def csv_loader(path_data, path_imagedir, allowed_image_formats,
                         len(index_list), len(class_ohe))
     # Return parsed CSV data
     return index_list, class_ohe, class_n, class_names, image_format
+
+#-----------------------------------------------------#
+#                     Subroutines                     #
+#-----------------------------------------------------#
+# Stream a CSV file in chunks and parse samples & compact annotations
+def stream_csv(path_data, training, ohe, ohe_range, col_sample, col_class,
+               chunksize):
+    # Load only the header of the CSV file
+    columns = pd.read_csv(path_data, sep=",", header=0, nrows=0).columns
+    # Check if image index column exist
+    if col_sample not in columns:
+        raise Exception("Sample column (" + str(col_sample) + \
+                        ") not available in CSV file!", path_data)
+    # Identify required columns
+    if not training : class_columns = []
+    elif not ohe:
+        # Verify if provided classification column in in dataframe
+        if col_class not in columns:
+            raise Exception("Provided classification column not in dataset!")
+        class_columns = [col_class]
+    elif ohe_range is None:
+        class_columns = [c for c in columns if c != col_sample]
+    else : class_columns = list(ohe_range)
+
+    # Stream CSV file and parse each chunk
+    samples = []
+    annotations = []
+    class_codes = {}
+    reader = pd.read_csv(path_data, sep=",", header=0, chunksize=chunksize,
+                         usecols=[col_sample] + class_columns)
+    for chunk in reader:
+        # Ensure index list to contain strings
+        samples.append(chunk[col_sample].astype(str).to_numpy(dtype=str))
+        if not training : continue
+        # Encode sparse categorical classes as integer codes
+        if not ohe:
+            classes, inverse = np.unique(chunk[col_class].to_numpy(),
+                                         return_inverse=True)
+            mapping = np.array([class_codes.setdefault(c, len(class_codes)) \
+                                for c in classes.tolist()], dtype=np.int32)
+            annotations.append(mapping[inverse])
+        # Parse one-hot encoded classes (compact uint8 if binary)
+        else:
+            values = chunk[class_columns].to_numpy()
+            if np.all((values == 0) | (values == 1)):
+                values = values.astype(np.uint8)
+            annotations.append(values)
+    # Combine chunks
+    index_list = np.concatenate(samples) if len(samples) > 0 else \
+                 np.array([], dtype=str)
+
+    # If CSV is for inference (no annotation data) -> return parsing
+    if not training : return index_list, None, None, None
+    # Parse sparse categorical annotations to One-Hot Encoding
+    if not ohe:
+        class_names = np.unique(list(class_codes)).tolist()
+        rank = {c: i for i, c in enumerate(class_names)}
+        order = np.array([rank[c] for c in class_codes], dtype=np.int32)
+        codes = order[np.concatenate(annotations)] if annotations else \
+                np.array([], dtype=np.int64)
+        class_ohe = np.zeros((len(codes), len(class_names)), dtype=np.uint8)
+        class_ohe[np.arange(len(codes)), codes] = 1
+    # Combine one-hot encoded annotations
+    else:
+        class_names = list(class_columns)
+        class_ohe = np.concatenate(annotations, axis=0) if annotations else \
+                    np.zeros((0, len(class_names)), dtype=np.uint8)
+    class_n = len(class_names)
+    # Return parsed CSV data
+    return index_list, class_ohe, class_n, class_names
+
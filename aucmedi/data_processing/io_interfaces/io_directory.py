@@ -23,11 +23,14 @@
 import os
 import numpy as np
 import pandas as pd
+# Internal libraries
+from aucmedi.data_processing.io_interfaces.io_scan import scan_directories
 
 #-----------------------------------------------------#
 #      Data Loader Interface based on Directories     #
 #-----------------------------------------------------#
-def directory_loader(path_imagedir, allowed_image_formats, training=True):
+def directory_loader(path_imagedir, allowed_image_formats, training=True,
+                     workers=1):
     """ Data Input Interface for loading a dataset in a directory-based structure.
 
     This **internal** function allows simple parsing of class annotations encoded in subdirectories.
@@ -77,6 +80,7 @@ def directory_loader(path_imagedir, allowed_image_formats, training=True):
         path_imagedir (str):                    Path to the directory containing the images or the subdirectories.
         allowed_image_formats (list of str):    List of allowed imaging formats. (provided by IO_Interface)
         training (bool):                        Boolean option whether annotation data is available.
+        workers (int):                          Number of threads for listing the subdirectories.
 
     Returns:
         index_list (list of str):               List of sample/index encoded as Strings. Required in DataGenerator as `samples`.
@@ -92,15 +96,19 @@ def directory_loader(path_imagedir, allowed_image_formats, training=True):
     if training:
         class_names = []
         classes_sparse = []
+        # List all subdirectories in parallel
+        (files, subdirs) = scan_directories([path_imagedir])[path_imagedir]
+        paths_sd = [os.path.join(path_imagedir, sd) for sd in subdirs]
+        entries_sd = scan_directories(paths_sd, workers)
         # Iterate over subdirectories
-        for c, subdirectory in enumerate(sorted(os.listdir(path_imagedir))):
+        for c, subdirectory in enumerate(sorted(list(files) + subdirs)):
             # Skip items which are not a directory (metadata)
-            if not os.path.isdir(os.path.join(path_imagedir, subdirectory)):
-                continue
+            if subdirectory not in subdirs : continue
             class_names.append(subdirectory)
             # Iterate over each sample
             path_sd = os.path.join(path_imagedir, subdirectory)
-            for file in sorted(os.listdir(path_sd)):
+            (files_sd, subdirs_sd) = entries_sd[path_sd]
+            for file in sorted(list(files_sd) + subdirs_sd):
                 sample = os.path.join(subdirectory, file)
                 index_list.append(sample)
                 classes_sparse.append(c)
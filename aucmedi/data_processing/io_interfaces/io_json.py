@@ -24,12 +24,15 @@ import os
 import numpy as np
 import json
 import pandas as pd
+# Internal libraries
+from aucmedi.data_processing.io_interfaces.io_scan import identify_format, \
+                                                         verify_samples
 
 #-----------------------------------------------------#
 #         Data Loader Interface based on JSON         #
 #-----------------------------------------------------#
 def json_loader(path_data, path_imagedir, allowed_image_formats, training=True,
-                ohe=True):
+                ohe=True, workers=1):
     """ Data Input Interface for loading a dataset via a JSON and an image directory.
 
     This **internal** function allows simple parsing of class annotations encoded in a JSON.
@@ -60,6 +63,7 @@ def json_loader(path_data, path_imagedir, allowed_image_formats, training=True,
         allowed_image_formats (list of str):    List of allowed imaging formats. (provided by IO_Interface)
         training (bool):                        Boolean option whether annotation data is available.
         ohe (bool):                             Boolean option whether annotation data is sparse categorical or one-hot encoded.
+        workers (int):                          Number of threads for verifying the existence of images.
 
     Returns:
         index_list (list of str):               List of sample/index encoded as Strings. Required in DataGenerator as `samples`.
@@ -72,33 +76,17 @@ def json_loader(path_data, path_imagedir, allowed_image_formats, training=True,
     with open(path_data, "r") as json_reader:
         dt_json = json.load(json_reader)
     # Identify image format by peaking first image
-    image_format = None
-    for file in os.listdir(path_imagedir):
-        format = file.split(".")[-1]
-        if format.lower() in allowed_image_formats or \
-           format.upper() in allowed_image_formats:
-           image_format = format
-           break
+    image_format = identify_format(path_imagedir, allowed_image_formats)
     # Raise Exception if image format is unknown
     if image_format is None:
         raise Exception("Unknown image format.", path_imagedir)
 
+    # Check if image ending is already in sample name by peaking first one
+    samples = [sample for sample in dt_json if sample != "legend"]
+    if len(samples) > 0 and samples[0].endswith("." + image_format):
+        image_format = None
     # Verify if all images are existing
-    lever = True
-    for sample in dt_json:
-        if sample == "legend" : continue
-        # Check if image ending is already in sample name by peaking first one
-        if lever:
-            lever = False
-            if sample.endswith("." + image_format) : image_format = None
-        # Obtain image file path
-        if image_format : img_file = sample + "." + image_format
-        else : img_file = sample
-        path_img = os.path.join(path_imagedir, img_file)
-        # Check existance
-        if not os.path.exists(path_img):
-            raise Exception("Image does not exist / not accessible!",
-                            'Sample: "' + sample + '"', path_img)
+    verify_samples(samples, path_imagedir, image_format, workers)
 
     # If JSON is for inference (no annotation data)
     if not training:
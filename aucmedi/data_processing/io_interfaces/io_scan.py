@@ -0,0 +1,141 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2022 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+# External libraries
+import os
+import numpy as np
+from multiprocessing.pool import ThreadPool
+
+#-----------------------------------------------------#
+#              Dataset Scanning Functions             #
+#-----------------------------------------------------#
+def identify_format(path_imagedir, allowed_image_formats):
+    """ Identify the image format by peaking the first image of a directory.
+
+    The directory is scanned lazily via `os.scandir`, which stops at the first image with an allowed format.
+
+    Args:
+        path_imagedir (str):                    Path to the directory containing the images.
+        allowed_image_formats (list of str):    List of allowed imaging formats.
+
+    Returns:
+        image_format (str):                     Identified image format or `None` if no image was found.
+    """
+    with os.scandir(path_imagedir) as entries:
+        for entry in entries:
+            format = entry.name.split(".")[-1]
+            if format.lower() in allowed_image_formats or \
+               format.upper() in allowed_image_formats:
+               return format
+    return None
+
+def scan_directories(paths, workers=1):
+    """ List the entries of multiple directories in parallel via `os.scandir`.
+
+    Args:
+        paths (list of str):        List of directory paths.
+        workers (int):              Number of threads for scanning.
+
+    Returns:
+        entries (dict):             Dictionary with directory path as key and a tuple
+                                    (set of file names, list of subdirectory names) as value.
+                                    Not existing directories are mapped to `None`.
+    """
+    paths = list(paths)
+    # Scan directories sequentially or via a thread pool
+    if workers <= 1 or len(paths) <= 1:
+        results = [scan_directory(path) for path in paths]
+    else:
+        with ThreadPool(min(workers, len(paths))) as pool:
+            results = pool.map(scan_directory, paths)
+    return dict(zip(paths, results))
+
+def verify_samples(index_list, path_imagedir, image_format, workers=1):
+    """ Verify that the image files of all samples are existing.
+
+    Instead of checking each file separately, each directory containing samples
+    is listed only once via `os.scandir` (in parallel for multiple directories).
+
+    Args:
+        index_list (list of str):   List of sample/index encoded as Strings.
+        path_imagedir (str):        Path to the directory containing the images.
+        image_format (str):         Image format to add at the end of the sample index.
+        workers (int):              Number of threads for scanning.
+
+    Raises:
+        Exception:                  If an image does not exist or is not accessible.
+    """
+    # Identify image file path of each sample
+    paths_img = sample_paths(index_list, path_imagedir, image_format)
+    # Scan each directory containing samples once
+    dirs = set(os.path.dirname(path_img) for path_img in paths_img)
+    entries = scan_directories(dirs, workers)
+    # Check existence of each image file
+    for sample, path_img in zip(index_list, paths_img):
+        files = entries[os.path.dirname(path_img)]
+        if files is None or os.path.basename(path_img) not in files[0]:
+            raise Exception("Image does not exist / not accessible!",
+                            'Sample: "' + sample + '"', path_img)
+
+def stat_samples(index_list, path_imagedir, image_format, workers=1):
+    """ Obtain file size and modification time of the image files of all samples.
+
+    Args:
+        index_list (list of str):   List of sample/index encoded as Strings.
+        path_imagedir (str):        Path to the directory containing the images.
+        image_format (str):         Image format to add at the end of the sample index.
+        workers (int):              Number of threads for obtaining the file stats.
+
+    Returns:
+        sizes (numpy.ndarray):      File sizes in bytes.
+        mtimes (numpy.ndarray):     File modification times in nanoseconds.
+    """
+    paths_img = sample_paths(index_list, path_imagedir, image_format)
+    # Obtain file stats sequentially or via a thread pool
+    if workers <= 1 : stats = [os.stat(path_img) for path_img in paths_img]
+    else:
+        with ThreadPool(workers) as pool:
+            stats = pool.map(os.stat, paths_img, chunksize=256)
+    sizes = np.array([s.st_size for s in stats], dtype=np.int64)
+    mtimes = np.array([s.st_mtime_ns for s in stats], dtype=np.int64)
+    return sizes, mtimes
+
+#-----------------------------------------------------#
+#                     Subroutines                     #
+#-----------------------------------------------------#
+# Obtain the image file paths of samples
+def sample_paths(index_list, path_imagedir, image_format):
+    if image_format : suffix = "." + image_format
+    else : suffix = ""
+    return [os.path.join(path_imagedir, sample + suffix) \
+            for sample in index_list]
+
+# List files and subdirectories of a directory
+def scan_directory(path):
+    try:
+        files = set()
+        subdirs = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir() : subdirs.append(entry.name)
+                else : files.add(entry.name)
+        return files, subdirs
+    except OSError : return None
@@ -0,0 +1,248 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2022 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+# External libraries
+import os
+import io
+import json
+import mmap
+import threading
+import time
+import numpy as np
+# Internal libraries
+from aucmedi.data_processing.io_loader.image_loader import decode_image
+from aucmedi.data_processing.io_loader.numpy_loader import verify_shape
+
+#-----------------------------------------------------#
+#            Archive Loader for AUCMEDI IO            #
+#-----------------------------------------------------#
+def archive_loader(sample, path_imagedir, image_format=None, grayscale=False,
+                   two_dim=True, decode_size=None, **kwargs):
+    """ Archive Loader for loading samples from a sharded dataset archive within the AUCMEDI pipeline.
+
+    The Archive Loader is an IO_loader function, which have to be passed to the
+    [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator].
+
+    A dataset archive packs all sample files into a few large shard files with an offset index.
+    This avoids the metadata latency of opening millions of small files (e.g. on network file systems).
+    Shards are memory-mapped and samples are read by their sample index, which results in sequential,
+    large-block I/O if samples are accessed in archive order.
+
+    Archives can be created from the output of the
+    [input_interface][aucmedi.data_processing.io_data.input_interface] via
+    [build_archive()][aucmedi.data_processing.io_loader.archive_loader.build_archive].
+
+    ???+ info
+        Images are decoded via Pillow (like the [image_loader()][aucmedi.data_processing.io_loader.image_loader])
+        and NumPy files via NumPy (like the [numpy_loader()][aucmedi.data_processing.io_loader.numpy_loader]).
+
+    ???+ example
+        ```python
+        # Import required libraries
+        from aucmedi import *
+        from aucmedi.data_processing.io_loader import archive_loader, build_archive
+
+        # Initialize input data reader
+        ds = input_interface(interface="csv",
+                             path_imagedir="dataset/images/",
+                             path_data="dataset/annotations.csv",
+                             ohe=False, col_sample="ID", col_class="diagnosis")
+        (samples, class_ohe, nclasses, class_names, image_format) = ds
+
+        # Pack dataset into an archive (only once)
+        build_archive(samples, "dataset/images/", "dataset/archive/",
+                      image_format=image_format)
+
+        # Initialize DataGenerator with archive_loader
+        data_gen = DataGenerator(samples, "dataset/archive/", labels=class_ohe,
+                                 image_format=image_format, resize=(224, 224),
+                                 loader=archive_loader)
+        ```
+
+    Args:
+        sample (str):               Sample name/index of an image.
+        path_imagedir (str):        Path to the directory containing the dataset archive.
+        image_format (str):         Image format of the sample (not required, because stored in the archive).
+        grayscale (bool):           Boolean, whether images are grayscale or RGB.
+        two_dim (bool):             Boolean, whether NumPy samples are 2D or 3D.
+        decode_size (tuple of int): Minimum image shape (height, width) for downscaling during image decoding.
+        **kwargs (dict):            Additional parameters for the sample loader.
+    """
+    # Obtain archive reader
+    archive = get_archive(path_imagedir)
+    # Read raw sample file from archive
+    (data, file_format) = archive.read(sample)
+    # Decode NumPy sample
+    if file_format == "npy":
+        img = np.load(io.BytesIO(data), allow_pickle=False)
+        return verify_shape(img, grayscale, two_dim)
+    # Decode compressed NumPy sample (NpzFile with a single array)
+    elif file_format == "npz":
+        with np.load(io.BytesIO(data), allow_pickle=False) as npz:
+            if len(npz.files) != 1:
+                raise ValueError("NumPy archive sample has to contain " + \
+                                 "exactly one array:", sample, npz.files)
+            img = npz[npz.files[0]]
+        return verify_shape(img, grayscale, two_dim)
+    # Decode image sample
+    else : return decode_image(io.BytesIO(data), grayscale, decode_size)
+
+#-----------------------------------------------------#
+#                   Archive Creation                  #
+#-----------------------------------------------------#
+def build_archive(samples, path_imagedir, path_archive, image_format=None,
+                  shard_size=1024**3):
+    """ Pack the sample files of a dataset into a sharded dataset archive.
+
+    The sample files are concatenated in the order of the provided sample list into shard files
+    (`shard_<id>.bin`) and their offsets are stored in an index file (`index.json`).
+    Thus, the archive can be read by the
+    [archive_loader()][aucmedi.data_processing.io_loader.archive_loader].
+
+    Shards and index are written to temporary files and moved into place afterwards.
+    Thus, rebuilding an archive never truncates shard files, which are still memory-mapped by a reader.
+    Readers of other processes detect the rebuilt archive within `ARCHIVE_REFRESH_INTERVAL` seconds.
+
+    Args:
+        samples (list of str):      List of sample/index encoded as Strings. Provided by
+                                    [input_interface][aucmedi.data_processing.io_data.input_interface].
+        path_imagedir (str):        Path to the directory containing the images.
+        path_archive (str):         Path to the directory, in which the archive should be created.
+        image_format (str):         Image format to add at the end of the sample index for image loading.
+                                    Provided by [input_interface][aucmedi.data_processing.io_data.input_interface].
+        shard_size (int):           Maximum size of a shard file in bytes.
+
+    Returns:
+        path_index (str):           Path to the index file of the created archive.
+    """
+    # Create archive directory
+    if not os.path.exists(path_archive) : os.mkdir(path_archive)
+    # Initialize index
+    index = {"shards": [], "samples": {}}
+    shard_writer = None
+    # Pack each sample file sequentially into the shards
+    for sample in samples:
+        # Get sample path
+        if image_format : img_file = sample + "." + image_format
+        else : img_file = sample
+        path_img = os.path.join(path_imagedir, img_file)
+        # Read raw sample file
+        with open(path_img, "rb") as reader:
+            data = reader.read()
+        # Start a new shard if the current one is full
+        if shard_writer is None or \
+                (shard_writer.tell() > 0 and \
+                 shard_writer.tell() + len(data) > shard_size):
+            if shard_writer is not None : __close_shard__(shard_writer)
+            shard_name = "shard_" + str(len(index["shards"])).zfill(5) + ".bin"
+            index["shards"].append(shard_name)
+            shard_writer = open(os.path.join(path_archive,
+                                             shard_name + ".tmp"), "wb")
+        # Append sample file to the shard
+        file_format = os.path.splitext(img_file)[1][1:].lower()
+        index["samples"][sample] = [len(index["shards"]) - 1,
+                                    shard_writer.tell(), len(data),
+                                    file_format]
+        shard_writer.write(data)
+    if shard_writer is not None : __close_shard__(shard_writer)
+    # Store index
+    path_index = os.path.join(path_archive, "index.json")
+    with open(path_index + ".tmp", "w") as writer:
+        json.dump(index, writer)
+    os.replace(path_index + ".tmp", path_index)
+    # Drop cached reader of a previous archive in this directory
+    with __archives_lock__:
+        __archives__.pop(path_archive, None)
+    # Return path to index
+    return path_index
+
+""" Internal function for closing a temporary shard file and moving it into place. """
+def __close_shard__(shard_writer):
+    shard_writer.close()
+    os.replace(shard_writer.name, shard_writer.name[:-len(".tmp")])
+
+#-----------------------------------------------------#
+#                    Archive Reader                   #
+#-----------------------------------------------------#
+# Archive readers of the current process (one per archive directory)
+__archives__ = {}
+__archives_lock__ = threading.Lock()
+# Interval in seconds for checking whether an archive was rebuilt by another process
+ARCHIVE_REFRESH_INTERVAL = 10.0
+
+# Obtain the (cached) reader of an archive
+def get_archive(path_archive):
+    with __archives_lock__:
+        reader = __archives__.get(path_archive, None)
+        now = time.monotonic()
+        # Identify archive version via the modification time of its index
+        # (checked only once per refresh interval instead of for each sample)
+        if reader is None or now - reader.checked > ARCHIVE_REFRESH_INTERVAL:
+            mtime = os.stat(os.path.join(path_archive,
+                                         "index.json")).st_mtime_ns
+            if reader is None or reader.mtime != mtime:
+                reader = ArchiveReader(path_archive, mtime)
+                __archives__[path_archive] = reader
+            reader.checked = now
+        return reader
+
+class ArchiveReader:
+    """ Internal reader class for a dataset archive, which memory-maps the shard files. """
+    def __init__(self, path_archive, mtime=None):
+        self.path_archive = path_archive
+        self.mtime = mtime
+        self.checked = time.monotonic()
+        # Load index
+        with open(os.path.join(path_archive, "index.json"), "r") as reader:
+            index = json.load(reader)
+        self.shards = index["shards"]
+        self.samples = index["samples"]
+        # Memory-map shards lazily
+        self.shard_maps = [None] * len(self.shards)
+        self.lock = threading.Lock()
+
+    """ Read the raw sample file and its format from the archive. """
+    def read(self, sample):
+        if sample not in self.samples:
+            raise ValueError("Sample is not included in the archive:", sample,
+                             self.path_archive)
+        (shard, offset, length, file_format) = self.samples[sample]
+        shard_map = self.__get_shard__(shard)
+        return (shard_map[offset:offset+length], file_format)
+
+    """ Internal function for memory-mapping a shard file. """
+    def __get_shard__(self, shard):
+        with self.lock:
+            if self.shard_maps[shard] is None:
+                path_shard = os.path.join(self.path_archive, self.shards[shard])
+                # Empty shards cannot be memory-mapped
+                if os.path.getsize(path_shard) == 0:
+                    self.shard_maps[shard] = b""
+                    return self.shard_maps[shard]
+                with open(path_shard, "rb") as reader:
+                    shard_map = mmap.mmap(reader.fileno(), 0,
+                                          access=mmap.ACCESS_READ)
+                # Advise sequential access for large-block read-ahead
+                if hasattr(shard_map, "madvise") and \
+                        hasattr(mmap, "MADV_SEQUENTIAL"):
+                    shard_map.madvise(mmap.MADV_SEQUENTIAL)
+                self.shard_maps[shard] = shard_map
+            return self.shard_maps[shard]
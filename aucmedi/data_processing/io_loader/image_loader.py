@@ -28,7 +28,7 @@ from PIL import Image
 #             Image Loader for AUCMEDI IO             #
 #-----------------------------------------------------#
 def image_loader(sample, path_imagedir, image_format=None, grayscale=False,
-                 **kwargs):
+                 decode_size=None, **kwargs):
     """ Image Loader for image loading within the AUCMEDI pipeline.
 
     The Image Loader is an IO_loader function, which have to be passed to the
@@ -61,22 +61,57 @@ def image_loader(sample, path_imagedir, image_format=None, grayscale=False,
                                  loader=image_loader)
         ```
 
+    ???+ info "Decode-time Downscaling"
+        For large images (e.g. 4000x3000 JPEGs), a `decode_size` can be provided, which is usually the target
+        `resize` shape of the DataGenerator. The image is then already downscaled during decoding
+        (JPEG draft mode) or directly afterwards (box reduction by an integer factor).
+        The loaded image is never smaller than the `decode_size`, thus, the final resizing is still
+        performed by the [Resize][aucmedi.data_processing.subfunctions.resize] Subfunction.
+
+        The DataGenerator automatically uses its 2D `resize` shape as `decode_size`, if no Subfunctions
+        and patches are used (which could depend on the original resolution).
+        It can also be passed explicitly or disabled via `decode_size=None`:
+
+        ```python
+        data_gen = DataGenerator(samples, "dataset/images/", labels=class_ohe,
+                                 image_format=image_format, resize=(224, 224),
+                                 decode_size=None)
+        ```
+
     Args:
         sample (str):               Sample name/index of an image.
         path_imagedir (str):        Path to the directory containing the images.
         image_format (str):         Image format to add at the end of the sample index for image loading.
         grayscale (bool):           Boolean, whether images are grayscale or RGB.
+        decode_size (tuple of int): Minimum image shape (height, width) for downscaling during decoding.
+                                    If `None` is provided, images are decoded at full resolution.
         **kwargs (dict):            Additional parameters for the sample loader.
     """
     # Get image path
     if image_format : img_file = sample + "." + image_format
     else : img_file = sample
     path_img = os.path.join(path_imagedir, img_file)
+    # Load and decode image
+    return decode_image(path_img, grayscale, decode_size)
+
+#-----------------------------------------------------#
+#                     Subroutines                     #
+#-----------------------------------------------------#
+# Decode an image from a file path or file object
+def decode_image(file, grayscale=False, decode_size=None):
     # Load image via the PIL package
-    img_raw = Image.open(path_img)
+    img_raw = Image.open(file)
+    # Request reduced-size decoding (only supported by JPEG)
+    if decode_size is not None:
+        img_raw.draft(img_raw.mode, (decode_size[1], decode_size[0]))
     # Convert image to grayscale or rgb
     if grayscale : img_converted = img_raw.convert('LA')
     else : img_converted = img_raw.convert('RGB')
+    # Downscale image by an integer factor while keeping the decode size
+    if decode_size is not None:
+        factor = min(img_converted.size[0] // decode_size[1],
+                     img_converted.size[1] // decode_size[0])
+        if factor > 1 : img_converted = img_converted.reduce(factor)
     # Convert image to NumPy
     img = np.asarray(img_converted)
     # Perform additional preprocessing if grayscale image
@@ -27,7 +27,7 @@ import numpy as np
 #             Numpy Loader for AUCMEDI IO             #
 #-----------------------------------------------------#
 def numpy_loader(sample, path_imagedir, image_format=None, grayscale=False,
-                 two_dim=True, **kwargs):
+                 two_dim=True, mmap_mode=None, **kwargs):
     """ NumPy Loader for image loading within the AUCMEDI pipeline.
 
     The NumPy Loader is an IO_loader function, which have to be passed to the
@@ -35,6 +35,16 @@ def numpy_loader(sample, path_imagedir, image_format=None, grayscale=False,
 
     The NumPy load function `np.load(path_img, allow_pickle=True)` is used.
 
+    ???+ info "Memory-mapped Mode"
+        By passing a `mmap_mode` (e.g. `"c"` for copy-on-write or `"r"` for read-only),
+        the array is not read into memory. Instead, a memory-mapped view is returned and
+        following Subfunctions like [Crop][aucmedi.data_processing.subfunctions.crop]
+        or [Padding][aucmedi.data_processing.subfunctions.padding] read only the touched pages from disk.
+        For safety, pickle loading is disabled in this mode.
+
+        The read-only mode `"r"` does not allow in-place modifications of the image.
+        Thus, the copy-on-write mode `"c"` is recommended if the image is not resized.
+
     ???+ example
         ```python
         # Import required libraries
@@ -61,19 +71,30 @@ def numpy_loader(sample, path_imagedir, image_format=None, grayscale=False,
         image_format (str):         Image format to add at the end of the sample index for image loading.
         grayscale (bool):           Boolean, whether images are grayscale or RGB.
         two_dim (bool):             Boolean, whether image is 2D or 3D.
+        mmap_mode (str):            Memory-map mode for `np.load` (`"r"`, `"c"` or `"r+"`).
+                                    If `None` is provided, the complete array is read into memory.
         **kwargs (dict):            Additional parameters for the sample loader.
     """
     # Get image path
     if image_format : img_file = sample + "." + image_format
     else : img_file = sample
     path_img = os.path.join(path_imagedir, img_file)
-    # Load image via the NumPy package
-    img = np.load(path_img, allow_pickle=True)
+    # Load image via the NumPy package (without pickle for memory-mapping)
+    img = np.load(path_img, mmap_mode=mmap_mode,
+                  allow_pickle=(mmap_mode is None))
+    # Verify image shape and channel axis
+    return verify_shape(img, grayscale, two_dim)
+
+#-----------------------------------------------------#
+#                     Subroutines                     #
+#-----------------------------------------------------#
+# Verify shape of a loaded array and add a missing channel axis
+def verify_shape(img, grayscale, two_dim):
     # Verify image shape for grayscale & 2D
     if grayscale and two_dim:
         # Add channel axis and return image
         if len(img.shape) == 2:
-            return np.reshape(img, img.shape + (1,))
+            return np.expand_dims(img, axis=-1)
         # Just return image
         elif len(img.shape) == 3 and img.shape[-1] == 1:
             return img
@@ -86,7 +107,7 @@ def numpy_loader(sample, path_imagedir, image_format=None, grayscale=False,
     elif grayscale and not two_dim:
         # Add channel axis and return image
         if len(img.shape) == 3:
-            return np.reshape(img, img.shape + (1,))
+            return np.expand_dims(img, axis=-1)
         # Just return image
         elif len(img.shape) == 4 and img.shape[-1] == 1:
             return img
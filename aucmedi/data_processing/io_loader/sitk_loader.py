@@ -21,6 +21,8 @@
 #-----------------------------------------------------#
 # External libraries
 import os
+import hashlib
+import tempfile
 import numpy as np
 import SimpleITK as sitk
 
@@ -28,7 +30,9 @@ import SimpleITK as sitk
 #              SITK Loader for AUCMEDI IO             #
 #-----------------------------------------------------#
 def sitk_loader(sample, path_imagedir, image_format=None, grayscale=True,
-                resampling=(1.0, 1.0, 1.0), outside_value=0, **kwargs):
+                resampling=(1.0, 1.0, 1.0), outside_value=0,
+                interpolator=sitk.sitkLinear, patch_shape=None,
+                patch_position=None, resampling_cache=None, **kwargs):
     """ SimpleITK Loader for loading of CT/MRI scans in NIfTI (nii) or Metafile (mha) format within the AUCMEDI pipeline.
 
     The SimpleITK Loader is an IO_loader function, which have to be passed to the
@@ -63,6 +67,25 @@ def sitk_loader(sample, path_imagedir, image_format=None, grayscale=True,
                                 loader=sitk_loader)
         ```
 
+    ???+ info "Patch Mode"
+        If a `patch_shape` is provided, only the region of the patch is read from disk (via the SimpleITK ImageFileReader)
+        and resampled. The result is equal to cropping the patch out of the complete resampled volume,
+        but the required I/O and resampling time is proportional to the patch size.
+
+        The patch location is defined via `patch_position`, which encodes the relative position (z,y,x) in the range [0,1].
+        If `None` is provided, the patch is located in the center of the volume.
+        If the volume is smaller than the patch, the missing region is filled with the `outside_value`.
+
+        Patch coordinates can be sampled automatically by the DataGenerator via its `patch_shape` parameter.
+
+    ???+ info "Resampling Cache"
+        Resampling is usually the most expensive part of volume loading. By passing a directory as `resampling_cache`,
+        resampled volumes are stored persistently as raw NumPy files and memory-mapped (copy-on-write) for all later loads.
+        Thus, the resampling is computed only once per dataset instead of once per epoch.
+
+        Cache entries are keyed by file path, modification time, file size, target spacing, interpolator
+        and outside value. In combination with the patch mode, patches are cropped directly from the memory-mapped volume.
+
     Args:
         sample (str):               Sample name/index of an image.
         path_imagedir (str):        Path to the directory containing the images.
@@ -70,12 +93,39 @@ def sitk_loader(sample, path_imagedir, image_format=None, grayscale=True,
         grayscale (bool):           Boolean, whether images are grayscale or RGB.
         resampling (tuple of float):Tuple of 3x floats with z,y,x mapping encoding voxel spacing.
                                     If passing `None`, no normalization will be performed.
+        outside_value (int):        Value for voxels outside of the volume.
+        interpolator (int):         SimpleITK interpolator for resampling (e.g. `sitk.sitkLinear`).
+        patch_shape (tuple of int): Tuple of 3x integers with z,y,x mapping encoding the shape of a patch, which should be loaded.
+                                    If passing `None`, the complete volume will be loaded.
+        patch_position (tuple of float):Tuple of 3x floats with z,y,x mapping encoding the relative position of the patch.
+        resampling_cache (str):     Path to a directory for persistently caching resampled volumes.
+                                    If passing `None`, volumes are resampled on every load.
         **kwargs (dict):            Additional parameters for the sample loader.
     """
     # Get image path
     if image_format : img_file = sample + "." + image_format
     else : img_file = sample
     path_img = os.path.join(path_imagedir, img_file)
+    # Load resampled volume from persistent cache
+    if resampling_cache is not None and resampling is not None:
+        img = load_cached(path_img, resampling, outside_value, interpolator,
+                          resampling_cache)
+        # Crop patch out of the memory-mapped volume
+        if patch_shape is not None:
+            img = crop_patch(img, patch_shape, patch_position, outside_value)
+        return img
+    # Load only the region of a patch
+    if patch_shape is not None:
+        return load_patch(path_img, resampling, outside_value, interpolator,
+                          patch_shape, patch_position)
+    # Load complete volume
+    return load_volume(path_img, resampling, outside_value, interpolator)
+
+#-----------------------------------------------------#
+#                     Subroutines                     #
+#-----------------------------------------------------#
+# Load and resample a complete volume
+def load_volume(path_img, resampling, outside_value, interpolator):
     # Load image via the SimpleITK package
     sample_itk = sitk.ReadImage(path_img)
     # Perform resampling
@@ -95,7 +145,7 @@ def sitk_loader(sample, path_imagedir, image_format=None, grayscale=True,
         sample_itk_resampled = sitk.Resample(sample_itk,
                                              output_shape,
                                              sitk.Transform(),
-                                             sitk.sitkLinear,
+                                             interpolator,
                                              sample_itk.GetOrigin(),
                                              new_spacing,
                                              sample_itk.GetDirection(),
@@ -109,3 +159,138 @@ def sitk_loader(sample, path_imagedir, image_format=None, grayscale=True,
     if len(img.shape) == 3 : img = np.expand_dims(img, axis=-1)
     # Return image
     return img
+
+# Load and resample only the region of a patch via the sITK ImageFileReader
+def load_patch(path_img, resampling, outside_value, interpolator, patch_shape,
+               patch_position):
+    # Read only the image information from the header
+    reader = sitk.ImageFileReader()
+    reader.SetFileName(path_img)
+    reader.ReadImageInformation()
+    shape = reader.GetSize()
+    spacing = reader.GetSpacing()
+    # Reverse patch & resampling to sITK mapping (z,y,x -> x,y,z)
+    patch_size = [int(p) for p in patch_shape[::-1]]
+    if resampling is not None : new_spacing = resampling[::-1]
+    else : new_spacing = spacing
+    # Estimate volume shape after resampling
+    output_shape = [int(t[0] * t[1] / t[2]) \
+                    for t in zip(shape, spacing, new_spacing)]
+    # Compute patch start in the (resampled) volume
+    if patch_position is not None : patch_position = patch_position[::-1]
+    patch_start = compute_patch_start(output_shape, patch_size, patch_position)
+    # Compute the required region of the original volume
+    region_lower = []
+    region_upper = []
+    for i in range(len(output_shape)):
+        if resampling is not None:
+            # Include neighboring voxels for the interpolation
+            factor = new_spacing[i] / spacing[i]
+            lower = int(np.floor(patch_start[i] * factor)) - 1
+            upper = int(np.ceil((patch_start[i] + patch_size[i] - 1) * \
+                                factor)) + 1
+        else:
+            lower = patch_start[i]
+            upper = patch_start[i] + patch_size[i] - 1
+        region_lower.append(max(lower, 0))
+        region_upper.append(min(upper, shape[i] - 1))
+    # Read only the required region via the SimpleITK package
+    reader.SetExtractIndex(region_lower)
+    reader.SetExtractSize([u - l + 1 for l, u in zip(region_lower,
+                                                     region_upper)])
+    region_itk = reader.Execute()
+
+    # Perform resampling of the patch region
+    if resampling is not None:
+        # Compute physical origin of the patch
+        direction = np.reshape(reader.GetDirection(), (len(shape), len(shape)))
+        patch_origin = np.asarray(reader.GetOrigin()) + \
+                       direction.dot(np.multiply(patch_start, new_spacing))
+        # Perform resampling via sITK
+        patch_itk = sitk.Resample(region_itk,
+                                  patch_size,
+                                  sitk.Transform(),
+                                  interpolator,
+                                  patch_origin.tolist(),
+                                  new_spacing,
+                                  reader.GetDirection(),
+                                  outside_value,
+                                  sitk.sitkFloat32)
+        img = sitk.GetArrayFromImage(patch_itk)
+        # Fill region outside of the resampled volume
+        for i in range(len(output_shape)):
+            axis = len(output_shape) - 1 - i
+            lower = max(-patch_start[i], 0)
+            upper = min(output_shape[i] - patch_start[i], patch_size[i])
+            img[(slice(None),) * axis + (slice(0, lower),)] = outside_value
+            img[(slice(None),) * axis + (slice(upper, None),)] = outside_value
+    # Fill region outside of the volume without resampling
+    else:
+        img = sitk.GetArrayFromImage(region_itk)
+        pad_list = [(l - s, s + p - 1 - u) for s, p, l, u in \
+                    zip(patch_start, patch_size, region_lower, region_upper)]
+        img = np.pad(img, pad_list[::-1], mode="constant",
+                     constant_values=outside_value)
+    # Add single channel axis
+    if len(img.shape) == 3 : img = np.expand_dims(img, axis=-1)
+    # Return patch
+    return img
+
+# Compute the start of a patch in a volume
+def compute_patch_start(volume_shape, patch_shape, patch_position):
+    patch_start = []
+    for i in range(len(volume_shape)):
+        # Center patch if it is larger than the volume or no position is given
+        difference = volume_shape[i] - patch_shape[i]
+        if difference < 0 : start = -((-difference) // 2)
+        elif patch_position is None : start = difference // 2
+        else : start = min(int(patch_position[i] * (difference + 1)),
+                           difference)
+        patch_start.append(start)
+    return patch_start
+
+# Crop a patch out of a loaded volume
+def crop_patch(img, patch_shape, patch_position, outside_value):
+    patch_shape = [int(p) for p in patch_shape]
+    patch_start = compute_patch_start(img.shape[:-1], patch_shape,
+                                      patch_position)
+    # Slice patch region out of the volume (only touched pages are read)
+    slices = []
+    pad_list = []
+    for start, size, shape in zip(patch_start, patch_shape, img.shape[:-1]):
+        slices.append(slice(max(start, 0), min(start + size, shape)))
+        pad_list.append((max(-start, 0), max(start + size - shape, 0)))
+    patch = np.array(img[tuple(slices)])
+    # Fill region outside of the volume
+    if any(p[0] > 0 or p[1] > 0 for p in pad_list):
+        patch = np.pad(patch, pad_list + [(0, 0)], mode="constant",
+                       constant_values=outside_value)
+    return patch
+
+# Load a resampled volume from the persistent cache (or create the entry)
+def load_cached(path_img, resampling, outside_value, interpolator,
+                resampling_cache):
+    # Compute cache key from file and resampling parameters
+    stat = os.stat(path_img)
+    description = repr((os.path.abspath(path_img), stat.st_mtime_ns,
+                        stat.st_size, tuple(float(r) for r in resampling),
+                        int(interpolator), float(outside_value)))
+    key = hashlib.sha256(description.encode("utf-8")).hexdigest()
+    path_entry = os.path.join(resampling_cache, key + ".npy")
+    # Load memory-mapped volume from cache (copy-on-write)
+    if os.path.exists(path_entry):
+        return np.load(path_entry, mmap_mode="c", allow_pickle=False)
+    # Load and resample volume
+    img = load_volume(path_img, resampling, outside_value, interpolator)
+    # Write entry into a temporary file and move it atomically into place
+    os.makedirs(resampling_cache, exist_ok=True)
+    fd, path_tmp = tempfile.mkstemp(dir=resampling_cache, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file_writer:
+            np.save(file_writer, img, allow_pickle=False)
+        os.replace(path_tmp, path_entry)
+    except BaseException:
+        if os.path.exists(path_tmp) : os.remove(path_tmp)
+        raise
+    # Return resampled volume
+    return img
@@ -0,0 +1,166 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2022 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+# External libraries
+import numpy as np
+import threading
+import os
+
+#-----------------------------------------------------#
+#                Prepared Image Store                 #
+#-----------------------------------------------------#
+class PreparedImageStore:
+    """ Disk-based storage for beforehand preprocessed images of a
+        [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator].
+
+    This class is used **internally** by the DataGenerator if `prepare_images=True`.
+
+    All samples with the same shape and dtype as the first stored sample are written into
+    a single memory-mapped NumPy file. An offset index maps each sample index to its row in this file,
+    which allows zero-copy reading of samples via slicing.
+
+    Samples with a differing shape or dtype (e.g. volumes without resizing) are stored
+    as individual NumPy files as fallback.
+
+    ```
+    prepare_dir/
+        images.npy              # memory-mapped array with shape (n_samples, *sample_shape)
+        index.npy               # offset index: row of each sample or -1 for fallback samples
+        img_<index>.npy         # fallback for samples with variable shape
+    ```
+    """
+    #---------------------------------------------#
+    #                Initialization               #
+    #---------------------------------------------#
+    def __init__(self, path_dir, n_samples):
+        """ Initialization function for creating a Prepared Image Store.
+
+        Args:
+            path_dir (str):             Path to the directory in which the prepared images are stored.
+            n_samples (int):            Number of samples which will be stored.
+        """
+        # Cache class variables
+        self.path_dir = path_dir
+        self.n_samples = n_samples
+        self.path_data = os.path.join(path_dir, "images.npy")
+        self.path_index = os.path.join(path_dir, "index.npy")
+        # Initialize store layout
+        self.spec = None
+        self.offsets = None
+        self.memmap = None
+        self.memmap_mode = None
+        self.lock = threading.Lock()
+
+    #---------------------------------------------#
+    #                   Writing                   #
+    #---------------------------------------------#
+    def write(self, index, img):
+        """ Store a preprocessed image for the provided sample index.
+
+        The first written image defines the shape and dtype of the memory-mapped file.
+
+        Args:
+            index (int):                Sample index of the image.
+            img (numpy.ndarray):        Preprocessed image.
+        """
+        # Create memory-mapped file based on the first image
+        with self.lock:
+            if self.spec is None:
+                self.spec = (img.shape, img.dtype)
+                self.memmap = np.lib.format.open_memmap(self.path_data,
+                                        mode="w+", dtype=img.dtype,
+                                        shape=(self.n_samples,) + img.shape)
+                self.memmap_mode = "w+"
+        # Write image into its row of the memory-mapped file
+        if img.shape == self.spec[0] and img.dtype == self.spec[1]:
+            self.__get_memmap__(mode="r+")[index] = img
+        # Store image with differing shape in a separate file (fallback)
+        else : np.save(self.__get_path_fallback__(index), img)
+
+    def finalize(self):
+        """ Finish the writing phase by flushing the memory-mapped file and creating the offset index.
+
+        Required to be called once after all images are written.
+        """
+        # Flush memory-mapped file to disk and reopen it read-only
+        if self.memmap is not None : self.memmap.flush()
+        self.memmap = None
+        # Identify samples, which were stored as fallback files
+        fallback = set()
+        for file in os.listdir(self.path_dir):
+            if file.startswith("img_") and file.endswith(".npy"):
+                fallback.add(int(file[len("img_"):-len(".npy")]))
+        # Create offset index
+        self.offsets = np.arange(self.n_samples, dtype=np.int64)
+        if fallback : self.offsets[list(fallback)] = -1
+        np.save(self.path_index, self.offsets)
+
+    #---------------------------------------------#
+    #                   Reading                   #
+    #---------------------------------------------#
+    def read(self, index):
+        """ Load a preprocessed image for the provided sample index.
+
+        Samples inside the memory-mapped file are returned as read-only view without copying.
+        Thus, the returned image has to be copied before applying any in-place modification.
+
+        Args:
+            index (int):                Sample index of the image.
+
+        Returns:
+            img (numpy.ndarray):        Preprocessed image.
+        """
+        # Load offset index if required (e.g. in a worker process)
+        if self.offsets is None : self.offsets = np.load(self.path_index)
+        # Obtain row of the sample
+        row = self.offsets[index]
+        # Load image from fallback file
+        if row < 0 : return np.load(self.__get_path_fallback__(index))
+        # Obtain image via zero-copy slicing
+        return self.__get_memmap__(mode="r")[row]
+
+    #---------------------------------------------#
+    #               Internal Functions            #
+    #---------------------------------------------#
+    """ Internal function for obtaining the (lazily opened) memory-mapped file. """
+    def __get_memmap__(self, mode):
+        with self.lock:
+            if self.memmap is None or (mode == "r+" and self.memmap_mode == "r"):
+                self.memmap = np.load(self.path_data, mmap_mode=mode)
+                self.memmap_mode = mode
+        return self.memmap
+
+    """ Internal function for obtaining the path of a fallback file. """
+    def __get_path_fallback__(self, index):
+        return os.path.join(self.path_dir, "img_" + str(index) + ".npy")
+
+    """ Internal function for excluding the memory-mapped file and lock from pickling. """
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["memmap"] = None
+        state["memmap_mode"] = None
+        del state["lock"]
+        return state
+
+    """ Internal function for restoring the Prepared Image Store after unpickling. """
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
@@ -0,0 +1,317 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2022 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+# External libraries
+from collections import OrderedDict
+import numpy as np
+import threading
+import hashlib
+import tempfile
+import os
+
+#-----------------------------------------------------#
+#           Persistent Preprocessing Cache            #
+#-----------------------------------------------------#
+class PreprocessingCache:
+    """ Persistent on-disk cache for preprocessed samples of a
+        [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator].
+
+    This class is used **internally** by the DataGenerator if a `cache_dir` is provided.
+
+    The cache stores samples after image loading, application of Subfunctions and resizing
+    (before augmentation and standardization) as NumPy files. In contrast to `prepare_images`,
+    the cache directory is not deleted and can be reused across DataGenerator instances, processes and runs.
+
+    Each cache entry is identified by a key, which is derived from:
+
+    - the sample id,
+    - the modification time and size of the sample file,
+    - the IO loader and its parameters (`**kwargs`),
+    - the list of Subfunctions and
+    - the resize shape, grayscale option and image format.
+
+    If the sample file or the preprocessing pipeline changes, the key changes as well.
+    Thus, stale entries are never used again and are automatically invalidated.
+
+    ???+ warning
+        Subfunctions with random behaviour (e.g. `Crop(mode="random")`) are only applied once
+        and their result is reused from the cache.
+    """
+    #---------------------------------------------#
+    #                Initialization               #
+    #---------------------------------------------#
+    def __init__(self, path_dir, path_imagedir, image_format, loader, kwargs,
+                 subfunctions, resize, grayscale):
+        """ Initialization function for creating a Preprocessing Cache.
+
+        Args:
+            path_dir (str):                         Path to the persistent cache directory.
+            path_imagedir (str):                    Path to the directory containing the images.
+            image_format (str):                     Image format to add at the end of the sample index for image loading.
+            loader (io_loader function):            Function for loading samples/images from disk.
+            kwargs (dict):                          Additional parameters for the sample loader.
+            subfunctions (List of Subfunctions):    List of Subfunctions class instances.
+            resize (tuple of int):                  Resizing shape.
+            grayscale (bool):                       Boolean, whether images are grayscale or RGB.
+        """
+        # Cache class variables
+        self.path_dir = path_dir
+        self.path_imagedir = path_imagedir
+        self.image_format = image_format
+        # Create cache directory if required
+        os.makedirs(path_dir, exist_ok=True)
+        # Compute fingerprint of the preprocessing pipeline
+        pipeline = [describe(loader), describe(kwargs),
+                    describe(subfunctions), describe(resize),
+                    describe(grayscale), describe(image_format)]
+        self.fingerprint = hashlib.sha256(
+                                "|".join(pipeline).encode("utf-8")).hexdigest()
+
+    #---------------------------------------------#
+    #               Key Computation               #
+    #---------------------------------------------#
+    def key(self, sample):
+        """ Compute the cache key of a sample.
+
+        Args:
+            sample (str):               Sample name/index of an image.
+
+        Returns:
+            key (str):                  Cache key of the sample.
+        """
+        # Obtain modification time and size of the sample file
+        stats = None
+        if self.path_imagedir is not None:
+            if self.image_format : img_file = sample + "." + self.image_format
+            else : img_file = sample
+            try:
+                file_stat = os.stat(os.path.join(self.path_imagedir, img_file))
+                stats = (file_stat.st_mtime_ns, file_stat.st_size)
+            except OSError : stats = None
+        # Compute key based on pipeline fingerprint, sample id and file stats
+        key_raw = self.fingerprint + "|" + str(sample) + "|" + str(stats)
+        return hashlib.sha256(key_raw.encode("utf-8")).hexdigest()
+
+    #---------------------------------------------#
+    #              Loading and Storing            #
+    #---------------------------------------------#
+    def load(self, sample):
+        """ Load a preprocessed sample from the cache.
+
+        Args:
+            sample (str):               Sample name/index of an image.
+
+        Returns:
+            img (numpy.ndarray):        Preprocessed image or `None`, if the sample is not cached.
+        """
+        path_entry = os.path.join(self.path_dir, self.key(sample) + ".npy")
+        try : return np.load(path_entry, allow_pickle=False)
+        except (OSError, ValueError) : return None
+
+    def store(self, sample, img):
+        """ Store a preprocessed sample in the cache.
+
+        The entry is written to a temporary file first and then atomically moved into place.
+        Therefore, multiple processes can safely share the same cache directory.
+
+        Args:
+            sample (str):               Sample name/index of an image.
+            img (numpy.ndarray):        Preprocessed image.
+        """
+        path_entry = os.path.join(self.path_dir, self.key(sample) + ".npy")
+        # Write entry into a temporary file
+        fd, path_tmp = tempfile.mkstemp(dir=self.path_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file_writer:
+                np.save(file_writer, np.asarray(img), allow_pickle=False)
+            # Move entry atomically into place
+            os.replace(path_tmp, path_entry)
+        except BaseException:
+            if os.path.exists(path_tmp) : os.remove(path_tmp)
+            raise
+
+#-----------------------------------------------------#
+#              In-Memory LRU Sample Cache             #
+#-----------------------------------------------------#
+class MemoryCache:
+    """ Bounded in-memory cache for preprocessed samples of a
+        [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator].
+
+    This class is used **internally** by the DataGenerator if a `memory_cache_size` is provided.
+
+    The cache stores samples after image loading, application of Subfunctions and resizing
+    (before augmentation and standardization) in the RAM. If the byte budget is exceeded,
+    the least recently used samples are evicted.
+
+    Cached samples are stored as private read-only copies in order to avoid accidental modifications.
+    Loaded samples are returned as writeable copies, which allows in-place augmentation and standardization.
+
+    ???+ info "Cache Statistics"
+        The number of cache hits and misses can be obtained via `stats()`:
+        ```python
+        data_gen = DataGenerator(samples, "images_dir/", memory_cache_size=2*1024**3)
+        model.train(data_gen, epochs=100)
+        print(data_gen.memory_cache.stats())
+        # {'hits': 9900, 'misses': 100, 'entries': 100, 'bytes': 60211200}
+        ```
+
+    ???+ warning
+        For the `"process"` worker backend, each worker process maintains its own cache.
+    """
+    #---------------------------------------------#
+    #                Initialization               #
+    #---------------------------------------------#
+    def __init__(self, max_bytes):
+        """ Initialization function for creating a Memory Cache.
+
+        Args:
+            max_bytes (int):            Byte budget of the cache.
+        """
+        self.max_bytes = max_bytes
+        self.n_bytes = 0
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    #---------------------------------------------#
+    #              Loading and Storing            #
+    #---------------------------------------------#
+    def load(self, key):
+        """ Load a sample from the cache and mark it as recently used.
+
+        Args:
+            key (int or str):           Key of the sample.
+
+        Returns:
+            img (numpy.ndarray):        Writeable copy of the cached image or `None`, if the sample is not cached.
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                img = self.entries[key]
+            else:
+                self.misses += 1
+                return None
+        return img.copy()
+
+    def store(self, key, img):
+        """ Store a sample in the cache and evict least recently used samples if the budget is exceeded.
+
+        Samples which are larger than the complete budget are not cached.
+
+        Args:
+            key (int or str):           Key of the sample.
+            img (numpy.ndarray):        Image which should be cached.
+        """
+        # Skip samples which do not fit into the cache at all
+        if img.nbytes > self.max_bytes : return
+        # Store a private read-only copy (passed image remains writeable)
+        img = img.copy()
+        img.flags.writeable = False
+        with self.lock:
+            # Replace existing entry
+            if key in self.entries:
+                self.n_bytes -= self.entries.pop(key).nbytes
+            # Add entry
+            self.entries[key] = img
+            self.n_bytes += img.nbytes
+            # Evict least recently used entries
+            while self.n_bytes > self.max_bytes:
+                _, img_evicted = self.entries.popitem(last=False)
+                self.n_bytes -= img_evicted.nbytes
+
+    #---------------------------------------------#
+    #                 Management                  #
+    #---------------------------------------------#
+    def stats(self):
+        """ Obtain statistics of the cache.
+
+        Returns:
+            stats (dict):               Dictionary with number of hits, misses, entries and used bytes.
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "entries": len(self.entries), "bytes": self.n_bytes}
+
+    def clear(self):
+        """ Remove all entries from the cache and reset the statistics. """
+        with self.lock:
+            self.entries = OrderedDict()
+            self.n_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    """ Internal function for excluding cached entries and lock from pickling. """
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["entries"] = OrderedDict()
+        state["n_bytes"] = 0
+        del state["lock"]
+        return state
+
+    """ Internal function for restoring the Memory Cache after unpickling. """
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+#-----------------------------------------------------#
+#                     Subroutines                     #
+#-----------------------------------------------------#
+def describe(obj, depth=0):
+    """ Create a deterministic string description of an object for fingerprinting.
+
+    Functions are described by their module and name, NumPy arrays by a hash of their content and
+    other objects by their class name and attributes.
+
+    Args:
+        obj (object):               Object which should be described.
+        depth (int):                Current recursion depth.
+
+    Returns:
+        description (str):          Deterministic description of the object.
+    """
+    # Stop recursion for deeply nested objects
+    if depth > 8 : return type(obj).__name__
+    # Describe primitive types
+    if obj is None or isinstance(obj, (bool, int, float, str, bytes)):
+        return repr(obj)
+    # Describe NumPy arrays via content hash
+    elif isinstance(obj, np.ndarray):
+        return "ndarray(" + str(obj.shape) + "," + str(obj.dtype) + "," + \
+               hashlib.sha256(np.ascontiguousarray(obj).tobytes()).hexdigest() + ")"
+    # Describe sequences
+    elif isinstance(obj, (list, tuple)):
+        return "[" + ",".join(describe(x, depth+1) for x in obj) + "]"
+    # Describe dictionaries in sorted order
+    elif isinstance(obj, dict):
+        items = sorted((str(k), describe(v, depth+1)) for k, v in obj.items())
+        return "{" + ",".join(k + ":" + v for k, v in items) + "}"
+    # Describe functions and classes by their qualified name
+    elif callable(obj) and hasattr(obj, "__qualname__"):
+        return getattr(obj, "__module__", "") + "." + obj.__qualname__
+    # Describe class instances by their class name and attributes
+    elif hasattr(obj, "__dict__"):
+        return type(obj).__module__ + "." + type(obj).__qualname__ + \
+               describe(vars(obj), depth+1)
+    # Describe any other object by its representation
+    else : return type(obj).__name__ + "(" + repr(obj) + ")"
@@ -57,6 +57,10 @@
 
     Subfunctions are based on the abstract base class [Subfunction_Base][aucmedi.data_processing.subfunctions.sf_base.Subfunction_Base],
     which allow simple integration of custom preprocessing methods.
+
+    The [SubfunctionPipeline][aucmedi.data_processing.subfunctions.pipeline.SubfunctionPipeline] compiles a list of
+    Subfunctions into a chain with merged operations and a minimal number of array copies.
+    It is utilized by the DataGenerator for applying the Subfunctions and resizing.
 """
 #-----------------------------------------------------#
 #                   Library imports                   #
@@ -68,3 +72,4 @@ from aucmedi.data_processing.subfunctions.crop import Crop
 from aucmedi.data_processing.subfunctions.color_constancy import ColorConstancy
 from aucmedi.data_processing.subfunctions.clip import Clip
 from aucmedi.data_processing.subfunctions.chromer import Chromer
+from aucmedi.data_processing.subfunctions.pipeline import SubfunctionPipeline
@@ -0,0 +1,313 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2022 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+# External libraries
+import numpy as np
+# Internal libraries/scripts
+from aucmedi.data_processing.subfunctions.sf_base import Subfunction_Base
+from aucmedi.data_processing.subfunctions.padding import Padding
+from aucmedi.data_processing.subfunctions.crop import Crop
+from aucmedi.data_processing.subfunctions.clip import Clip
+from aucmedi.data_processing.subfunctions.chromer import Chromer
+from aucmedi.data_processing.subfunctions.resize import Resize
+from aucmedi.data_processing.subfunctions.standardize import Standardize
+
+#-----------------------------------------------------#
+#        Subfunction class: Subfunction Pipeline      #
+#-----------------------------------------------------#
+class SubfunctionPipeline(Subfunction_Base):
+    """ A Subfunction Pipeline class which plans and executes a complete chain of Subfunctions
+        with a minimal number of array copies.
+
+    The pipeline takes the list of Subfunctions as well as the optional Resize and Standardize
+    Subfunctions and compiles them into a plan of stages:
+
+    - A [Padding][aucmedi.data_processing.subfunctions.padding] directly followed by a center
+      [Crop][aucmedi.data_processing.subfunctions.crop] is merged into a single slice
+      (and a padding of only the missing border, if required).
+    - A [Clip][aucmedi.data_processing.subfunctions.clip] directly followed by a
+      [Standardize][aucmedi.data_processing.subfunctions.standardize] (`"minmax"`, `"grayscale"`) is merged
+      into a single scaling pass. The statistics of the clipped image are derived from the unclipped
+      minimum and maximum, and the clipping is performed afterwards with the scaled bounds.
+    - [Clip][aucmedi.data_processing.subfunctions.clip] and
+      [Standardize][aucmedi.data_processing.subfunctions.standardize] (`"z-score"`, `"minmax"`, `"grayscale"`)
+      operate in-place on intermediate float arrays, which are owned by the pipeline.
+    - All other Subfunctions are executed via their `transform()` function.
+
+    The output is identical (bit for bit) to the sequential application of the Subfunctions.
+    Arrays passed to the pipeline are never modified in-place, if the sequential application would not do so.
+
+    ???+ example
+        ```python
+        from aucmedi.data_processing.subfunctions import *
+
+        sf_list = [Standardize(mode="grayscale"), Padding(mode="square"),
+                   Crop(shape=(128, 128, 128)), Chromer(target="rgb")]
+        pipeline = SubfunctionPipeline(sf_list, resize=Resize(shape=(64, 64, 64)))
+
+        image_processed = pipeline.transform(image)
+        ```
+    """
+    #---------------------------------------------#
+    #                Initialization               #
+    #---------------------------------------------#
+    def __init__(self, subfunctions=[], resize=None, standardize=None):
+        """ Initialization function for creating a Subfunction Pipeline.
+
+        Args:
+            subfunctions (List of Subfunctions):    List of Subfunctions class instances which will be SEQUENTIALLY executed.
+            resize (Resize):                        Resize Subfunction which is applied after the Subfunctions.
+                                                    If `None` is provided, no resizing will be performed.
+            standardize (Standardize):              Standardize Subfunction which is applied at the end of the pipeline.
+                                                    If `None` is provided, no standardization will be performed.
+        """
+        # Cache class variables
+        self.subfunctions = subfunctions
+        self.resize = resize
+        self.standardize = standardize
+        # Gather sequential chain of Subfunctions
+        chain = list(subfunctions)
+        if resize is not None : chain.append(resize)
+        if standardize is not None : chain.append(standardize)
+        # Compile execution plan
+        self.plan = self.__compile__(chain)
+
+    #---------------------------------------------#
+    #                 Compilation                 #
+    #---------------------------------------------#
+    """ Internal function for compiling a chain of Subfunctions into stages. """
+    def __compile__(self, chain):
+        plan = []
+        i = 0
+        while i < len(chain):
+            sf = chain[i]
+            # Merge Padding and center Crop into a single stage
+            # (crop region is returned as view only if the following stage is
+            #  not sensitive to the memory layout, otherwise as contiguous copy)
+            if i+1 < len(chain) and is_fusable_padcrop(sf, chain[i+1]):
+                view = i+2 < len(chain) and is_layout_insensitive(chain[i+2])
+                plan.append(("padcrop", (sf, chain[i+1], view)))
+                i += 2
+                continue
+            # Merge Clip and MinMax/grayscale standardization into a single stage
+            elif i+1 < len(chain) and is_fusable_clipscale(sf, chain[i+1]):
+                plan.append(("clipscale", (sf, chain[i+1])))
+                i += 2
+                continue
+            # Perform clipping in-place
+            elif type(sf) is Clip : plan.append(("clip", sf))
+            # Perform standardization in-place
+            elif type(sf) is Standardize and \
+                    sf.mode in ["z-score", "minmax", "grayscale"]:
+                plan.append(("standardize", sf))
+            # Apply any other Subfunction via its transform function
+            else : plan.append(("transform", sf))
+            i += 1
+        return plan
+
+    #---------------------------------------------#
+    #                Transformation               #
+    #---------------------------------------------#
+    def transform(self, image):
+        # Passed images are not owned by the pipeline
+        owned = False
+        # Execute each stage of the plan
+        for (stage, sf) in self.plan:
+            if stage == "padcrop":
+                (image, owned) = self.__padcrop__(image, owned, *sf)
+            elif stage == "clipscale":
+                (image, owned) = self.__clipscale__(image, owned, *sf)
+            elif stage == "clip":
+                (image, owned) = self.__clip__(image, owned, sf)
+            elif stage == "standardize":
+                (image, owned) = self.__standardize__(image, owned, sf)
+            else:
+                image_transformed = sf.transform(image)
+                # Identify whether a new array was created by the Subfunction
+                if not np.may_share_memory(image_transformed, image):
+                    owned = image_transformed.flags.writeable
+                image = image_transformed
+        # Return processed image
+        return image
+
+    #---------------------------------------------#
+    #                Fused Stages                 #
+    #---------------------------------------------#
+    """ Internal function for a merged Padding & center Crop stage. """
+    def __padcrop__(self, image, owned, sf_padding, sf_crop, view=True):
+        spatial_shape = image.shape[:-1]
+        # Fallback to sequential execution for unexpected shapes
+        if len(sf_crop.shape) != len(spatial_shape) or \
+                (sf_padding.mode != "square" and \
+                 len(sf_padding.shape) < len(spatial_shape)):
+            image = sf_crop.transform(sf_padding.transform(image))
+            return (image, True)
+        # Identify padded shape like the Padding Subfunction
+        if sf_padding.mode == "square":
+            padded_shape = [max(spatial_shape) for x in spatial_shape]
+        else:
+            padded_shape = [max(sf_padding.shape[i], spatial_shape[i]) \
+                            for i in range(len(spatial_shape))]
+        # Compute crop region in original image coordinates
+        slices = []
+        pad_list = []
+        for i in range(len(spatial_shape)):
+            difference = padded_shape[i] - spatial_shape[i]
+            pad_below = difference // 2
+            # Fallback to sequential execution (raises the cropping error)
+            if padded_shape[i] < sf_crop.shape[i]:
+                image = sf_crop.transform(sf_padding.transform(image))
+                return (image, True)
+            # Identify center crop like the Crop Subfunction
+            start = (padded_shape[i] - sf_crop.shape[i]) // 2 - pad_below
+            end = start + sf_crop.shape[i]
+            # Identify missing border which still needs to be padded
+            slices.append(slice(max(start, 0), min(end, spatial_shape[i])))
+            pad_list.append([max(-start, 0), max(end - spatial_shape[i], 0)])
+        slices.append(slice(None))
+        pad_list.append([0, 0])
+        # Slice crop region out of the image
+        image_cropped = image[tuple(slices)]
+        # Pad missing border
+        if any(p[0] > 0 or p[1] > 0 for p in pad_list):
+            if sf_padding.mode == "square" : pad_mode = "edge"
+            else : pad_mode = sf_padding.mode
+            return (np.pad(image_cropped, pad_list, mode=pad_mode), True)
+        # Return view on the crop region
+        elif view : return (image_cropped, owned)
+        # Return crop region as contiguous copy
+        else : return (np.array(image_cropped), True)
+
+    """ Internal function for a merged Clip & MinMax/grayscale Standardize stage.
+
+        The scaling is monotonic and, thus, commutes bit-exactly with the clipping:
+        scaling a clipped value results in the identical value as clipping the scaled value with the scaled bounds.
+    """
+    def __clipscale__(self, image, owned, sf_clip, sf_std):
+        bounds = [b for b in [sf_clip.min, sf_clip.max] if b is not None]
+        # Use the sequential stages, if the merged stage is not applicable
+        if len(bounds) == 0 or not np.issubdtype(image.dtype, np.floating) or \
+                np.result_type(image, *bounds) != image.dtype or image.size == 0:
+            (image, owned) = self.__clip__(image, owned, sf_clip)
+            return self.__standardize__(image, owned, sf_std)
+        # Cast clipping bounds to the image dtype (like np.clip)
+        dtype = image.dtype.type
+        bound_min = None if sf_clip.min is None else dtype(sf_clip.min)
+        bound_max = None if sf_clip.max is None else dtype(sf_clip.max)
+        # Identify minimum and maximum of the clipped image
+        shift = np.clip(np.min(image), bound_min, bound_max)
+        max_value = np.clip(np.max(image), bound_min, bound_max)
+        scale = max_value - shift + sf_std.e
+        # Use the sequential stages, if the result dtype would be changed
+        if not scale > 0 or \
+                np.result_type(image, shift, sf_std.e, scale) != image.dtype:
+            (image, owned) = self.__clip__(image, owned, sf_clip)
+            return self.__standardize__(image, owned, sf_std)
+        # Scale image and clipping bounds in identical operation order as the Subfunction
+        if owned and is_inplace_compatible(image):
+            np.subtract(image, shift, out=image)
+        else : image = np.subtract(image, shift)
+        bounds = np.array([bound_min if bound_min is not None else max_value,
+                           bound_max if bound_max is not None else max_value],
+                          dtype=image.dtype)
+        np.subtract(bounds, shift, out=bounds)
+        for array in [image, bounds]:
+            np.add(array, sf_std.e, out=array)
+            np.divide(array, scale, out=array)
+            # Scaling to grayscale range [0,255]
+            if sf_std.mode == "grayscale":
+                np.multiply(array, 255, out=array)
+                np.around(array, decimals=0, out=array)
+        # Clip scaled image with the scaled bounds
+        np.clip(image, None if bound_min is None else bounds[0],
+                None if bound_max is None else bounds[1], out=image)
+        return (image, True)
+
+    """ Internal function for an in-place Clip stage. """
+    def __clip__(self, image, owned, sf):
+        # Clip in-place, if the result dtype is not changed
+        if owned and is_inplace_compatible(image, sf.min, sf.max):
+            np.clip(image, a_min=sf.min, a_max=sf.max, out=image)
+            return (image, True)
+        # Otherwise, use the Clip Subfunction
+        else : return (sf.transform(image), True)
+
+    """ Internal function for an in-place Standardize stage. """
+    def __standardize__(self, image, owned, sf):
+        # Use the Standardize Subfunction, if image is not owned by the pipeline
+        if not owned or not is_inplace_compatible(image):
+            return (sf.transform(image), True)
+        # Perform z-score normalization
+        if sf.mode == "z-score":
+            # Compute mean and standard deviation
+            shift = np.mean(image)
+            scale = np.std(image) + sf.e
+        # Perform MinMax or grayscale normalization
+        else:
+            # Identify minimum and maximum
+            max_value = np.max(image)
+            shift = np.min(image)
+            scale = max_value - shift + sf.e
+        # Use the Standardize Subfunction, if the result dtype would be changed
+        if not is_inplace_compatible(image, shift, sf.e, scale):
+            return (sf.transform(image), True)
+        # Scaling in-place in identical operation order as the Subfunction
+        np.subtract(image, shift, out=image)
+        np.add(image, sf.e, out=image)
+        np.divide(image, scale, out=image)
+        # Scaling to grayscale range [0,255]
+        if sf.mode == "grayscale":
+            if not is_inplace_compatible(image, 255) : image = image * 255
+            else : np.multiply(image, 255, out=image)
+            np.around(image, decimals=0, out=image)
+        # Return standardized image
+        return (image, True)
+
+#-----------------------------------------------------#
+#                     Subroutines                     #
+#-----------------------------------------------------#
+# Identify whether a Padding and a Crop Subfunction can be merged
+def is_fusable_padcrop(sf_first, sf_second):
+    return type(sf_first) is Padding and type(sf_second) is Crop and \
+           sf_second.mode == "center" and \
+           sf_first.mode in ["square", "edge", "constant"]
+
+# Identify whether a Clip and a Standardize Subfunction can be merged
+def is_fusable_clipscale(sf_first, sf_second):
+    return type(sf_first) is Clip and type(sf_second) is Standardize and \
+           sf_second.mode in ["minmax", "grayscale"]
+
+# Identify whether the result of a Subfunction is independent of the memory layout
+# of its input and the input is not modified
+def is_layout_insensitive(sf):
+    if type(sf) in [Padding, Crop, Clip, Chromer, Resize] : return True
+    elif type(sf) is Standardize and \
+            sf.mode in ["z-score", "minmax", "grayscale"]:
+        return True
+    else : return False
+
+# Identify whether an operation with scalars can be performed in-place
+# (writeable C-contiguous float array and no change of the result dtype)
+def is_inplace_compatible(image, *scalars):
+    scalars = [s for s in scalars if s is not None]
+    return image.flags.writeable and image.flags.c_contiguous and \
+           np.issubdtype(image.dtype, np.floating) and \
+           np.result_type(image, *scalars) == image.dtype
@@ -53,24 +53,40 @@ class Standardize(Subfunction_Base):
         Keras preprocess_input() for `"tf", "caffe", "torch"`
 
         https://www.tensorflow.org/api_docs/python/tf/keras/applications/imagenet_utils/preprocess_input
+
+    ???+ info "Batch-level Standardization"
+        Via `transform_batch()`, the standardization can be applied on a complete batch (stacked images)
+        at once. Sample-wise statistics are computed vectorized along the image axes and
+        the batch is standardized in-place as float32.
+
+        For the modes `["tf", "caffe", "torch"]`, the [0,255] range validation can be disabled (`validate=False`)
+        or only performed on a random fraction of samples (e.g. `validate=0.1`).
     """
     #---------------------------------------------#
     #                Initialization               #
     #---------------------------------------------#
-    def __init__(self, mode="z-score", smooth=0.000001):
+    def __init__(self, mode="z-score", smooth=0.000001, validate=True):
         """ Initialization function for creating a Standardize Subfunction which can be passed to a
             [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator].
 
         Args:
             mode (str):         Selected mode which standardization/normalization technique should be applied.
             smooth (float):     Smoothing factor to avoid zero devisions (epsilon).
+            validate (bool or float):   Option whether the [0,255] range of images should be verified for the modes
+                                        `["tf", "caffe", "torch"]`. If a float is provided, only the corresponding
+                                        fraction of samples is verified.
         """
         # Verify mode existence
         if mode not in ["z-score", "minmax", "grayscale", "tf", "caffe", "torch"]:
             raise ValueError("Subfunction - Standardize: Unknown modus", mode)
+        # Verify validation option
+        if not isinstance(validate, bool) and not 0 <= validate <= 1:
+            raise ValueError("Subfunction - Standardize: Validation fraction " \
+                             + "has to be between 0 and 1", validate)
         # Cache class variables
         self.mode = mode
         self.e = smooth
+        self.validate = validate
 
     #---------------------------------------------#
     #                Transformation               #
@@ -101,12 +117,82 @@ class Standardize(Subfunction_Base):
             image_norm = np.around(image_scaled * 255, decimals=0)
         else:
             # Verify if image is in [0,255] format
-            if np.min(image) < 0 or np.max(image) > 255:
-                raise ValueError("Subfunction Standardize: Image values are not in range [0,255]!",
-                    "Provided min/max values for image are:", np.min(image), np.max(image),
-                    "Ensure that all images are normalized to [0,255] before using the following modes:",
-                    "['tf', 'caffe', 'torch']")
+            selection = self.__sample_validation__(1)
+            if selection is not None and len(selection) > 0:
+                self.__check_range__(image)
             # Perform architecture standardization
             image_norm = imagenet_utils.preprocess_input(image, mode=self.mode)
         # Return standardized image
         return image_norm
+
+    def transform_batch(self, batch):
+        """ Apply the standardization on a complete batch of images at once.
+
+        The statistics are computed sample-wise along all image axes (excluding the first batch axis).
+        Thus, the result is equal to applying `transform()` on each image of the batch.
+
+        ???+ warning
+            A float32 batch is standardized in-place and, thus, overwritten!
+
+        Args:
+            batch (numpy.ndarray):      Stacked images with shape (n_samples, ...).
+
+        Returns:
+            batch (numpy.ndarray):      Standardized batch encoded as float32.
+        """
+        # Cast batch to float32 (without copy if already float32)
+        batch = np.asarray(batch, dtype=np.float32)
+        if not batch.flags.writeable : batch = batch.copy()
+        # Define sample-wise axes
+        axes = tuple(range(1, batch.ndim))
+        # Perform z-score normalization
+        if self.mode == "z-score":
+            # Compute mean and standard deviation
+            mean = np.mean(batch, axis=axes, keepdims=True)
+            std = np.std(batch, axis=axes, keepdims=True)
+            # Scaling
+            batch -= mean - self.e
+            batch /= std + self.e
+        # Perform MinMax or grayscale normalization
+        elif self.mode in ["minmax", "grayscale"]:
+            # Identify minimum and maximum
+            max_value = np.max(batch, axis=axes, keepdims=True)
+            min_value = np.min(batch, axis=axes, keepdims=True)
+            # Scaling between [0,1]
+            batch -= min_value - self.e
+            batch /= max_value - min_value + self.e
+            # Scaling to grayscale range [0,255]
+            if self.mode == "grayscale":
+                batch *= 255
+                np.around(batch, decimals=0, out=batch)
+        else:
+            # Verify if all or a random fraction of images are in [0,255] format
+            selection = self.__sample_validation__(len(batch))
+            if selection is not None and len(selection) > 0:
+                self.__check_range__(batch[selection])
+            # Perform architecture standardization (in-place for float32)
+            batch = imagenet_utils.preprocess_input(batch, mode=self.mode)
+        # Return standardized batch
+        return batch
+
+    #---------------------------------------------#
+    #               Range Validation              #
+    #---------------------------------------------#
+    """ Internal function for selecting the samples which should be verified. """
+    def __sample_validation__(self, n_samples):
+        # Verify all or no samples
+        if self.validate is True : return np.arange(n_samples)
+        elif self.validate is False : return None
+        # Verify a random fraction of samples
+        selection = np.random.rand(n_samples) < self.validate
+        return np.flatnonzero(selection)
+
+    """ Internal function for verifying the [0,255] range of images. """
+    def __check_range__(self, image):
+        min_value = np.min(image)
+        max_value = np.max(image)
+        if min_value < 0 or max_value > 255:
+            raise ValueError("Subfunction Standardize: Image values are not in range [0,255]!",
+                "Provided min/max values for image are:", min_value, max_value,
+                "Ensure that all images are normalized to [0,255] before using the following modes:",
+                "['tf', 'caffe', 'torch']")
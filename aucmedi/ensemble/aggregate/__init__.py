@@ -49,6 +49,10 @@ Example: [[0.4, 0.3, 0.3]]
 
 Aggregate functions are based on the abstract base class [Aggregate_Base][aucmedi.ensemble.aggregate.agg_base.Aggregate_Base],
 which allows simple integration of custom aggregate methods for Ensemble.
+
+Ensembles aggregate the predictions of all samples at once via `aggregate_batch()`,
+which receives the assembled predictions with shape (N_models, N_samples, N_classes).
+All AUCMEDI Aggregate functions provide a vectorized implementation of it.
 """
 #-----------------------------------------------------#
 #                   Library imports                   #
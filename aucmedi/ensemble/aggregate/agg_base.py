@@ -21,6 +21,7 @@
 #-----------------------------------------------------#
 # External libraries
 from abc import ABC, abstractmethod
+import numpy as np
 
 #-----------------------------------------------------#
 #         Abstract Base Class for Aggregation         #
@@ -58,6 +59,14 @@ class Aggregate_Base(ABC):
         | ------------------- | ---------------------------------------------------------- |
         | `__init__()`        | Object creation function.                                  |
         | `aggregate()`       | Merge multiple class predictions into a single prediction. |
+
+    !!! info "Optional Functions"
+        | Function            | Description                                                              |
+        | ------------------- | ------------------------------------------------------------------------ |
+        | `aggregate_batch()` | Merge multiple class predictions for a batch of samples at once.         |
+
+        By default, `aggregate_batch()` calls `aggregate()` for each sample.
+        Overwriting it with a vectorized implementation speeds up the aggregation for large prediction sets.
     """
     #---------------------------------------------#
     #                Initialization               #
@@ -86,3 +95,17 @@ class Aggregate_Base(ABC):
             pred (numpy.ndarray):       Merged prediction encoded in a NumPy matrix with shape (1, N_classes).
         """
         return pred
+
+    def aggregate_batch(self, preds):
+        """ Aggregate the predictions of multiple samples at once.
+
+        The default implementation calls `aggregate()` for each sample and stacks the results.
+
+        Args:
+            preds (numpy.ndarray):      Assembled predictions encoded in a NumPy matrix with shape (N_models, N_samples, N_classes).
+        Returns:
+            pred (numpy.ndarray):       Merged predictions encoded in a NumPy matrix with shape (N_samples, N_classes).
+        """
+        preds = np.asarray(preds)
+        pred = [self.aggregate(preds[:,i,:]) for i in range(preds.shape[1])]
+        return np.reshape(np.asarray(pred), (preds.shape[1], preds.shape[2]))
@@ -47,3 +47,7 @@ class AveragingMean(Aggregate_Base):
         pred = np.mean(preds, axis=0)
         # Return merged prediction
         return pred
+
+    def aggregate_batch(self, preds):
+        # Merge predictions of all samples via mean
+        return np.mean(preds, axis=0)
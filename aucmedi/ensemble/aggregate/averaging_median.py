@@ -47,3 +47,9 @@ class AveragingMedian(Aggregate_Base):
         pred = np.median(preds, axis=0)
         # Return merged prediction
         return pred
+
+    def aggregate_batch(self, preds):
+        # Merge predictions of all samples via median along the model axis
+        pred = np.median(preds, axis=0)
+        # Return merged predictions
+        return pred
@@ -56,3 +56,22 @@ class GlobalArgmax(Aggregate_Base):
 
         # Return prediction
         return pred
+
+    def aggregate_batch(self, preds):
+        n_models, n_samples, n_classes = preds.shape
+        index = np.arange(n_samples)
+        # Identify global argmax for all samples
+        preds_flatten = np.reshape(np.swapaxes(preds, 0, 1),
+                                   (n_samples, n_models*n_classes))
+        argmax_flatten = np.argmax(preds_flatten, axis=1)
+        max = preds_flatten[index, argmax_flatten]
+        argmax = argmax_flatten % n_classes
+
+        # Compute predictions by global argmax and equally distributed remaining
+        # probability for other classes
+        prob_remaining = np.divide(1-max, n_classes-1)
+        pred = np.repeat(prob_remaining[:, np.newaxis], n_classes, axis=1)
+        pred[index, argmax] = max
+
+        # Return predictions
+        return pred
@@ -52,3 +52,19 @@ class MajorityVote(Aggregate_Base):
         pred[majority_vote] = 1
         # Return prediction
         return pred
+
+    def aggregate_batch(self, preds):
+        n_models, n_samples, n_classes = preds.shape
+        index = np.arange(n_samples)
+        # Count votes for all samples
+        votes = np.argmax(preds, axis=2)
+        counts = np.zeros((n_samples, n_classes), dtype=np.int64)
+        for m in range(n_models):
+            counts[index, votes[m]] += 1
+        # Identify majority (lowest class index for ties)
+        majority_vote = np.argmax(counts, axis=1)
+        # Create predictions based on majority vote
+        pred = np.zeros((n_samples, n_classes))
+        pred[index, majority_vote] = 1
+        # Return predictions
+        return pred
@@ -50,10 +50,18 @@ class Softmax(Aggregate_Base):
         # Return prediction
         return pred
 
+    def aggregate_batch(self, preds):
+        # Sum up predictions of all samples
+        preds_sum = np.sum(preds, axis=0)
+        # Calculate softmax for each sample
+        pred = compute_softmax(preds_sum)
+        # Return predictions
+        return pred
+
 #-----------------------------------------------------#
 #             Subfunction: Softmax Formula            #
 #-----------------------------------------------------#
 def compute_softmax(x):
-    """Compute softmax values for each sets of scores in x."""
-    e_x = np.exp(x - np.max(x))
-    return e_x / e_x.sum()
+    """Compute softmax values for each sets of scores in x (along the last axis)."""
+    e_x = np.exp(x - np.max(x, axis=-1, keepdims=True))
+    return e_x / e_x.sum(axis=-1, keepdims=True)
@@ -20,6 +20,7 @@
 #                   Library imports                   #
 #-----------------------------------------------------#
 # External libraries
+from tensorflow.keras.utils import Sequence
 import numpy as np
 # Internal libraries
 from aucmedi import ImageAugmentation, VolumeAugmentation, DataGenerator
@@ -68,6 +69,16 @@ def predict_augmenting(model, prediction_generator, n_cycles=10, aggregate="mean
     ???+ warning
         The passed DataGenerator will be re-initialized!
         This can result in redundant image preparation if `prepare_images=True`.
+        Providing a persistent `cache_dir` to the DataGenerator allows reusing preprocessed images instead.
+
+    ??? info "Technical Details"
+        Each sample is loaded and preprocessed (Subfunctions & resizing) only once.
+        Afterwards, the augmentation and standardization are applied `n_cycles` times in memory
+        and the augmented copies of multiple samples are batched together.
+
+        Each batch contains `max(1, batch_size // n_cycles)` samples with all of their `n_cycles` augmented
+        copies (`batch_size` of the passed DataGenerator). Thus, a batch holds at most `batch_size` augmented
+        images if `batch_size >= n_cycles`. Otherwise, each batch holds a single sample with `n_cycles` images.
 
     ??? reference "Reference for Ensemble Learning Techniques"
         Dominik Müller, Iñaki Soto-Rey and Frank Kramer. (2022).
@@ -103,44 +114,108 @@ def predict_augmenting(model, prediction_generator, n_cycles=10, aggregate="mean
                                       gaussian_blur=False, downscaling=False,
                                       elastic_transform=False)
     else : data_aug = prediction_generator.data_aug
-    # Multiply sample list for prediction according to number of cycles
-    samples_aug = np.repeat(prediction_generator.samples, n_cycles)
-
-    # Re-initialize DataGenerator for inference
-    aug_gen = DataGenerator(samples_aug,
-                            path_imagedir=prediction_generator.path_imagedir,
-                            labels=None,
-                            metadata=prediction_generator.metadata,
-                            batch_size=prediction_generator.batch_size,
-                            data_aug=data_aug,
-                            seed=prediction_generator.seed,
-                            subfunctions=prediction_generator.subfunctions,
-                            shuffle=False,
-                            standardize_mode=prediction_generator.standardize_mode,
-                            resize=prediction_generator.resize,
-                            grayscale=prediction_generator.grayscale,
-                            prepare_images=prediction_generator.prepare_images,
-                            sample_weights=None,
-                            image_format=prediction_generator.image_format,
-                            loader=prediction_generator.sample_loader,
-                            workers=prediction_generator.workers,
-                            **prediction_generator.kwargs)
+    # Identify number of samples per batch (each with n_cycles augmented copies)
+    # -> batches contain n_cycles images if batch_size is smaller than n_cycles
+    batch_size = max(1, prediction_generator.batch_size // n_cycles)
+
+    # Re-initialize DataGenerator for loading each sample only once
+    # (augmentation & standardization are applied afterwards for each cycle)
+    base_gen = DataGenerator(prediction_generator.samples,
+                             path_imagedir=prediction_generator.path_imagedir,
+                             labels=None,
+                             metadata=prediction_generator.metadata,
+                             batch_size=batch_size,
+                             data_aug=None,
+                             seed=prediction_generator.seed,
+                             subfunctions=prediction_generator.subfunctions,
+                             shuffle=False,
+                             standardize_mode=None,
+                             resize=prediction_generator.resize,
+                             grayscale=prediction_generator.grayscale,
+                             prepare_images=prediction_generator.prepare_images,
+                             cache_dir=prediction_generator.cache_dir,
+                             memory_cache_size=prediction_generator.memory_cache_size,
+                             standardize_batch=prediction_generator.standardize_batch,
+                             standardize_validate=prediction_generator.standardize_validate,
+                             patch_shape=prediction_generator.patch_shape,
+                             patch_mode=prediction_generator.patch_mode,
+                             batch_dtype=None,
+                             sample_weights=None,
+                             image_format=prediction_generator.image_format,
+                             loader=prediction_generator.sample_loader,
+                             workers=prediction_generator.workers,
+                             worker_backend=prediction_generator.worker_backend,
+                             prefetch=prediction_generator.prefetch,
+                             **prediction_generator.kwargs)
+    # Create batches of augmented copies
+    aug_gen = AugmentingSequence(base_gen, data_aug, n_cycles,
+                                 prediction_generator.sf_standardize,
+                                 prediction_generator.standardize_batch,
+                                 prediction_generator.batch_dtype_np)
 
     # Compute predictions with provided model
-    preds_all = model.predict(aug_gen)
+    try : preds_all = model.predict(aug_gen)
+    finally : base_gen.shutdown()
 
+    # Rearrange predictions to shape (n_cycles, n_samples, n_labels)
+    preds_all = np.reshape(preds_all, (len(prediction_generator.samples),
+                                       n_cycles, -1))
+    preds_all = np.swapaxes(preds_all, 0, 1)
     # Ensemble inferences via aggregate function
-    preds_ensembled = []
-    for i in range(0, len(prediction_generator.samples)):
-        # Identify subset for a single sample
-        j = i*n_cycles
-        subset = preds_all[j:j+n_cycles]
-        # Aggregate predictions
-        pred_sample = agg_fun.aggregate(subset)
-        # Add prediction to prediction list
-        preds_ensembled.append(pred_sample)
-    # Convert prediction list to NumPy
-    preds_ensembled = np.asarray(preds_ensembled)
+    preds_ensembled = agg_fun.aggregate_batch(preds_all)
 
     # Return ensembled predictions
     return preds_ensembled
+
+#-----------------------------------------------------#
+#                     Subroutines                     #
+#-----------------------------------------------------#
+class AugmentingSequence(Sequence):
+    """ Internal Sequence for inference augmenting, which applies augmentation and standardization
+        multiple times on each batch of a DataGenerator.
+
+    The DataGenerator has to provide preprocessed images without augmentation and standardization.
+    Each batch contains the `n_cycles` augmented copies of each sample (ordered sample by sample).
+    """
+    def __init__(self, base_gen, data_aug, n_cycles, sf_standardize=None,
+                 standardize_batch=False, batch_dtype=None):
+        self.base_gen = base_gen
+        self.data_aug = data_aug
+        self.n_cycles = n_cycles
+        self.sf_standardize = sf_standardize
+        self.standardize_batch = standardize_batch
+        self.batch_dtype = batch_dtype
+        self.batch_size = base_gen.batch_size * n_cycles
+        self.last_batch = None
+
+    def __len__(self):
+        return len(self.base_gen)
+
+    def __getitem__(self, idx):
+        # Obtain preprocessed images (loaded only once)
+        # -> repeated requests of a batch (e.g. peeking by Keras) are served from memory
+        last_batch = self.last_batch
+        if last_batch is not None and last_batch[0] == idx:
+            batch = last_batch[1]
+        else:
+            batch = self.base_gen[idx][0]
+            self.last_batch = (idx, batch)
+        if isinstance(batch, list) : images, metadata = batch
+        else : images, metadata = batch, None
+        # Apply augmentation for each cycle
+        batch_aug = [self.data_aug.apply(img) for img in images \
+                     for c in range(self.n_cycles)]
+        # Apply standardization on each augmented image or the complete batch
+        if self.sf_standardize is not None and self.standardize_batch:
+            batch_aug = self.sf_standardize.transform_batch(np.stack(batch_aug))
+        elif self.sf_standardize is not None:
+            batch_aug = np.stack([self.sf_standardize.transform(img) \
+                                  for img in batch_aug])
+        else : batch_aug = np.stack(batch_aug)
+        # Cast image batch to the selected dtype
+        if self.batch_dtype is not None:
+            batch_aug = batch_aug.astype(self.batch_dtype, copy=False)
+        # Repeat metadata for each augmented copy
+        if metadata is not None:
+            batch_aug = [batch_aug, np.repeat(metadata, self.n_cycles, axis=0)]
+        return (batch_aug, )
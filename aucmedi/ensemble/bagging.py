@@ -24,12 +24,14 @@ import os
 import tempfile
 from tensorflow.keras.callbacks import ModelCheckpoint, CSVLogger
 from pathos.helpers import mp   # instead of 'import multiprocessing as mp'
+from queue import Empty
 import numpy as np
 import shutil
 # Internal libraries
 from aucmedi import DataGenerator, NeuralNetwork
 from aucmedi.sampling import sampling_kfold
 from aucmedi.ensemble.aggregate import aggregate_dict
+from aucmedi.ensemble.inference import verify_inference, predict_members
 
 #-----------------------------------------------------#
 #              Ensemble Learning: Bagging             #
@@ -74,10 +76,22 @@ class Bagging:
         Bagging sequentially performs fitting processes for multiple models (commonly `k_fold=3` up to `k_fold=10`),
         which will drastically increase training time.
 
+        On hosts with sufficient CPU cores and memory, multiple fold models can be trained at the same time
+        via `n_parallel`.
+
+    ??? info "Parallel Fold Training"
+        With `n_parallel > 1`, up to `n_parallel` fold training processes run at the same time.
+        The number of parallel processes is limited by the number of folds, the available CPU cores
+        and (if `memory_per_process` is provided) the available memory of the host.
+
+        To avoid oversubscription, the TensorFlow thread pools of each process are pinned:
+        the intra-op threads to the CPU cores per process and the inter-op threads to a quarter of it.
+
     ??? warning "DataGenerator re-initialization"
         The passed DataGenerator for the train() and predict() function of the Bagging class will be re-initialized!
 
         This can result in redundant image preparation if `prepare_images=True`.
+        Providing a persistent `cache_dir` to the DataGenerator allows reusing preprocessed images instead.
 
     ??? warning "NeuralNetwork re-initialization"
         The passed NeuralNetwork for the train() and predict() function of the Composite class will be re-initialized!
@@ -92,22 +106,49 @@ class Bagging:
 
         Via separate processes, it is possible to clean up the TensorFlow environment and rebuild it again for the next fold model.
 
+    ??? info "In-Process Inference"
+        Via the `inference` parameter, the inference of the member models can be performed in the current process
+        instead of creating an individual process for each model:
+
+        - `"process"`: Inference of each model in a separate process (default).
+        - `"resident"`: All models stay loaded in memory and are reused for subsequent predictions.
+          Each batch is loaded and preprocessed only once and passed to all models with the same
+          preprocessing signature (resize & standardize mode).
+        - `"sequential"`: Models are loaded one at a time and released afterwards.
+          Batches are loaded and preprocessed again for each model, because only a single model is kept in memory.
+          A `memory_cache_size` of the DataGenerator avoids repeated image loading and resizing.
+
+        In-process inference avoids the startup costs of a new process (re-importing TensorFlow and
+        rebuilding the model) for each model, but TensorFlow memory is not completely released between models.
+
     ??? reference "Reference for Ensemble Learning Techniques"
         Dominik Müller, Iñaki Soto-Rey and Frank Kramer. (2022).
         An Analysis on Ensemble Learning optimized Medical Image Classification with Deep Convolutional Neural Networks.
         arXiv e-print: [https://arxiv.org/abs/2201.11440](https://arxiv.org/abs/2201.11440)
     """
-    def __init__(self, model, k_fold=3):
+    def __init__(self, model, k_fold=3, n_parallel=1, memory_per_process=None,
+                 inference="process"):
         """ Initialization function for creating a Bagging object.
 
         Args:
             model (NeuralNetwork):         Instance of an AUCMEDI neural network class.
             k_fold (int):                   Number of folds (k) for the Cross-Validation. Must be at least 2.
+            n_parallel (int):               Maximum number of fold models which are trained at the same time.
+            memory_per_process (int):       Estimated memory (in bytes) required by a single fold training process.
+                                            If provided, the number of parallel processes is limited to the available memory.
+            inference (str):                Inference mode for the member models ("process", "resident" or "sequential").
         """
         # Cache class variables
         self.model_template = model
         self.k_fold = k_fold
+        self.n_parallel = n_parallel
+        self.memory_per_process = memory_per_process
         self.cache_dir = None
+        self.inference = inference
+        self.resident_models = {}
+
+        # Verify inference mode
+        verify_inference(inference)
 
         # Set multiprocessing method to spawn
         mp.set_start_method("spawn", force=True)
@@ -141,6 +182,8 @@ class Bagging:
         # Create temporary model directory
         self.cache_dir = tempfile.TemporaryDirectory(prefix="aucmedi.tmp.",
                                                      suffix=".bagging")
+        # Release resident models of previous fittings
+        self.resident_models = {}
 
         # Obtain training data
         x = training_generator.samples
@@ -151,7 +194,8 @@ class Bagging:
         cv_sampling = sampling_kfold(x, y, m, n_splits=self.k_fold,
                                      stratified=True, iterative=True)
 
-        # Sequentially iterate over all folds
+        # Gather process arguments for all folds
+        fold_arguments = []
         for i, fold in enumerate(cv_sampling):
             # Pack data into a tuple
             if len(fold) == 4:
@@ -169,7 +213,7 @@ class Bagging:
                                                  "cv_" + str(i) + \
                                                  ".logs.csv"),
                               separator=',', append=True)
-            callbacks.extend([cb_mc, cb_cl])
+            fold_callbacks = callbacks + [cb_mc, cb_cl]
 
             # Gather NeuralNetwork parameters
             model_paras = {
@@ -187,6 +231,9 @@ class Bagging:
                 "batch_queue_size": self.model_template.batch_queue_size,
                 "workers": self.model_template.workers,
                 "multiprocessing": self.model_template.multiprocessing,
+                "precision": self.model_template.precision,
+                "jit_compile": self.model_template.jit_compile,
+                "graph_predict": self.model_template.graph_predict,
             }
 
             # Gather DataGenerator parameters
@@ -200,34 +247,67 @@ class Bagging:
                              "resize": temp_dg.resize,
                              "grayscale": temp_dg.grayscale,
                              "prepare_images": temp_dg.prepare_images,
+                             "cache_dir": temp_dg.cache_dir,
+                             "memory_cache_size": temp_dg.memory_cache_size,
+                             "standardize_batch": temp_dg.standardize_batch,
+                             "standardize_validate": temp_dg.standardize_validate,
+                             "patch_shape": temp_dg.patch_shape,
+                             "patch_mode": temp_dg.patch_mode,
+                             "batch_dtype": temp_dg.batch_dtype,
                              "sample_weights": temp_dg.sample_weights,
                              "image_format": temp_dg.image_format,
                              "loader": temp_dg.sample_loader,
                              "workers": temp_dg.workers,
+                             "worker_backend": temp_dg.worker_backend,
+                             "prefetch": temp_dg.prefetch,
                              "kwargs": temp_dg.kwargs
             }
 
             # Gather training parameters
             parameters_training = {"epochs": epochs,
                                    "iterations": iterations,
-                                   "callbacks": callbacks,
+                                   "callbacks": fold_callbacks,
                                    "class_weights": class_weights,
                                    "transfer_learning": transfer_learning
             }
-
-            # Start training process
-            process_queue = mp.Queue()
-            process_train = mp.Process(target=__training_process__,
-                                       args=(process_queue,
-                                             model_paras,
-                                             data,
-                                             datagen_paras,
-                                             parameters_training))
-            process_train.start()
-            process_train.join()
-            cv_history = process_queue.get()
-            # Combine logged history objects
-            hcv = {"cv_" + str(i) + "." + k: v for k, v in cv_history.items()}
+            fold_arguments.append((model_paras, data, datagen_paras,
+                                   parameters_training))
+
+        # Identify number of parallel processes & threads per process
+        n_parallel = __compute_parallelism__(self.n_parallel, len(fold_arguments),
+                                             self.memory_per_process)
+        if n_parallel > 1:
+            threads = max(1, __available_cpus__() // n_parallel)
+            threads = (threads, max(1, threads // 4))
+        else : threads = None
+
+        # Run training processes (at most n_parallel at the same time)
+        process_queue = mp.Queue()
+        processes = {}
+        cv_histories = {}
+        try:
+            for i in range(len(fold_arguments)):
+                # Wait for a finished process if all slots are occupied
+                while len(processes) >= n_parallel:
+                    fold, cv_history = __wait_process__(process_queue, processes)
+                    cv_histories[fold] = cv_history
+                # Start training process
+                process_train = mp.Process(target=__training_process__,
+                                           args=(process_queue, i, threads,
+                                                 *fold_arguments[i]))
+                process_train.start()
+                processes[i] = process_train
+            # Wait for the remaining processes
+            while len(processes) > 0:
+                fold, cv_history = __wait_process__(process_queue, processes)
+                cv_histories[fold] = cv_history
+        finally:
+            for process in processes.values() : process.terminate()
+
+        # Combine logged history objects (in order of the folds)
+        for i in sorted(cv_histories):
+            hcv = {"cv_" + str(i) + "." + k: v \
+                   for k, v in cv_histories[i].items()}
             history_bagging = {**history_bagging, **hcv}
 
         # Return Bagging history object
@@ -276,7 +356,7 @@ class Bagging:
         # Initialize some variables
         temp_dg = prediction_generator
         preds_ensemble = []
-        preds_final = []
+        members = []
 
         # Gather DataGenerator parameters
         datagen_paras = {"samples": temp_dg.samples,
@@ -291,10 +371,19 @@ class Bagging:
                          "resize": temp_dg.resize,
                          "grayscale": temp_dg.grayscale,
                          "prepare_images": temp_dg.prepare_images,
+                         "cache_dir": temp_dg.cache_dir,
+                         "memory_cache_size": temp_dg.memory_cache_size,
+                         "standardize_batch": temp_dg.standardize_batch,
+                         "standardize_validate": temp_dg.standardize_validate,
+                         "patch_shape": temp_dg.patch_shape,
+                         "patch_mode": temp_dg.patch_mode,
+                         "batch_dtype": temp_dg.batch_dtype,
                          "sample_weights": temp_dg.sample_weights,
                          "image_format": temp_dg.image_format,
                          "loader": temp_dg.sample_loader,
                          "workers": temp_dg.workers,
+                         "worker_backend": temp_dg.worker_backend,
+                         "prefetch": temp_dg.prefetch,
                          "kwargs": temp_dg.kwargs
         }
 
@@ -323,30 +412,37 @@ class Bagging:
                 "batch_queue_size": self.model_template.batch_queue_size,
                 "workers": self.model_template.workers,
                 "multiprocessing": self.model_template.multiprocessing,
+                "precision": self.model_template.precision,
+                "jit_compile": self.model_template.jit_compile,
+                "graph_predict": self.model_template.graph_predict,
             }
 
             # Start inference process for fold i
-            process_queue = mp.Queue()
-            process_pred = mp.Process(target=__prediction_process__,
-                                      args=(process_queue,
-                                            model_paras,
-                                            path_model,
-                                            datagen_paras))
-            process_pred.start()
-            process_pred.join()
-            preds = process_queue.get()
-
-            # Append to prediction ensemble
-            preds_ensemble.append(preds)
+            if self.inference == "process":
+                process_queue = mp.Queue()
+                process_pred = mp.Process(target=__prediction_process__,
+                                          args=(process_queue,
+                                                model_paras,
+                                                path_model,
+                                                datagen_paras))
+                process_pred.start()
+                process_pred.join()
+                preds = process_queue.get()
+                # Append to prediction ensemble
+                preds_ensemble.append(preds)
+            # Gather fold i for inference in the current process
+            else : members.append((model_paras, path_model, datagen_paras))
+
+        # Run inference for all models in the current process
+        if self.inference != "process":
+            preds_ensemble = predict_members(members,
+                                             __prediction_generator__,
+                                             self.inference,
+                                             self.resident_models)
 
         # Aggregate predictions
         preds_ensemble = np.array(preds_ensemble)
-        for i in range(0, len(temp_dg.samples)):
-            pred_sample = agg_fun.aggregate(preds_ensemble[:,i,:])
-            preds_final.append(pred_sample)
-
-        # Convert prediction list to NumPy
-        preds_final = np.asarray(preds_final)
+        preds_final = agg_fun.aggregate_batch(preds_ensemble)
 
         # Return ensembled predictions
         if return_ensemble : return preds_final, preds_ensemble
@@ -393,12 +489,63 @@ class Bagging:
                                         " does not exist!", path_model)
         # Update model directory
         self.cache_dir = directory_path
+        self.resident_models = {}
 
 #-----------------------------------------------------#
 #                     Subroutines                     #
 #-----------------------------------------------------#
+# Internal function: obtain number of CPU cores available for this process
+def __available_cpus__():
+    try : return len(os.sched_getaffinity(0))
+    except AttributeError : return os.cpu_count() or 1
+
+# Internal function: obtain available memory of the host in bytes (None if unknown)
+def __available_memory__():
+    try:
+        with open("/proc/meminfo", "r") as reader:
+            for line in reader:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError : pass
+    try : return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError) : return None
+
+# Internal function: compute number of parallel processes within the CPU & memory budget
+def __compute_parallelism__(n_parallel, n_tasks, memory_per_process=None):
+    n = max(1, min(n_parallel, n_tasks, __available_cpus__()))
+    if memory_per_process is not None:
+        memory = __available_memory__()
+        if memory is not None:
+            n = max(1, min(n, memory // memory_per_process))
+    return int(n)
+
+# Internal function: wait for the result of any running process and release the process
+def __wait_process__(queue, processes):
+    while True:
+        try:
+            (index, result) = queue.get(timeout=1)
+            processes.pop(index).join()
+            return index, result
+        except Empty:
+            # Verify that no process crashed without returning a result
+            for index, process in processes.items():
+                if not process.is_alive() and process.exitcode != 0:
+                    raise RuntimeError("Ensemble process " + str(index) + \
+                                       " failed with exit code " + \
+                                       str(process.exitcode))
+
+# Internal function: pin TensorFlow thread pools of the current process
+def __pin_threads__(threads):
+    if threads is None : return
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads[0])
+    tf.config.threading.set_inter_op_parallelism_threads(threads[1])
+
 # Internal function for training a NeuralNetwork model in a separate process
-def __training_process__(queue, model_paras, data, datagen_paras, train_paras):
+def __training_process__(queue, fold, threads, model_paras, data,
+                         datagen_paras, train_paras):
+    # Pin thread pools to avoid oversubscription by parallel processes
+    __pin_threads__(threads)
     (train_x, train_y, train_m, test_x, test_y, test_m) = data
     # Build training DataGenerator
     cv_train_gen = DataGenerator(train_x,
@@ -414,10 +561,19 @@ def __training_process__(queue, model_paras, data, datagen_paras, train_paras):
                                  resize=datagen_paras["resize"],
                                  grayscale=datagen_paras["grayscale"],
                                  prepare_images=datagen_paras["prepare_images"],
+                                 cache_dir=datagen_paras["cache_dir"],
+                                 memory_cache_size=datagen_paras["memory_cache_size"],
+                                 standardize_batch=datagen_paras["standardize_batch"],
+                                 standardize_validate=datagen_paras["standardize_validate"],
+                                 patch_shape=datagen_paras["patch_shape"],
+                                 patch_mode=datagen_paras["patch_mode"],
+                                 batch_dtype=datagen_paras["batch_dtype"],
                                  sample_weights=datagen_paras["sample_weights"],
                                  image_format=datagen_paras["image_format"],
                                  loader=datagen_paras["loader"],
                                  workers=datagen_paras["workers"],
+                                 worker_backend=datagen_paras["worker_backend"],
+                                 prefetch=datagen_paras["prefetch"],
                                  **datagen_paras["kwargs"])
     # Build validation DataGenerator
     cv_val_gen = DataGenerator(test_x,
@@ -433,39 +589,62 @@ def __training_process__(queue, model_paras, data, datagen_paras, train_paras):
                                resize=datagen_paras["resize"],
                                grayscale=datagen_paras["grayscale"],
                                prepare_images=datagen_paras["prepare_images"],
+                               cache_dir=datagen_paras["cache_dir"],
+                               memory_cache_size=datagen_paras["memory_cache_size"],
+                               standardize_batch=datagen_paras["standardize_batch"],
+                               standardize_validate=datagen_paras["standardize_validate"],
+                               patch_shape=datagen_paras["patch_shape"],
+                               patch_mode=datagen_paras["patch_mode"],
+                               batch_dtype=datagen_paras["batch_dtype"],
                                sample_weights=datagen_paras["sample_weights"],
                                image_format=datagen_paras["image_format"],
                                loader=datagen_paras["loader"],
                                workers=datagen_paras["workers"],
+                               worker_backend=datagen_paras["worker_backend"],
+                               prefetch=datagen_paras["prefetch"],
                                **datagen_paras["kwargs"])
     # Create NeuralNetwork
     model = NeuralNetwork(**model_paras)
     # Start NeuralNetwork training
     cv_history = model.train(cv_train_gen, cv_val_gen, **train_paras)
     # Store result in cache (which will be returned by the process queue)
-    queue.put(cv_history)
+    queue.put((fold, cv_history))
+
+# Internal function for building the inference DataGenerator of a fitted NeuralNetwork model
+def __prediction_generator__(datagen_paras):
+    # Create inference DataGenerator
+    return DataGenerator(datagen_paras["samples"],
+                         path_imagedir=datagen_paras["path_imagedir"],
+                         labels=None,
+                         metadata=datagen_paras["metadata"],
+                         batch_size=datagen_paras["batch_size"],
+                         data_aug=datagen_paras["data_aug"],
+                         seed=datagen_paras["seed"],
+                         subfunctions=datagen_paras["subfunctions"],
+                         shuffle=datagen_paras["shuffle"],
+                         standardize_mode=datagen_paras["standardize_mode"],
+                         resize=datagen_paras["resize"],
+                         grayscale=datagen_paras["grayscale"],
+                         prepare_images=datagen_paras["prepare_images"],
+                         cache_dir=datagen_paras["cache_dir"],
+                         memory_cache_size=datagen_paras["memory_cache_size"],
+                         standardize_batch=datagen_paras["standardize_batch"],
+                         standardize_validate=datagen_paras["standardize_validate"],
+                         patch_shape=datagen_paras["patch_shape"],
+                         patch_mode=datagen_paras["patch_mode"],
+                         batch_dtype=datagen_paras["batch_dtype"],
+                         sample_weights=datagen_paras["sample_weights"],
+                         image_format=datagen_paras["image_format"],
+                         loader=datagen_paras["loader"],
+                         workers=datagen_paras["workers"],
+                         worker_backend=datagen_paras["worker_backend"],
+                         prefetch=datagen_paras["prefetch"],
+                         **datagen_paras["kwargs"])
 
 # Internal function for inference with a fitted NeuralNetwork model in a separate process
 def __prediction_process__(queue, model_paras, path_model, datagen_paras):
     # Create inference DataGenerator
-    cv_pred_gen = DataGenerator(datagen_paras["samples"],
-                                path_imagedir=datagen_paras["path_imagedir"],
-                                labels=None,
-                                metadata=datagen_paras["metadata"],
-                                batch_size=datagen_paras["batch_size"],
-                                data_aug=datagen_paras["data_aug"],
-                                seed=datagen_paras["seed"],
-                                subfunctions=datagen_paras["subfunctions"],
-                                shuffle=datagen_paras["shuffle"],
-                                standardize_mode=datagen_paras["standardize_mode"],
-                                resize=datagen_paras["resize"],
-                                grayscale=datagen_paras["grayscale"],
-                                prepare_images=datagen_paras["prepare_images"],
-                                sample_weights=datagen_paras["sample_weights"],
-                                image_format=datagen_paras["image_format"],
-                                loader=datagen_paras["loader"],
-                                workers=datagen_paras["workers"],
-                                **datagen_paras["kwargs"])
+    cv_pred_gen = __prediction_generator__(datagen_paras)
     # Create NeuralNetwork
     model = NeuralNetwork(**model_paras)
     # Load model weights from disk
@@ -30,6 +30,7 @@ import shutil
 from aucmedi import DataGenerator, NeuralNetwork
 from aucmedi.sampling import sampling_split, sampling_kfold
 from aucmedi.ensemble.aggregate import aggregate_dict
+from aucmedi.ensemble.inference import verify_inference, predict_members
 from aucmedi.ensemble.metalearner import metalearner_dict
 from aucmedi.ensemble.metalearner.ml_base import Metalearner_Base
 from aucmedi.ensemble.aggregate.agg_base import Aggregate_Base
@@ -83,6 +84,7 @@ class Composite:
         The passed DataGenerator for the train() and predict() function of the Composite class will be re-initialized!
 
         This can result in redundant image preparation if `prepare_images=True`.
+        Providing a persistent `cache_dir` to the DataGenerator allows reusing preprocessed images instead.
 
         Furthermore, the parameters `resize` and `standardize_mode` are automatically re-initialized with
         NeuralNetwork model specific values (`model.meta_standardize` for `standardize_mode` and
@@ -110,9 +112,25 @@ class Composite:
         which is why more and more redundant data pile up with an increasing number of models.
 
         Via separate processes, it is possible to clean up the TensorFlow environment and rebuild it again for the next model.
+
+    ??? info "In-Process Inference"
+        Via the `inference` parameter, the inference of the member models can be performed in the current process
+        instead of creating an individual process for each model:
+
+        - `"process"`: Inference of each model in a separate process (default).
+        - `"resident"`: All models stay loaded in memory and are reused for subsequent predictions.
+          Each batch is loaded and preprocessed only once and passed to all models with the same
+          preprocessing signature (resize & standardize mode).
+        - `"sequential"`: Models are loaded one at a time and released afterwards.
+          Batches are loaded and preprocessed again for each model, because only a single model is kept in memory.
+          A `memory_cache_size` of the DataGenerator avoids repeated image loading and resizing.
+
+        In-process inference avoids the startup costs of a new process (re-importing TensorFlow and
+        rebuilding the model) for each model, but TensorFlow memory is not completely released between models.
     """
     def __init__(self, model_list, metalearner="logistic_regression",
-                 k_fold=3, sampling=[0.85, 0.15], fixed_datagenerator=False):
+                 k_fold=3, sampling=[0.85, 0.15], fixed_datagenerator=False,
+                 inference="process"):
         """ Initialization function for creating a Composite object.
 
         Args:
@@ -125,6 +143,7 @@ class Composite:
                                                         for heterogenous metalearner (must sum up to 1.0).
             fixed_datagenerator (bool):                 Boolean, whether using fixed parameters of passed DataGenerator or
                                                         using default architecture paramters for Resizing and Standardize.
+            inference (str):                            Inference mode for the member models ("process", "resident" or "sequential").
         """
         # Cache class variables
         self.model_list = model_list
@@ -134,6 +153,8 @@ class Composite:
         self.fixed_datagenerator = fixed_datagenerator
         self.sampling_seed = 0
         self.cache_dir = None
+        self.inference = inference
+        self.resident_models = {}
 
         # Initialize Metalearner
         if isinstance(metalearner, str) and metalearner in metalearner_dict:
@@ -150,6 +171,9 @@ class Composite:
         if k_fold != len(model_list):
             raise ValueError("Length of model_list and k_fold has to be equal!")
 
+        # Verify inference mode
+        verify_inference(inference)
+
         # Set multiprocessing method to spawn
         mp.set_start_method("spawn", force=True)
 
@@ -188,6 +212,8 @@ class Composite:
         # Create temporary model directory
         self.cache_dir = tempfile.TemporaryDirectory(prefix="aucmedi.tmp.",
                                                      suffix=".composite")
+        # Release resident models of previous fittings
+        self.resident_models = {}
 
         # Obtain training data
         x = training_generator.samples
@@ -252,6 +278,9 @@ class Composite:
                 "batch_queue_size": self.model_list[i].batch_queue_size,
                 "workers": self.model_list[i].workers,
                 "multiprocessing": self.model_list[i].multiprocessing,
+                "precision": self.model_list[i].precision,
+                "jit_compile": self.model_list[i].jit_compile,
+                "graph_predict": self.model_list[i].graph_predict,
             }
 
             # Gather DataGenerator parameters
@@ -265,10 +294,19 @@ class Composite:
                              "resize": self.model_list[i].meta_input,
                              "grayscale": temp_dg.grayscale,
                              "prepare_images": temp_dg.prepare_images,
+                             "cache_dir": temp_dg.cache_dir,
+                             "memory_cache_size": temp_dg.memory_cache_size,
+                             "standardize_batch": temp_dg.standardize_batch,
+                             "standardize_validate": temp_dg.standardize_validate,
+                             "patch_shape": temp_dg.patch_shape,
+                             "patch_mode": temp_dg.patch_mode,
+                             "batch_dtype": temp_dg.batch_dtype,
                              "sample_weights": temp_dg.sample_weights,
                              "image_format": temp_dg.image_format,
                              "loader": temp_dg.sample_loader,
                              "workers": temp_dg.workers,
+                             "worker_backend": temp_dg.worker_backend,
+                             "prefetch": temp_dg.prefetch,
                              "kwargs": temp_dg.kwargs
             }
 
@@ -313,6 +351,7 @@ class Composite:
 
         temp_dg = training_generator    # Template DataGenerator variable for faster access
         preds_ensemble = []
+        members = []
 
         # Obtain training data
         x = training_generator.samples
@@ -355,6 +394,9 @@ class Composite:
                 "batch_queue_size": self.model_list[i].batch_queue_size,
                 "workers": self.model_list[i].workers,
                 "multiprocessing": self.model_list[i].multiprocessing,
+                "precision": self.model_list[i].precision,
+                "jit_compile": self.model_list[i].jit_compile,
+                "graph_predict": self.model_list[i].graph_predict,
             }
 
             # Gather DataGenerator parameters
@@ -368,27 +410,46 @@ class Composite:
                              "resize": self.model_list[i].meta_input,
                              "grayscale": temp_dg.grayscale,
                              "prepare_images": temp_dg.prepare_images,
+                             "cache_dir": temp_dg.cache_dir,
+                             "memory_cache_size": temp_dg.memory_cache_size,
+                             "standardize_batch": temp_dg.standardize_batch,
+                             "standardize_validate": temp_dg.standardize_validate,
+                             "patch_shape": temp_dg.patch_shape,
+                             "patch_mode": temp_dg.patch_mode,
+                             "batch_dtype": temp_dg.batch_dtype,
                              "sample_weights": temp_dg.sample_weights,
                              "image_format": temp_dg.image_format,
                              "loader": temp_dg.sample_loader,
                              "workers": temp_dg.workers,
+                             "worker_backend": temp_dg.worker_backend,
+                             "prefetch": temp_dg.prefetch,
                              "kwargs": temp_dg.kwargs
             }
 
             # Start inference process for model i
-            process_queue = mp.Queue()
-            process_pred = mp.Process(target=__prediction_process__,
-                                      args=(process_queue,
-                                            model_paras,
-                                            path_model,
-                                            data_ensemble,
-                                            datagen_paras))
-            process_pred.start()
-            process_pred.join()
-            preds = process_queue.get()
-
-            # Append preds to ensemble
-            preds_ensemble.append(preds)
+            if self.inference == "process":
+                process_queue = mp.Queue()
+                process_pred = mp.Process(target=__prediction_process__,
+                                          args=(process_queue,
+                                                model_paras,
+                                                path_model,
+                                                data_ensemble,
+                                                datagen_paras))
+                process_pred.start()
+                process_pred.join()
+                preds = process_queue.get()
+                # Append preds to ensemble
+                preds_ensemble.append(preds)
+            # Gather model i for inference in the current process
+            else : members.append((model_paras, path_model, datagen_paras))
+
+        # Run inference for all models in the current process
+        if self.inference != "process":
+            build_generator = lambda paras: \
+                __prediction_generator__(data_ensemble, paras)
+            preds_ensemble = predict_members(members, build_generator,
+                                             self.inference,
+                                             self.resident_models)
 
         # Preprocess prediction ensemble
         preds_ensemble = np.array(preds_ensemble)
@@ -438,6 +499,7 @@ class Composite:
         # Initialize some variables
         temp_dg = prediction_generator
         preds_ensemble = []
+        members = []
         preds_final = []
 
         # Extract data
@@ -469,6 +531,9 @@ class Composite:
                 "batch_queue_size": self.model_list[i].batch_queue_size,
                 "workers": self.model_list[i].workers,
                 "multiprocessing": self.model_list[i].multiprocessing,
+                "precision": self.model_list[i].precision,
+                "jit_compile": self.model_list[i].jit_compile,
+                "graph_predict": self.model_list[i].graph_predict,
             }
 
             # Gather DataGenerator parameters
@@ -482,27 +547,46 @@ class Composite:
                              "resize": self.model_list[i].meta_input,
                              "grayscale": temp_dg.grayscale,
                              "prepare_images": temp_dg.prepare_images,
+                             "cache_dir": temp_dg.cache_dir,
+                             "memory_cache_size": temp_dg.memory_cache_size,
+                             "standardize_batch": temp_dg.standardize_batch,
+                             "standardize_validate": temp_dg.standardize_validate,
+                             "patch_shape": temp_dg.patch_shape,
+                             "patch_mode": temp_dg.patch_mode,
+                             "batch_dtype": temp_dg.batch_dtype,
                              "sample_weights": temp_dg.sample_weights,
                              "image_format": temp_dg.image_format,
                              "loader": temp_dg.sample_loader,
                              "workers": temp_dg.workers,
+                             "worker_backend": temp_dg.worker_backend,
+                             "prefetch": temp_dg.prefetch,
                              "kwargs": temp_dg.kwargs
             }
 
             # Start inference process for model i
-            process_queue = mp.Queue()
-            process_pred = mp.Process(target=__prediction_process__,
-                                      args=(process_queue,
-                                            model_paras,
-                                            path_model,
-                                            data_test,
-                                            datagen_paras))
-            process_pred.start()
-            process_pred.join()
-            preds = process_queue.get()
-
-            # Append preds to ensemble
-            preds_ensemble.append(preds)
+            if self.inference == "process":
+                process_queue = mp.Queue()
+                process_pred = mp.Process(target=__prediction_process__,
+                                          args=(process_queue,
+                                                model_paras,
+                                                path_model,
+                                                data_test,
+                                                datagen_paras))
+                process_pred.start()
+                process_pred.join()
+                preds = process_queue.get()
+                # Append preds to ensemble
+                preds_ensemble.append(preds)
+            # Gather model i for inference in the current process
+            else : members.append((model_paras, path_model, datagen_paras))
+
+        # Run inference for all models in the current process
+        if self.inference != "process":
+            build_generator = lambda paras: \
+                __prediction_generator__(data_test, paras)
+            preds_ensemble = predict_members(members, build_generator,
+                                             self.inference,
+                                             self.resident_models)
 
         # Preprocess prediction ensemble
         preds_ensemble = np.array(preds_ensemble)
@@ -515,9 +599,8 @@ class Composite:
             preds_final = self.ml_model.predict(data=x_stack)
         # Apply homogeneous aggregate function
         elif isinstance(self.ml_model, Aggregate_Base):
-            for i in range(preds_ensemble.shape[0]):
-                pred_sample = self.ml_model.aggregate(preds_ensemble[i,:,:])
-                preds_final.append(pred_sample)
+            preds_models = np.swapaxes(preds_ensemble, 0, 1)
+            preds_final = self.ml_model.aggregate_batch(preds_models)
 
         # Convert prediction list to NumPy
         preds_final = np.asarray(preds_final)
@@ -576,6 +659,7 @@ class Composite:
 
         # Update model directory
         self.cache_dir = directory_path
+        self.resident_models = {}
 
 #-----------------------------------------------------#
 #                     Subroutines                     #
@@ -598,10 +682,19 @@ def __training_process__(queue, data, model_paras, datagen_paras, train_paras):
                                  resize=datagen_paras["resize"],
                                  grayscale=datagen_paras["grayscale"],
                                  prepare_images=datagen_paras["prepare_images"],
+                                 cache_dir=datagen_paras["cache_dir"],
+                                 memory_cache_size=datagen_paras["memory_cache_size"],
+                                 standardize_batch=datagen_paras["standardize_batch"],
+                                 standardize_validate=datagen_paras["standardize_validate"],
+                                 patch_shape=datagen_paras["patch_shape"],
+                                 patch_mode=datagen_paras["patch_mode"],
+                                 batch_dtype=datagen_paras["batch_dtype"],
                                  sample_weights=datagen_paras["sample_weights"],
                                  image_format=datagen_paras["image_format"],
                                  loader=datagen_paras["loader"],
                                  workers=datagen_paras["workers"],
+                                 worker_backend=datagen_paras["worker_backend"],
+                                 prefetch=datagen_paras["prefetch"],
                                  **datagen_paras["kwargs"])
     # Build validation DataGenerator
     cv_val_gen = DataGenerator(test_x,
@@ -617,10 +710,19 @@ def __training_process__(queue, data, model_paras, datagen_paras, train_paras):
                                resize=datagen_paras["resize"],
                                grayscale=datagen_paras["grayscale"],
                                prepare_images=datagen_paras["prepare_images"],
+                               cache_dir=datagen_paras["cache_dir"],
+                               memory_cache_size=datagen_paras["memory_cache_size"],
+                               standardize_batch=datagen_paras["standardize_batch"],
+                               standardize_validate=datagen_paras["standardize_validate"],
+                               patch_shape=datagen_paras["patch_shape"],
+                               patch_mode=datagen_paras["patch_mode"],
+                               batch_dtype=datagen_paras["batch_dtype"],
                                sample_weights=datagen_paras["sample_weights"],
                                image_format=datagen_paras["image_format"],
                                loader=datagen_paras["loader"],
                                workers=datagen_paras["workers"],
+                               worker_backend=datagen_paras["worker_backend"],
+                               prefetch=datagen_paras["prefetch"],
                                **datagen_paras["kwargs"])
     # Create NeuralNetwork
     model = NeuralNetwork(**model_paras)
@@ -629,30 +731,44 @@ def __training_process__(queue, data, model_paras, datagen_paras, train_paras):
     # Store result in cache (which will be returned by the process queue)
     queue.put(cv_history)
 
+# Internal function for building the inference DataGenerator of a fitted NeuralNetwork model
+def __prediction_generator__(data_test, datagen_paras):
+    # Extract data
+    (test_x, test_y, test_m) = data_test
+    # Create inference DataGenerator
+    return DataGenerator(test_x,
+                         path_imagedir=datagen_paras["path_imagedir"],
+                         labels=None,
+                         metadata=test_m,
+                         batch_size=datagen_paras["batch_size"],
+                         data_aug=None,
+                         seed=datagen_paras["seed"],
+                         subfunctions=datagen_paras["subfunctions"],
+                         shuffle=False,
+                         standardize_mode=datagen_paras["standardize_mode"],
+                         resize=datagen_paras["resize"],
+                         grayscale=datagen_paras["grayscale"],
+                         prepare_images=datagen_paras["prepare_images"],
+                         cache_dir=datagen_paras["cache_dir"],
+                         memory_cache_size=datagen_paras["memory_cache_size"],
+                         standardize_batch=datagen_paras["standardize_batch"],
+                         standardize_validate=datagen_paras["standardize_validate"],
+                         patch_shape=datagen_paras["patch_shape"],
+                         patch_mode=datagen_paras["patch_mode"],
+                         batch_dtype=datagen_paras["batch_dtype"],
+                         sample_weights=datagen_paras["sample_weights"],
+                         image_format=datagen_paras["image_format"],
+                         loader=datagen_paras["loader"],
+                         workers=datagen_paras["workers"],
+                         worker_backend=datagen_paras["worker_backend"],
+                         prefetch=datagen_paras["prefetch"],
+                         **datagen_paras["kwargs"])
+
 # Internal function for inference with a fitted NeuralNetwork model in a separate process
 def __prediction_process__(queue, model_paras, path_model, data_test,
                            datagen_paras):
-    # Extract data
-    (test_x, test_y, test_m) = data_test
     # Create inference DataGenerator
-    cv_pred_gen = DataGenerator(test_x,
-                                path_imagedir=datagen_paras["path_imagedir"],
-                                labels=None,
-                                metadata=test_m,
-                                batch_size=datagen_paras["batch_size"],
-                                data_aug=None,
-                                seed=datagen_paras["seed"],
-                                subfunctions=datagen_paras["subfunctions"],
-                                shuffle=False,
-                                standardize_mode=datagen_paras["standardize_mode"],
-                                resize=datagen_paras["resize"],
-                                grayscale=datagen_paras["grayscale"],
-                                prepare_images=datagen_paras["prepare_images"],
-                                sample_weights=datagen_paras["sample_weights"],
-                                image_format=datagen_paras["image_format"],
-                                loader=datagen_paras["loader"],
-                                workers=datagen_paras["workers"],
-                                **datagen_paras["kwargs"])
+    cv_pred_gen = __prediction_generator__(data_test, datagen_paras)
     # Create NeuralNetwork
     model = NeuralNetwork(**model_paras)
     # Load model weights from disk
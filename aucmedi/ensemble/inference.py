@@ -0,0 +1,175 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2022 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                    Documentation                    #
+#-----------------------------------------------------#
+""" Utilities for running the inference of ensemble member models in the current process.
+
+By default, the ensemble classes [Bagging][aucmedi.ensemble.bagging],
+[Stacking][aucmedi.ensemble.stacking] and [Composite][aucmedi.ensemble.composite]
+create an individual process for the inference of each member model.
+
+Via the `inference` parameter of an ensemble, the following modes can be selected:
+
+| Mode           | Description                                                                                |
+| -------------- | ------------------------------------------------------------------------------------------ |
+| `"process"`    | Inference of each model in a separate process (default).                                   |
+| `"resident"`   | Inference in the current process. Loaded models stay in memory for subsequent predictions. |
+| `"sequential"` | Inference in the current process. Models are loaded one at a time and released afterwards. |
+
+For in-process inference, member models are grouped by their preprocessing signature (resize & standardize mode).
+In the `"resident"` mode, each sample is loaded and preprocessed only once per group and the
+resulting batch is passed to all models of the group.
+In the `"sequential"` mode, the models of a group share a single DataGenerator
+(e.g. for reusing its in-memory cache). The decode-once fan-out is deliberately not applied in this mode:
+it would require either all models or all preprocessed batches of the dataset to be kept in memory,
+which contradicts loading only a single model at a time. Thus, batches are loaded and preprocessed for each model.
+"""
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+# External libraries
+import gc
+import os
+import numpy as np
+# Internal libraries
+from aucmedi.neural_network.model import NeuralNetwork
+
+#-----------------------------------------------------#
+#                   Inference Modes                   #
+#-----------------------------------------------------#
+# Supported inference modes for ensemble member models
+inference_modes = ["process", "resident", "sequential"]
+
+# Verify inference mode
+def verify_inference(inference):
+    if inference not in inference_modes:
+        raise ValueError("Unknown inference mode for ensemble. Possible " + \
+                         "modes: " + str(inference_modes), inference)
+
+#-----------------------------------------------------#
+#                 In-Process Inference                #
+#-----------------------------------------------------#
+def load_member(model_paras, path_model, inference="sequential",
+                resident_models=None):
+    """ Load a fitted ensemble member model in the current process.
+
+    For the `"resident"` inference mode, loaded models are stored in the passed
+    `resident_models` dictionary and are reused as long as the model file is unchanged.
+
+    Args:
+        model_paras (dict):             Dictionary of parameters for the [NeuralNetwork][aucmedi.neural_network.model.NeuralNetwork].
+        path_model (str):               Path to the fitted model file.
+        inference (str):                Inference mode (`"resident"` or `"sequential"`).
+        resident_models (dict):         Dictionary of resident models (only required for `"resident"` mode).
+
+    Returns:
+        model (NeuralNetwork):          NeuralNetwork with loaded model weights.
+    """
+    # Identify model by its file path and modification time
+    key = (path_model, os.path.getmtime(path_model))
+    # Reuse resident model
+    if inference == "resident" and key in resident_models:
+        return resident_models[key]
+    # Create NeuralNetwork and load model weights from disk
+    model = NeuralNetwork(**model_paras)
+    model.load(path_model)
+    # Keep model resident and remove outdated versions of it
+    if inference == "resident":
+        for k in [k for k in resident_models if k[0] == path_model]:
+            del resident_models[k]
+        resident_models[key] = model
+    return model
+
+def release_members():
+    """ Release the memory of member models which are no longer referenced.
+
+    Runs the garbage collector. The global Keras state (e.g. models of the user) is not cleared.
+    Thus, graph and layer name state of TensorFlow is not completely released between models.
+    """
+    gc.collect()
+
+def predict_members(members, build_generator, inference="resident",
+                    resident_models=None):
+    """ Inference function for multiple ensemble member models in the current process.
+
+    Members are grouped by their preprocessing signature (resize & standardize mode).
+    For each group, a single DataGenerator is created via the passed `build_generator` function.
+    In the `"resident"` mode, each batch is passed to all models of the group (loaded once).
+    In the `"sequential"` mode, the models iterate over the shared DataGenerator one after another.
+
+    Args:
+        members (list of tuple):        List of member models encoded as tuples of (model_paras, path_model, datagen_paras).
+        build_generator (function):     Function which creates the inference DataGenerator for a datagen_paras dictionary.
+        inference (str):                Inference mode (`"resident"` or `"sequential"`).
+        resident_models (dict):         Dictionary of resident models (only required for `"resident"` mode).
+
+    Returns:
+        preds (list of numpy.ndarray):  List of predictions for each member model with shape (n_samples, n_labels).
+    """
+    preds = [None] * len(members)
+    # Group members by preprocessing signature
+    groups = {}
+    for i, (_, _, datagen_paras) in enumerate(members):
+        resize = datagen_paras["resize"]
+        if resize is not None : resize = tuple(resize)
+        key = (resize, datagen_paras["standardize_mode"])
+        groups.setdefault(key, []).append(i)
+    # Run inference for each group of members
+    for indices in groups.values():
+        generator = build_generator(members[indices[0]][2])
+        # Pass each batch to all resident models of the group
+        if inference == "resident":
+            models = [load_member(members[i][0], members[i][1], inference,
+                                  resident_models) for i in indices]
+            for i, pred in zip(indices, predict_fanout(models, generator)):
+                preds[i] = pred
+        # Load and release models of the group one at a time
+        else:
+            for i in indices:
+                model = load_member(members[i][0], members[i][1], inference)
+                preds[i] = model.predict(generator)
+                del model
+                release_members()
+    return preds
+
+def predict_fanout(models, generator):
+    """ Inference function for passing each batch of a DataGenerator to multiple models.
+
+    Each batch is only loaded and preprocessed once, independent of the number of models.
+
+    Args:
+        models (list of NeuralNetwork): List of NeuralNetworks with loaded model weights.
+        generator (DataGenerator):      A data generator which will be used for inference.
+
+    Returns:
+        preds (list of numpy.ndarray):  List of predictions for each model with shape (n_samples, n_labels).
+    """
+    preds = [[] for model in models]
+    for b in range(len(generator)):
+        # Load and preprocess batch
+        batch = generator[b][0]
+        if isinstance(batch, (list, tuple)) : images, metadata = batch
+        else : images, metadata = batch, None
+        # Pass batch to all models (padded to a static batch shape)
+        for i, model in enumerate(models):
+            preds[i].append(model.predict_on_batch(images, metadata,
+                                            resize=False, standardize=False,
+                                            batch_size=generator.batch_size))
+    return [np.concatenate(p, axis=0) for p in preds]
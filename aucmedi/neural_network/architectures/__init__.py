@@ -61,24 +61,29 @@ which can be used for all types of image classifications and will be automatical
 #-----------------------------------------------------#
 # Abstract Base Class for Architectures
 from aucmedi.neural_network.architectures.arch_base import Architecture_Base
-# Classification Head
-from aucmedi.neural_network.architectures.classifier import Classifier
+# Lazy importing of the classification head & architecture modules
+from aucmedi.utils.lazy_import import LazyRegistry, lazy_attributes
+# Classification Head (imported on first access)
+__getattr__, __dir__ = lazy_attributes(globals(), {
+    "Classifier": "aucmedi.neural_network.architectures.classifier",
+})
 
 #-----------------------------------------------------#
 #       Access Functions to Architecture Classes      #
 #-----------------------------------------------------#
 # Initialize combined architecture_dict for image & volume architectures
-architecture_dict = {}
+# (architecture modules are only imported on first access)
+architecture_dict = LazyRegistry()
 
 # Add image architectures to architecture_dict
 from aucmedi.neural_network.architectures.image import architecture_dict as arch_image
 for arch in arch_image:
-    architecture_dict["2D." + arch] = arch_image[arch]
+    architecture_dict["2D." + arch] = arch_image.entry(arch)
 
 # Add volume architectures to architecture_dict
 from aucmedi.neural_network.architectures.volume import architecture_dict as arch_volume
 for arch in arch_volume:
-    architecture_dict["3D." + arch] = arch_volume[arch]
+    architecture_dict["3D." + arch] = arch_volume.entry(arch)
 
 #-----------------------------------------------------#
 #       Meta Information of Architecture Classes      #
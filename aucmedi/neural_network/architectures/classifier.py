@@ -175,7 +175,9 @@ class Classifier:
         # Apply classifier
         model_head = layers.Dense(self.n_labels, name="preds")(model_head)
         # Apply activation output according to classification type
-        model_head = layers.Activation(self.activation_output, name="probs")(model_head)
+        # (always computed in float32 for numerical stability in mixed precision)
+        model_head = layers.Activation(self.activation_output, name="probs",
+                                       dtype="float32")(model_head)
 
         # Obtain input layer
         if self.meta_variables is not None:
@@ -18,105 +18,52 @@
 #==============================================================================#
 # Abstract Base Class for Architectures
 from aucmedi.neural_network.architectures.arch_base import Architecture_Base
-
-#-----------------------------------------------------#
-#                    Architectures                    #
-#-----------------------------------------------------#
-# Vanilla Classifier
-from aucmedi.neural_network.architectures.image.vanilla import Vanilla
-# DenseNet
-from aucmedi.neural_network.architectures.image.densenet121 import DenseNet121
-from aucmedi.neural_network.architectures.image.densenet169 import DenseNet169
-from aucmedi.neural_network.architectures.image.densenet201 import DenseNet201
-# EfficientNet
-from aucmedi.neural_network.architectures.image.efficientnetb0 import EfficientNetB0
-from aucmedi.neural_network.architectures.image.efficientnetb1 import EfficientNetB1
-from aucmedi.neural_network.architectures.image.efficientnetb2 import EfficientNetB2
-from aucmedi.neural_network.architectures.image.efficientnetb3 import EfficientNetB3
-from aucmedi.neural_network.architectures.image.efficientnetb4 import EfficientNetB4
-from aucmedi.neural_network.architectures.image.efficientnetb5 import EfficientNetB5
-from aucmedi.neural_network.architectures.image.efficientnetb6 import EfficientNetB6
-from aucmedi.neural_network.architectures.image.efficientnetb7 import EfficientNetB7
-# InceptionResNet
-from aucmedi.neural_network.architectures.image.inceptionresnetv2 import InceptionResNetV2
-# InceptionV3
-from aucmedi.neural_network.architectures.image.inceptionv3 import InceptionV3
-# ResNet
-from aucmedi.neural_network.architectures.image.resnet50 import ResNet50
-from aucmedi.neural_network.architectures.image.resnet101 import ResNet101
-from aucmedi.neural_network.architectures.image.resnet152 import ResNet152
-# ResNetv2
-from aucmedi.neural_network.architectures.image.resnet50v2 import ResNet50V2
-from aucmedi.neural_network.architectures.image.resnet101v2 import ResNet101V2
-from aucmedi.neural_network.architectures.image.resnet152v2 import ResNet152V2
-# ResNeXt
-from aucmedi.neural_network.architectures.image.resnext50 import ResNeXt50
-from aucmedi.neural_network.architectures.image.resnext101 import ResNeXt101
-# MobileNet
-from aucmedi.neural_network.architectures.image.mobilenet import MobileNet
-from aucmedi.neural_network.architectures.image.mobilenetv2 import MobileNetV2
-# NasNet
-from aucmedi.neural_network.architectures.image.nasnetlarge import NASNetLarge
-from aucmedi.neural_network.architectures.image.nasnetmobile import NASNetMobile
-# VGG
-from aucmedi.neural_network.architectures.image.vgg16 import VGG16
-from aucmedi.neural_network.architectures.image.vgg19 import VGG19
-# Xception
-from aucmedi.neural_network.architectures.image.xception import Xception
-# Vision Transformer (ViT)
-from aucmedi.neural_network.architectures.image.vit_b16 import ViT_B16
-from aucmedi.neural_network.architectures.image.vit_b32 import ViT_B32
-from aucmedi.neural_network.architectures.image.vit_l16 import ViT_L16
-from aucmedi.neural_network.architectures.image.vit_l32 import ViT_L32
-# ConvNeXt
-from aucmedi.neural_network.architectures.image.convnext_base import ConvNeXtBase
-from aucmedi.neural_network.architectures.image.convnext_tiny import ConvNeXtTiny
-from aucmedi.neural_network.architectures.image.convnext_small import ConvNeXtSmall
-from aucmedi.neural_network.architectures.image.convnext_large import ConvNeXtLarge
+# Lazy importing of architecture modules
+from aucmedi.utils.lazy_import import LazyRegistry, lazy_attributes
 
 #-----------------------------------------------------#
 #       Access Functions to Architecture Classes      #
 #-----------------------------------------------------#
-# Architecture Dictionary
-architecture_dict = {
-    "Vanilla": Vanilla,
-    "ResNet50": ResNet50,
-    "ResNet101": ResNet101,
-    "ResNet152": ResNet152,
-    "ResNet50V2": ResNet50V2,
-    "ResNet101V2": ResNet101V2,
-    "ResNet152V2": ResNet152V2,
-    "ResNeXt50": ResNeXt50,
-    "ResNeXt101": ResNeXt101,
-    "DenseNet121": DenseNet121,
-    "DenseNet169": DenseNet169,
-    "DenseNet201": DenseNet201,
-    "EfficientNetB0": EfficientNetB0,
-    "EfficientNetB1": EfficientNetB1,
-    "EfficientNetB2": EfficientNetB2,
-    "EfficientNetB3": EfficientNetB3,
-    "EfficientNetB4": EfficientNetB4,
-    "EfficientNetB5": EfficientNetB5,
-    "EfficientNetB6": EfficientNetB6,
-    "EfficientNetB7": EfficientNetB7,
-    "InceptionResNetV2": InceptionResNetV2,
-    "InceptionV3": InceptionV3,
-    "MobileNet": MobileNet,
-    "MobileNetV2": MobileNetV2,
-    "NASNetMobile": NASNetMobile,
-    "NASNetLarge": NASNetLarge,
-    "VGG16": VGG16,
-    "VGG19": VGG19,
-    "Xception": Xception,
-    "ViT_B16": ViT_B16,
-    "ViT_B32": ViT_B32,
-    "ViT_L16": ViT_L16,
-    "ViT_L32": ViT_L32,
-    "ConvNeXtBase": ConvNeXtBase,
-    "ConvNeXtTiny": ConvNeXtTiny,
-    "ConvNeXtSmall": ConvNeXtSmall,
-    "ConvNeXtLarge": ConvNeXtLarge,
-}
+# Architecture Dictionary (architecture modules are imported on first access)
+architecture_dict = LazyRegistry(package=__name__, entries={
+    "Vanilla": "vanilla",
+    "ResNet50": "resnet50",
+    "ResNet101": "resnet101",
+    "ResNet152": "resnet152",
+    "ResNet50V2": "resnet50v2",
+    "ResNet101V2": "resnet101v2",
+    "ResNet152V2": "resnet152v2",
+    "ResNeXt50": "resnext50",
+    "ResNeXt101": "resnext101",
+    "DenseNet121": "densenet121",
+    "DenseNet169": "densenet169",
+    "DenseNet201": "densenet201",
+    "EfficientNetB0": "efficientnetb0",
+    "EfficientNetB1": "efficientnetb1",
+    "EfficientNetB2": "efficientnetb2",
+    "EfficientNetB3": "efficientnetb3",
+    "EfficientNetB4": "efficientnetb4",
+    "EfficientNetB5": "efficientnetb5",
+    "EfficientNetB6": "efficientnetb6",
+    "EfficientNetB7": "efficientnetb7",
+    "InceptionResNetV2": "inceptionresnetv2",
+    "InceptionV3": "inceptionv3",
+    "MobileNet": "mobilenet",
+    "MobileNetV2": "mobilenetv2",
+    "NASNetMobile": "nasnetmobile",
+    "NASNetLarge": "nasnetlarge",
+    "VGG16": "vgg16",
+    "VGG19": "vgg19",
+    "Xception": "xception",
+    "ViT_B16": "vit_b16",
+    "ViT_B32": "vit_b32",
+    "ViT_L16": "vit_l16",
+    "ViT_L32": "vit_l32",
+    "ConvNeXtBase": "convnext_base",
+    "ConvNeXtTiny": "convnext_tiny",
+    "ConvNeXtSmall": "convnext_small",
+    "ConvNeXtLarge": "convnext_large",
+})
 """ Dictionary of implemented 2D Architectures Methods in AUCMEDI.
 
     The base key (str) or an initialized Architecture can be passed to the [NeuralNetwork][aucmedi.neural_network.model.NeuralNetwork] class as `architecture` parameter.
@@ -242,3 +189,16 @@ supported_standardize_mode = {
         sf_norm = supported_standardize_mode["2D.ResNeXt101"]
         ```
 """
+
+#-----------------------------------------------------#
+#        Lazy Access to Architecture Classes          #
+#-----------------------------------------------------#
+# Import architecture classes on first module attribute access (PEP 562)
+__getattr__, __dir__ = lazy_attributes(globals(), {
+    arch: architecture_dict.entry(arch).module for arch in architectures
+})
+# Public names including the architecture submodules (identical to eager imports)
+__all__ = ["Architecture_Base", "architecture_dict", "architectures",
+           "supported_standardize_mode"] + architectures + \
+          [architecture_dict.entry(arch).module.rsplit(".", 1)[-1] \
+           for arch in architectures]
@@ -18,53 +18,30 @@
 #==============================================================================#
 # Abstract Base Class for Architectures
 from aucmedi.neural_network.architectures.arch_base import Architecture_Base
-
-#-----------------------------------------------------#
-#                    Architectures                    #
-#-----------------------------------------------------#
-# Vanilla Classifier
-from aucmedi.neural_network.architectures.volume.vanilla import Vanilla
-# DenseNet
-from aucmedi.neural_network.architectures.volume.densenet121 import DenseNet121
-from aucmedi.neural_network.architectures.volume.densenet169 import DenseNet169
-from aucmedi.neural_network.architectures.volume.densenet201 import DenseNet201
-# ResNet
-from aucmedi.neural_network.architectures.volume.resnet18 import ResNet18
-from aucmedi.neural_network.architectures.volume.resnet34 import ResNet34
-from aucmedi.neural_network.architectures.volume.resnet50 import ResNet50
-from aucmedi.neural_network.architectures.volume.resnet101 import ResNet101
-from aucmedi.neural_network.architectures.volume.resnet152 import ResNet152
-# ResNeXt
-from aucmedi.neural_network.architectures.volume.resnext50 import ResNeXt50
-from aucmedi.neural_network.architectures.volume.resnext101 import ResNeXt101
-# MobileNet
-from aucmedi.neural_network.architectures.volume.mobilenet import MobileNet
-from aucmedi.neural_network.architectures.volume.mobilenetv2 import MobileNetV2
-# VGG
-from aucmedi.neural_network.architectures.volume.vgg16 import VGG16
-from aucmedi.neural_network.architectures.volume.vgg19 import VGG19
+# Lazy importing of architecture modules
+from aucmedi.utils.lazy_import import LazyRegistry, lazy_attributes
 
 #-----------------------------------------------------#
 #       Access Functions to Architecture Classes      #
 #-----------------------------------------------------#
-# Architecture Dictionary
-architecture_dict = {
-    "Vanilla": Vanilla,
-    "DenseNet121": DenseNet121,
-    "DenseNet169": DenseNet169,
-    "DenseNet201": DenseNet201,
-    "ResNet18": ResNet18,
-    "ResNet34": ResNet34,
-    "ResNet50": ResNet50,
-    "ResNet101": ResNet101,
-    "ResNet152": ResNet152,
-    "ResNeXt50": ResNeXt50,
-    "ResNeXt101": ResNeXt101,
-    "MobileNet": MobileNet,
-    "MobileNetV2": MobileNetV2,
-    "VGG16": VGG16,
-    "VGG19": VGG19,
-}
+# Architecture Dictionary (architecture modules are imported on first access)
+architecture_dict = LazyRegistry(package=__name__, entries={
+    "Vanilla": "vanilla",
+    "DenseNet121": "densenet121",
+    "DenseNet169": "densenet169",
+    "DenseNet201": "densenet201",
+    "ResNet18": "resnet18",
+    "ResNet34": "resnet34",
+    "ResNet50": "resnet50",
+    "ResNet101": "resnet101",
+    "ResNet152": "resnet152",
+    "ResNeXt50": "resnext50",
+    "ResNeXt101": "resnext101",
+    "MobileNet": "mobilenet",
+    "MobileNetV2": "mobilenetv2",
+    "VGG16": "vgg16",
+    "VGG19": "vgg19",
+})
 """ Dictionary of implemented 3D Architectures Methods in AUCMEDI.
 
     The base key (str) or an initialized Architecture can be passed to the [NeuralNetwork][aucmedi.neural_network.model.NeuralNetwork] class as `architecture` parameter.
@@ -167,3 +144,16 @@ supported_standardize_mode = {
         sf_norm = supported_standardize_mode["3D.ResNeXt101"]
         ```
 """
+
+#-----------------------------------------------------#
+#        Lazy Access to Architecture Classes          #
+#-----------------------------------------------------#
+# Import architecture classes on first module attribute access (PEP 562)
+__getattr__, __dir__ = lazy_attributes(globals(), {
+    arch: architecture_dict.entry(arch).module for arch in architectures
+})
+# Public names including the architecture submodules (identical to eager imports)
+__all__ = ["Architecture_Base", "architecture_dict", "architectures",
+           "supported_standardize_mode"] + architectures + \
+          [architecture_dict.entry(arch).module.rsplit(".", 1)[-1] \
+           for arch in architectures]
@@ -21,9 +21,14 @@
 #-----------------------------------------------------#
 # External libraries
 from tensorflow.keras.models import load_model
+from tensorflow.keras.layers import Layer
 from tensorflow.keras.optimizers import Adam
+from tensorflow.keras import mixed_precision
+from tensorflow.keras.utils import OrderedEnqueuer, Progbar, Sequence
+import tensorflow as tf
 import numpy as np
 # Internal libraries/scripts
+from aucmedi.data_processing.subfunctions import Resize, Standardize
 from aucmedi.neural_network.architectures import architecture_dict, \
                                                  supported_standardize_mode, \
                                                  Classifier
@@ -139,7 +144,8 @@ class NeuralNetwork:
                  metrics=["categorical_accuracy"], activation_output="softmax",
                  fcl_dropout=True, meta_variables=None, learning_rate=0.0001,
                  batch_queue_size=10, workers=1, multiprocessing=False,
-                 verbose=1):
+                 verbose=1, cache_model=False, precision=None,
+                 jit_compile=False, graph_predict=False):
         """ Initialization function for creating a Neural Network (model) object.
 
         Args:
@@ -172,6 +178,33 @@ class NeuralNetwork:
             workers (int):                          Number of workers/threads which preprocess batches during runtime.
             multiprocessing (bool):                 Option whether to utilize multi-processing for workers instead of threading .
             verbose (int):                          Option (0/1) how much information should be written to stdout.
+            cache_model (bool):                     Option whether to utilize the in-process model cache for architectures from the
+                                                    architecture dictionary. Repeated constructions with identical architecture,
+                                                    input shape, channels and classification head are created from the cached
+                                                    model configuration and initial weights, instead of rebuilding the architecture
+                                                    and reloading pretrained weights.
+            precision (str):                        Dtype policy of the model. Possible options: `[None, "float32", "mixed_float16", "mixed_bfloat16"]`.
+                                                    For mixed precision, layers compute in half precision while variables are kept in float32.
+                                                    The output layer of the classification head is always computed in float32.
+                                                    For `"mixed_float16"`, dynamic loss scaling is applied to avoid numeric underflow of gradients.
+                                                    If `None` is provided, the global dtype policy of Keras is used (by default float32).
+            jit_compile (bool):                     Option whether the train and predict steps should be compiled with XLA.
+                                                    For inference, the graph predict function (see `graph_predict`) is compiled with XLA.
+            graph_predict (bool):                   Option whether inference should be performed with a `tf.function` with a fixed input
+                                                    signature instead of the Keras predict function. The final partial batch is padded.
+                                                    Thus, shapes stay static and no retracing occurs.
+
+        ???+ info "Compiled Inference"
+            The graph predict function avoids the per-batch overhead of the Keras predict loop and is
+            commonly faster for CPU inference. XLA compilation (`jit_compile=True`) is mainly beneficial on GPUs/TPUs.
+            On CPUs, XLA compiled convolutions can be slower than the default oneDNN kernels of TensorFlow.
+
+        ???+ info "Initial Weights"
+            The initial weights for [reset_weights()][aucmedi.neural_network.model.NeuralNetwork.reset_weights]
+            are snapshotted lazily, at the latest before the first training. Models from the in-process model cache
+            share a single snapshot of initial weights. Thus, all of them start from identical initial weights.
+
+            The model cache can be released via [clear_model_cache()][aucmedi.neural_network.model.clear_model_cache].
 
         ???+ danger
             Class attributes can be modified also after initialization, at will.
@@ -184,6 +217,8 @@ class NeuralNetwork:
             meta_input (tuple of int):              Meta variable: Input shape of architecture which can be passed to a DataGenerator. For example: (224, 224).
             meta_standardize (str):                 Meta variable: Recommended standardize_mode of architecture which can be passed to a DataGenerator.
                                                     For example: "torch".
+            meta_batch_dtype (str):                 Meta variable: Recommended batch_dtype for the precision of the model which can be passed to a
+                                                    DataGenerator. For example: "float16" for mixed_float16 or `None` for float32.
         """
         # Cache parameters
         self.n_labels = n_labels
@@ -199,6 +234,13 @@ class NeuralNetwork:
         self.fcl_dropout = fcl_dropout
         self.meta_variables = meta_variables
         self.verbose = verbose
+        self.precision = precision
+        self.jit_compile = jit_compile
+        self.graph_predict = graph_predict
+        self.predict_functions = {}
+        # Verify dtype policy
+        if precision not in [None, "float32", "mixed_float16", "mixed_bfloat16"]:
+            raise ValueError("Unknown precision for NeuralNetwork", precision)
 
         # Assemble architecture parameters
         arch_paras = {"channels":channels,
@@ -224,18 +266,52 @@ class NeuralNetwork:
             self.architecture = architecture
             self.meta_standardize = None
 
-        # Build model utilizing the selected architecture
-        self.model = self.architecture.create_model()
+        # Identify key for the in-process model cache
+        cache_key = None
+        if cache_model and (architecture is None or \
+                            (isinstance(architecture, str) and \
+                             architecture in architecture_dict)):
+            if input_shape is not None : input_shape = tuple(input_shape)
+            cache_key = (architecture or "2D.Vanilla", channels, input_shape,
+                         pretrained_weights, n_labels, fcl_dropout,
+                         activation_output, meta_variables, precision)
+
+        # Activate dtype policy for building the model
+        policy_global = mixed_precision.global_policy()
+        if precision is not None : mixed_precision.set_global_policy(precision)
+        try:
+            # Build model from the in-process model cache
+            if cache_key is not None and cache_key in model_cache:
+                self.model = load_cached_model(model_cache[cache_key])
+                self._initialization_weights = model_cache[cache_key]["weights"]
+            # Build model utilizing the selected architecture
+            else:
+                self.model = self.architecture.create_model()
+                self._initialization_weights = None
+                # Store model configuration and initial weights in the cache
+                if cache_key is not None:
+                    model_cache[cache_key] = store_cached_model(self.model)
+                    self._initialization_weights = \
+                        model_cache[cache_key]["weights"]
+        # Restore global dtype policy
+        finally : mixed_precision.set_global_policy(policy_global)
+        # Model which provides the initial weights for a lazy snapshot
+        if self._initialization_weights is None:
+            self._initialization_model = self.model
+        else : self._initialization_model = None
 
         # Compile model
-        self.model.compile(optimizer=Adam(learning_rate=learning_rate),
-                           loss=self.loss, metrics=self.metrics)
+        self.model.compile(optimizer=self.__create_optimizer__(learning_rate),
+                           loss=self.loss, metrics=self.metrics,
+                           jit_compile=self.jit_compile)
 
         # Obtain final input shape
         self.input_shape = self.architecture.input          # e.g. (224, 224, 3)
         self.meta_input = self.architecture.input[:-1]      # e.g. (224, 224) -> for DataGenerator
-        # Cache starting weights
-        self.initialization_weights = self.model.get_weights()
+        # Obtain recommended batch dtype for the DataGenerator
+        if precision == "mixed_float16" : self.meta_batch_dtype = "float16"
+        elif precision == "mixed_bfloat16" : self.meta_batch_dtype = "bfloat16"
+        else : self.meta_batch_dtype = None
 
     #---------------------------------------------#
     #               Class Variables               #
@@ -245,6 +321,35 @@ class NeuralNetwork:
     tf_lr_start = 1e-4
     tf_lr_end = 1e-5
 
+    #---------------------------------------------#
+    #                  Optimizer                  #
+    #---------------------------------------------#
+    """ Internal function for creating the Adam optimizer with the provided learning rate.
+
+        For the mixed_float16 precision, the optimizer is wrapped for dynamic loss scaling.
+    """
+    def __create_optimizer__(self, learning_rate):
+        optimizer = Adam(learning_rate=learning_rate)
+        if self.precision == "mixed_float16":
+            optimizer = mixed_precision.LossScaleOptimizer(optimizer)
+        return optimizer
+
+    #---------------------------------------------#
+    #               Initial Weights               #
+    #---------------------------------------------#
+    @property
+    def initialization_weights(self):
+        """ Initial weights of the neural network model (list of numpy.ndarray).
+
+        Snapshotted lazily on first access, which is at the latest before the first training.
+        """
+        if self._initialization_weights is None:
+            model = self._initialization_model
+            self._initialization_weights = model.get_weights()
+        # Release model reference after snapshot
+        self._initialization_model = None
+        return self._initialization_weights
+
     #---------------------------------------------#
     #                  Training                   #
     #---------------------------------------------#
@@ -288,6 +393,8 @@ class NeuralNetwork:
         Returns:
             history (dict):                   A history dictionary from a Keras history object which contains several logs.
         """
+        # Snapshot initial weights before they are modified
+        self.initialization_weights
         # Adjust number of iterations in training DataGenerator to allow repitition
         if iterations is not None : training_generator.set_length(iterations)
         # Running a standard training process
@@ -312,8 +419,9 @@ class NeuralNetwork:
                 if not lever and layer.name == "avg_pool" : lever = True
                 elif lever : layer.trainable = False
             # Compile model with high learning rate
-            self.model.compile(optimizer=Adam(learning_rate=self.tf_lr_start),
-                               loss=self.loss, metrics=self.metrics)
+            self.model.compile(optimizer=self.__create_optimizer__(self.tf_lr_start),
+                               loss=self.loss, metrics=self.metrics,
+                               jit_compile=self.jit_compile)
             # Run first training with frozen layers
             history_start = self.model.fit(training_generator,
                                            validation_data=validation_generator,
@@ -329,8 +437,9 @@ class NeuralNetwork:
             for layer in self.model.layers:
                 layer.trainable = True
             # Compile model with lower learning rate
-            self.model.compile(optimizer=Adam(learning_rate=self.tf_lr_end),
-                               loss=self.loss, metrics=self.metrics)
+            self.model.compile(optimizer=self.__create_optimizer__(self.tf_lr_end),
+                               loss=self.loss, metrics=self.metrics,
+                               jit_compile=self.jit_compile)
             # Run second training with unfrozed layers
             history_end = self.model.fit(training_generator,
                                          validation_data=validation_generator,
@@ -367,6 +476,10 @@ class NeuralNetwork:
         Returns:
             preds (numpy.ndarray):                  A NumPy array of predictions formatted with shape (n_samples, n_labels).
         """
+        # Run inference process with the XLA compiled predict function
+        if (self.jit_compile or self.graph_predict) and \
+            isinstance(prediction_generator, Sequence):
+            return self.__predict_compiled__(prediction_generator)
         # Run inference process with the Keras predict function
         preds = self.model.predict(prediction_generator, workers=self.workers,
                                    max_queue_size=self.batch_queue_size,
@@ -375,6 +488,217 @@ class NeuralNetwork:
         # Output predictions results
         return preds
 
+    def predict_arrays(self, images, metadata=None, batch_size=32, resize=True,
+                       standardize=True):
+        """ Prediction function for images which are already available in memory as NumPy arrays.
+
+        In contrast to [predict()][aucmedi.neural_network.model.NeuralNetwork.predict], no
+        [DataGenerator][aucmedi.data_processing.data_generator.DataGenerator] is required.
+        The images are resized to `meta_input` and standardized according to `meta_standardize`
+        (identical to a DataGenerator with `resize=model.meta_input` and `standardize_mode=model.meta_standardize`).
+
+        Images are processed in chunks of a fixed size. The standardization is applied on the
+        complete chunk at once and the model is called via the graph predict function with a fixed
+        input signature (final partial chunk is padded).
+
+        ???+ example
+            ```python
+            model = NeuralNetwork(n_labels=4, channels=3, architecture="2D.ResNet50")
+            # Predict a stacked NumPy array with shape (n_samples, x, y, channels)
+            preds = model.predict_arrays(images)
+            # Predict images from a stream (single images or batches)
+            preds = model.predict_arrays(image_stream, batch_size=64)
+            ```
+
+        ???+ info
+            Resizing is skipped for images which already have the shape `meta_input`.
+
+        Args:
+            images (numpy.ndarray or iterable):     A stacked array of images with shape (n_samples, x, y, (z,) channels) or
+                                                    an iterable (e.g. generator) of single images or batches of images.
+            metadata (numpy.ndarray):               Optional metadata for the images with shape (n_samples, meta_variables).
+            batch_size (int):                       Number of images which are predicted at once.
+            resize (bool):                          Option whether images should be resized to `meta_input`.
+            standardize (bool):                     Option whether images should be standardized according to `meta_standardize`.
+
+        Returns:
+            preds (numpy.ndarray):                  A NumPy array of predictions formatted with shape (n_samples, n_labels).
+        """
+        # Initialize resizing and standardization Subfunctions
+        sf_resize = Resize(shape=self.meta_input) if resize else None
+        if standardize and self.meta_standardize is not None:
+            sf_standardize = Standardize(mode=self.meta_standardize)
+        else : sf_standardize = None
+        # Transform a stacked array into chunks or stream images into chunks
+        if isinstance(images, np.ndarray):
+            chunks = (images[i:i+batch_size] \
+                      for i in range(0, len(images), batch_size))
+        else : chunks = self.__stream_chunks__(images, batch_size)
+
+        # Run inference for each chunk
+        preds = []
+        offset = 0
+        for chunk in chunks:
+            n = len(chunk)
+            if n == 0 : continue
+            # Resize images with deviating shape into a new chunk
+            if sf_resize is not None and \
+                    chunk.shape[1:-1] != tuple(self.meta_input):
+                batch = np.empty((n,) + tuple(self.meta_input) + \
+                                 chunk.shape[-1:], dtype=np.float32)
+                for i in range(n):
+                    batch[i] = sf_resize.transform(chunk[i])
+            # Copy chunk to avoid in-place modification of the provided images
+            else : batch = np.array(chunk, dtype=np.float32)
+            # Apply standardization on the complete chunk
+            if sf_standardize is not None:
+                batch = sf_standardize.transform_batch(batch)
+            # Add metadata to the input
+            inputs = [batch]
+            if metadata is not None:
+                inputs.append(metadata[offset:offset+n])
+            offset += n
+            # Run inference on the chunk
+            preds.append(self.__predict_batch__(inputs, batch_size))
+        # Output predictions results
+        if len(preds) == 0:
+            return np.zeros((0,) + tuple(self.model.output.shape[1:]),
+                            dtype=np.float32)
+        return np.concatenate(preds, axis=0)
+
+    def predict_on_batch(self, images, metadata=None, resize=True,
+                         standardize=True, batch_size=None):
+        """ Prediction function for a single batch of images available in memory as NumPy array.
+
+        Identical to [predict_arrays()][aucmedi.neural_network.model.NeuralNetwork.predict_arrays]
+        with the complete batch as single chunk.
+
+        By passing a `batch_size`, a partial batch is padded to this size. Thus, batches of varying
+        size (e.g. the final batch of a DataGenerator) share the same static shape for compiled inference.
+
+        Args:
+            images (numpy.ndarray):                 Batch of images with shape (n_samples, x, y, (z,) channels).
+            metadata (numpy.ndarray):               Optional metadata for the images with shape (n_samples, meta_variables).
+            resize (bool):                          Option whether images should be resized to `meta_input`.
+            standardize (bool):                     Option whether images should be standardized according to `meta_standardize`.
+            batch_size (int):                       Size to which the batch is padded. By default, the size of the batch.
+
+        Returns:
+            preds (numpy.ndarray):                  A NumPy array of predictions formatted with shape (n_samples, n_labels).
+        """
+        images = np.asarray(images)
+        if batch_size is None : batch_size = max(len(images), 1)
+        return self.predict_arrays(images, metadata=metadata,
+                                   batch_size=batch_size,
+                                   resize=resize, standardize=standardize)
+
+    """ Internal function for streaming single images or batches of images from an iterable
+        into chunks of a fixed size.
+    """
+    def __stream_chunks__(self, images, batch_size):
+        buffer = []
+        buffered = 0
+        for image in images:
+            image = np.asarray(image)
+            # Add batch axis to single images
+            if image.ndim == len(self.input_shape) : image = image[np.newaxis]
+            buffer.append(image)
+            buffered += len(image)
+            # Output chunks of the fixed size
+            while buffered >= batch_size:
+                chunk = self.__stack_images__(buffer)
+                yield chunk[:batch_size]
+                buffer = [chunk[batch_size:]]
+                buffered -= batch_size
+        # Output final partial chunk
+        if buffered > 0 : yield self.__stack_images__(buffer)
+
+    """ Internal function for stacking buffered images of a stream into a single array.
+
+        Images with a differing shape are resized to `meta_input` beforehand.
+    """
+    def __stack_images__(self, buffer):
+        if len(buffer) == 1 : return buffer[0]
+        shapes = set(x.shape[1:] for x in buffer)
+        if len(shapes) > 1:
+            sf_resize = Resize(shape=self.meta_input)
+            buffer = [np.stack([sf_resize.transform(img) for img in x]) \
+                      for x in buffer]
+        return np.concatenate(buffer, axis=0)
+
+    """ Internal function for running inference with the graph predict function.
+
+        The function has a fixed input signature derived from the input shape of the model.
+        The final partial batch is padded to the batch size of the generator. Thus, all
+        batches have the identical shape and the function is traced & compiled only once.
+
+        Batches are loaded in parallel with the configured workers and queue size.
+    """
+    def __predict_compiled__(self, prediction_generator):
+        # Initialize batch enqueuer for parallel batch loading
+        if self.workers > 0:
+            enqueuer = OrderedEnqueuer(prediction_generator, shuffle=False,
+                                 use_multiprocessing=self.multiprocessing)
+            enqueuer.start(workers=self.workers,
+                           max_queue_size=self.batch_queue_size)
+            batches = enqueuer.get()
+        else:
+            enqueuer = None
+            batches = (prediction_generator[i] for i in \
+                       range(len(prediction_generator)))
+        progbar = Progbar(len(prediction_generator)) if self.verbose else None
+        # Run inference for each batch
+        preds = []
+        try:
+            for i in range(len(prediction_generator)):
+                batch = next(batches)[0]
+                inputs = batch if isinstance(batch, (list, tuple)) else [batch]
+                size = getattr(prediction_generator, "batch_size", None)
+                preds.append(self.__predict_batch__(inputs, size))
+                if progbar is not None : progbar.update(i + 1)
+        finally:
+            if enqueuer is not None : enqueuer.stop()
+        # Output predictions results
+        return np.concatenate(preds, axis=0)
+
+    """ Internal function for running the graph predict function on a single batch.
+
+        The batch is padded to the provided size to obtain a static shape and the
+        predictions of the padded samples are removed afterwards.
+    """
+    def __predict_batch__(self, inputs, size=None):
+        inputs = [np.asarray(x) for x in inputs]
+        # Pad partial batch to obtain a static shape
+        n = len(inputs[0])
+        if size is not None and n < size:
+            inputs = [np.concatenate([x, np.zeros((size - n,) + x.shape[1:],
+                                                  dtype=x.dtype)])
+                      for x in inputs]
+        # Obtain graph predict function for the input specification
+        spec = tuple((x.shape[1:], x.dtype.name) for x in inputs)
+        if spec not in self.predict_functions:
+            self.predict_functions[spec] = \
+                self.__create_predict_function__(inputs)
+        # Run inference and remove predictions of padded samples
+        preds = self.predict_functions[spec](*inputs)
+        return preds.numpy()[:n]
+
+    """ Internal function for creating a graph predict function (optionally XLA compiled)
+        with a fixed input signature (variable batch dimension, fixed sample shape and dtype).
+
+        Inputs are cast to the input dtypes of the model inside the compiled function.
+    """
+    def __create_predict_function__(self, inputs):
+        signature = [tf.TensorSpec((None,) + x.shape[1:], tf.as_dtype(x.dtype))
+                     for x in inputs]
+        dtypes = [x.dtype for x in self.model.inputs]
+        def predict_step(*batch):
+            batch = [tf.cast(x, dtype) for x, dtype in zip(batch, dtypes)]
+            if len(batch) == 1 : batch = batch[0]
+            return self.model(batch, training=False)
+        return tf.function(predict_step, input_signature=signature,
+                           jit_compile=self.jit_compile)
+
     #---------------------------------------------#
     #               Model Management              #
     #---------------------------------------------#
@@ -412,6 +736,46 @@ class NeuralNetwork:
         """
         # Create model input path
         self.model = load_model(file_path, custom_objects, compile=False)
+        self.predict_functions = {}
         # Compile model
-        self.model.compile(optimizer=Adam(learning_rate=self.learning_rate),
-                           loss=self.loss, metrics=self.metrics)
+        self.model.compile(optimizer=self.__create_optimizer__(self.learning_rate),
+                           loss=self.loss, metrics=self.metrics,
+                           jit_compile=self.jit_compile)
+
+#-----------------------------------------------------#
+#                In-Process Model Cache               #
+#-----------------------------------------------------#
+# Cache of model configurations & initial weights for repeated construction
+model_cache = {}
+
+def clear_model_cache():
+    """ Release all cached model configurations and initial weights of the in-process model cache.
+
+    The model cache is utilized by the [NeuralNetwork][aucmedi.neural_network.model.NeuralNetwork]
+    class if `cache_model=True` is passed.
+    """
+    model_cache.clear()
+
+""" Internal function for storing the configuration and initial weights of a built
+    model in a model cache entry.
+
+    Layer classes of the model are stored as custom objects, which allows
+    rebuilding models with custom layers (e.g. Vision Transformer).
+"""
+def store_cached_model(model):
+    custom_objects = {}
+    for layer in model.submodules:
+        if isinstance(layer, Layer):
+            custom_objects[layer.__class__.__name__] = layer.__class__
+    return {"model_class": model.__class__,
+            "config": model.get_config(),
+            "custom_objects": custom_objects,
+            "weights": model.get_weights()}
+
+""" Internal function for building a new model from a model cache entry. """
+def load_cached_model(entry):
+    model = entry["model_class"].from_config(entry["config"],
+                                             entry["custom_objects"])
+    model.set_weights(entry["weights"])
+    return model
+
@@ -0,0 +1,162 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2022 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                    Documentation                    #
+#-----------------------------------------------------#
+""" Utilities for lazy importing of modules on first attribute access.
+
+Importing heavy dependencies like TensorFlow, SimpleITK or the various augmentation
+backends takes several seconds. Packages of AUCMEDI defer these imports until an
+attribute is accessed for the first time.
+
+???+ info "Lazy Importing"
+    - [lazy_attributes][aucmedi.utils.lazy_import.lazy_attributes] creates the module-level
+      `__getattr__` and `__dir__` functions of a package
+      ([PEP 562](https://peps.python.org/pep-0562/)).
+    - [LazyRegistry][aucmedi.utils.lazy_import.LazyRegistry] is a dictionary whose values are
+      imported on first access (e.g. the `architecture_dict`).
+"""
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+# External libraries
+from collections.abc import MutableMapping
+from collections import namedtuple
+import importlib
+
+#-----------------------------------------------------#
+#              Lazy Attributes of Modules             #
+#-----------------------------------------------------#
+def lazy_attributes(namespace, attributes):
+    """ Create module-level `__getattr__` and `__dir__` functions for lazy importing (PEP 562).
+
+    The corresponding module of an attribute is only imported when the attribute is accessed
+    for the first time. Afterwards, the attribute is stored in the namespace of the package.
+
+    ???+ example
+        ```python
+        # In the __init__.py of a package
+        __getattr__, __dir__ = lazy_attributes(globals(), {
+            "DataGenerator": "aucmedi.data_processing.data_generator",
+        })
+        ```
+
+    Args:
+        namespace (dict):               Namespace of the package (`globals()`).
+        attributes (dict):              Dictionary mapping attribute names to the module path which defines the attribute.
+
+    Returns:
+        __getattr__ (function):         Module-level attribute access function.
+        __dir__ (function):             Module-level directory function listing eager and lazy attributes.
+    """
+    def __getattr__(name):
+        # Verify that the attribute is a lazy attribute of the package
+        if name not in attributes:
+            raise AttributeError("module " + repr(namespace["__name__"]) + \
+                                 " has no attribute " + repr(name))
+        # Import module and store attribute in the namespace of the package
+        value = getattr(importlib.import_module(attributes[name]), name)
+        namespace[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace) | set(attributes))
+
+    return __getattr__, __dir__
+
+#-----------------------------------------------------#
+#                Lazy Registry Dictionary             #
+#-----------------------------------------------------#
+LazyEntry = namedtuple("LazyEntry", ["module", "attribute"])
+""" Reference to a not yet imported attribute of a module. """
+
+class LazyRegistry(MutableMapping):
+    """ Dictionary whose values are imported on first access.
+
+    Each value is referenced by the module path and attribute name. Keys, iteration and
+    membership tests do not import anything. Only accessing a value imports the
+    corresponding module.
+
+    Besides lazy entries, common objects can be assigned like in a Python dictionary.
+
+    ???+ example
+        ```python
+        registry = LazyRegistry({"Vanilla": "vanilla"},
+                                package="aucmedi.neural_network.architectures.image")
+        "Vanilla" in registry               # no import
+        arch_class = registry["Vanilla"]    # imports the architecture module
+        ```
+    """
+    def __init__(self, entries={}, package=None):
+        """ Initialization function for creating a LazyRegistry.
+
+        Args:
+            entries (dict):         Dictionary mapping keys to the module path of the corresponding value.
+                                    The attribute name of a value is identical to its key.
+            package (str):          Package path which is prepended to all module paths.
+                                    If `None` is provided, module paths have to be absolute.
+        """
+        self.entries = {}
+        for key in entries:
+            module = entries[key]
+            if package is not None : module = package + "." + module
+            self.entries[key] = LazyEntry(module, key)
+
+    #---------------------------------------------#
+    #               Entry Access                  #
+    #---------------------------------------------#
+    def entry(self, key):
+        """ Obtain the stored entry of a key without importing it.
+
+        The entry can be assigned to another registry without triggering an import.
+
+        Args:
+            key (str):              Key in the registry.
+
+        Returns:
+            entry (LazyEntry or object):    Reference of the not yet imported value or the value itself.
+        """
+        return self.entries[key]
+
+    def __getitem__(self, key):
+        value = self.entries[key]
+        # Import the value on first access
+        if isinstance(value, LazyEntry):
+            module = importlib.import_module(value.module)
+            value = getattr(module, value.attribute)
+            self.entries[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self.entries[key] = value
+
+    def __delitem__(self, key):
+        del self.entries[key]
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return "LazyRegistry(" + repr(list(self.entries)) + ")"
@@ -0,0 +1,101 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2022 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                    Documentation                    #
+#-----------------------------------------------------#
+""" Benchmark for the import time of AUCMEDI modules.
+
+Each import statement is executed several times in a fresh interpreter and the
+median wall-clock time as well as the loaded heavy dependencies are reported.
+Optionally, the detailed import profile of CPython (`python -X importtime`)
+is printed for the slowest imported modules.
+
+Usage:
+    python benchmarks/import_time.py [--repeats 5] [--importtime]
+"""
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+import argparse
+import subprocess
+import statistics
+import json
+import sys
+import os
+
+#-----------------------------------------------------#
+#                    Configurations                   #
+#-----------------------------------------------------#
+statements = ["import aucmedi",
+              "from aucmedi.neural_network.architectures import " + \
+              "architecture_dict, supported_standardize_mode",
+              "from aucmedi import input_interface",
+              "from aucmedi import *"]
+heavy_modules = ["tensorflow", "SimpleITK", "albumentations", "volumentations",
+                 "batchgenerators", "classification_models_3D"]
+path_repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#-----------------------------------------------------#
+#                     Subroutines                     #
+#-----------------------------------------------------#
+# Import a statement in a fresh interpreter and report time & modules
+def run_import(statement):
+    script = "import sys, time, json\n" + \
+             "start = time.perf_counter()\n" + \
+             statement + "\n" + \
+             "duration = time.perf_counter() - start\n" + \
+             "print(json.dumps({'time': duration, 'modules': " + \
+             "[m for m in " + str(heavy_modules) + " if m in sys.modules]}))"
+    output = subprocess.run([sys.executable, "-c", script], check=True,
+                            capture_output=True, text=True, cwd=path_repo).stdout
+    return json.loads(output.strip().split("\n")[-1])
+
+# Obtain the slowest modules (cumulative time) via python -X importtime
+def run_importtime(statement, top=10):
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                             statement], check=True, capture_output=True,
+                            text=True, cwd=path_repo).stderr
+    profile = []
+    for line in stderr.split("\n"):
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        (_, cumulative, module) = line[len("import time:"):].split("|")
+        profile.append((int(cumulative), module.strip()))
+    return sorted(profile, reverse=True)[:top]
+
+#-----------------------------------------------------#
+#                        Main                         #
+#-----------------------------------------------------#
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AUCMEDI import time benchmark")
+    parser.add_argument("--repeats", type=int, default=5,
+                        help="Number of fresh interpreters per statement")
+    parser.add_argument("--importtime", action="store_true",
+                        help="Print the slowest modules via -X importtime")
+    args = parser.parse_args()
+
+    for statement in statements:
+        results = [run_import(statement) for _ in range(args.repeats)]
+        duration = statistics.median([r["time"] for r in results])
+        print("Import time '" + statement.replace("\n", " ") + "':",
+              round(duration, 3), "s", "| heavy modules:",
+              results[0]["modules"])
+        if args.importtime:
+            for (cumulative, module) in run_importtime(statement):
+                print("    ", str(round(cumulative / 1e6, 3)) + "s", module)
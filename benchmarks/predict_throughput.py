@@ -0,0 +1,120 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2022 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                    Documentation                    #
+#-----------------------------------------------------#
+""" Benchmark for the inference throughput of the NeuralNetwork predict modes.
+
+Compares `predict()` with the default Keras predict function ("eager"), the graph
+predict function (`graph_predict=True`) and the XLA compiled predict function
+(`jit_compile=True`) on random in-memory images. Samples are preloaded into the
+in-memory cache of the DataGenerator, thus only preprocessing and inference are measured.
+
+Usage:
+    python benchmarks/predict_throughput.py [--architectures 2D.Vanilla 2D.MobileNetV2]
+                                            [--samples 256] [--batch_size 16] [--repeats 3]
+
+    AUCMEDI has to be installed (e.g. via `pip install -e .`) or located in the `PYTHONPATH`.
+"""
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+import argparse
+import tempfile
+import time
+import os
+import numpy as np
+from PIL import Image
+from aucmedi import DataGenerator, NeuralNetwork
+
+#-----------------------------------------------------#
+#                    Configurations                   #
+#-----------------------------------------------------#
+# Predict modes encoded as (jit_compile, graph_predict)
+modes = {"eager": (False, False),
+         "graph": (False, True),
+         "xla": (True, True)}
+
+#-----------------------------------------------------#
+#                     Subroutines                     #
+#-----------------------------------------------------#
+# Create random RGB images in a temporary directory
+def create_dataset(path_dir, n_samples, shape):
+    samples = []
+    for i in range(0, n_samples):
+        img = np.random.rand(shape[0], shape[1], 3) * 255
+        index = "sample_" + str(i) + ".png"
+        Image.fromarray(img.astype(np.uint8)).save(os.path.join(path_dir,
+                                                                index))
+        samples.append(index)
+    return samples
+
+# Measure the throughput (samples per second) of predict()
+def run_predict(model, datagen, repeats):
+    # Warm-up run for tracing/compilation and filling the memory cache
+    preds = model.predict(datagen)
+    durations = []
+    for _ in range(0, repeats):
+        start = time.perf_counter()
+        model.predict(datagen)
+        durations.append(time.perf_counter() - start)
+    return len(datagen.samples) / min(durations), preds
+
+#-----------------------------------------------------#
+#                        Main                         #
+#-----------------------------------------------------#
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AUCMEDI predict throughput " + \
+                                                 "benchmark")
+    parser.add_argument("--architectures", nargs="+",
+                        default=["2D.Vanilla", "2D.MobileNetV2"],
+                        help="Architectures to benchmark")
+    parser.add_argument("--samples", type=int, default=256,
+                        help="Number of samples")
+    parser.add_argument("--shape", type=int, nargs=2, default=[64, 64],
+                        help="Image shape (height, width)")
+    parser.add_argument("--batch_size", type=int, default=16,
+                        help="Batch size of the DataGenerator")
+    parser.add_argument("--repeats", type=int, default=3,
+                        help="Number of timed predict() calls per mode")
+    args = parser.parse_args()
+
+    tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                           suffix=".benchmark")
+    samples = create_dataset(tmp_data.name, args.samples, args.shape)
+    datagen = DataGenerator(samples, tmp_data.name, resize=tuple(args.shape),
+                            shuffle=False, batch_size=args.batch_size,
+                            memory_cache_size=10**9)
+
+    for arch in args.architectures:
+        preds_ref = None
+        for mode, (jit_compile, graph_predict) in modes.items():
+            model = NeuralNetwork(n_labels=4, channels=3, verbose=0,
+                                  input_shape=tuple(args.shape),
+                                  architecture=arch, jit_compile=jit_compile,
+                                  graph_predict=graph_predict)
+            # Share weights for comparing the predictions across modes
+            if preds_ref is None : weights = model.model.get_weights()
+            else : model.model.set_weights(weights)
+            throughput, preds = run_predict(model, datagen, args.repeats)
+            if preds_ref is None : preds_ref = preds
+            deviation = np.max(np.abs(preds - preds_ref))
+            print("Throughput", arch, mode + ":", round(throughput, 1),
+                  "samples/s", "| max deviation to eager:",
+                  format(deviation, ".2e"))
@@ -24,6 +24,7 @@ import unittest
 import numpy as np
 #Internal libraries
 from aucmedi.ensemble.aggregate import *
+from aucmedi.ensemble.aggregate.agg_base import Aggregate_Base
 
 #-----------------------------------------------------#
 #             Unittest: Aggregate Functions           #
@@ -85,3 +86,31 @@ class AggregateTEST(unittest.TestCase):
         agg_func = aggregate_dict["global_argmax"]()
         pred = agg_func.aggregate(self.pred_data.copy())
         self.assertTrue(np.array_equal(pred.shape, (8,)))
+
+    #-------------------------------------------------#
+    #              Aggregate: Batch Mode              #
+    #-------------------------------------------------#
+    def test_Aggregate_batch(self):
+        # Create predictions of 4 or 5 models for 20 samples
+        for n_models in [4, 5]:
+            preds = np.random.rand(n_models, 20, 8)
+            preds[0, 3] = preds[1, 3]       # identical predictions of two models
+            for key in aggregate_dict:
+                agg_func = aggregate_dict[key]()
+                pred_batch = agg_func.aggregate_batch(preds.copy())
+                self.assertTrue(np.array_equal(pred_batch.shape, (20, 8)))
+                # Compare with aggregation of single samples
+                pred_single = np.asarray([agg_func.aggregate(preds[:,i,:]) \
+                                          for i in range(20)])
+                self.assertTrue(np.allclose(pred_batch, pred_single))
+
+    def test_Aggregate_batch_fallback(self):
+        # Custom Aggregate function without batch implementation
+        class Custom_Aggregate(Aggregate_Base):
+            def __init__(self):
+                pass
+            def aggregate(self, preds):
+                return np.max(preds, axis=0)
+        preds = np.random.rand(5, 20, 8)
+        pred_batch = Custom_Aggregate().aggregate_batch(preds)
+        self.assertTrue(np.array_equal(pred_batch, np.max(preds, axis=0)))
@@ -26,6 +26,9 @@ import tempfile
 from PIL import Image
 import os
 import shutil
+import threading
+import time
+import gc
 #Internal libraries
 from aucmedi import DataGenerator
 from aucmedi.data_processing.io_loader import numpy_loader
@@ -203,6 +206,88 @@ class DataGeneratorTEST(unittest.TestCase):
             batch = data_gen[i]
             self.assertTrue(len(batch), 2)
             self.assertTrue(np.array_equal(batch[1].shape, (5, 4)))
+        pool = data_gen.pool
+        self.assertIsNotNone(pool)
+        data_gen[0]
+        self.assertIs(data_gen.pool, pool)
+        data_gen.shutdown()
+        self.assertIsNone(data_gen.pool)
+
+    def test_MP_process(self):
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 labels=self.labels_ohe, resize=(32, 32),
+                                 grayscale=False, batch_size=5, workers=2,
+                                 worker_backend="process")
+        data_ref = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 labels=self.labels_ohe, resize=(32, 32),
+                                 grayscale=False, batch_size=5)
+        for i in range(0, 6):
+            batch = data_gen[i]
+            batch_ref = data_ref[i]
+            self.assertTrue(len(batch), 2)
+            self.assertTrue(np.array_equal(batch[0].shape, (5, 32, 32, 3)))
+            self.assertTrue(np.allclose(batch[0], batch_ref[0]))
+            self.assertTrue(np.array_equal(batch[1], batch_ref[1]))
+        self.assertIsNotNone(data_gen.shm_buffer)
+        data_gen.shutdown()
+        self.assertIsNone(data_gen.shm_buffer)
+
+    def test_MP_process_garbage_collection(self):
+        from multiprocessing import shared_memory, active_children
+        children = active_children()
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 labels=self.labels_ohe, resize=(32, 32),
+                                 grayscale=False, batch_size=5, workers=2,
+                                 worker_backend="process")
+        for i in range(0, 2):
+            data_gen[i]
+        workers = [p for p in active_children() if p not in children]
+        self.assertEqual(len(workers), 2)
+        shm_name = data_gen.shm_buffer.name
+        # Delete generator -> worker processes and buffer are released
+        del data_gen
+        gc.collect()
+        for p in workers : p.join(timeout=10)
+        self.assertFalse(any(p.is_alive() for p in workers))
+        self.assertRaises(FileNotFoundError, shared_memory.SharedMemory,
+                          name=shm_name)
+
+    def test_Prefetch(self):
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 labels=self.labels_ohe, resize=None,
+                                 standardize_mode=None, grayscale=False,
+                                 batch_size=5, workers=2, prefetch=2)
+        data_ref = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 labels=self.labels_ohe, resize=None,
+                                 standardize_mode=None, grayscale=False,
+                                 batch_size=5)
+        for i in range(0, 10):
+            batch = data_gen[i]
+            batch_ref = data_ref[i]
+            self.assertTrue(np.array_equal(batch[0], batch_ref[0]))
+            self.assertTrue(np.array_equal(batch[1], batch_ref[1]))
+            self.assertTrue(len(data_gen.prefetch_queue) <= 2)
+        data_gen.on_epoch_end()
+        self.assertTrue(len(data_gen.prefetch_queue) == 0)
+        data_gen.shutdown()
+        self.assertIsNone(data_gen.prefetch_pool)
+
+    def test_Prefetch_garbage_collection(self):
+        n_threads = threading.active_count()
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 labels=self.labels_ohe, resize=None,
+                                 standardize_mode=None, grayscale=False,
+                                 batch_size=5, workers=4, prefetch=3)
+        data_gen[0]
+        self.assertTrue(threading.active_count() > n_threads)
+        # Delete generator with outstanding prefetch tasks
+        del data_gen
+        gc.collect()
+        for i in range(0, 50):
+            if threading.active_count() == n_threads : break
+            time.sleep(0.1)
+            gc.collect()
+        self.assertEqual(threading.active_count(), n_threads)
 
     #-------------------------------------------------#
     #             Beforehand Preprocessing            #
@@ -231,6 +316,221 @@ class DataGeneratorTEST(unittest.TestCase):
             self.assertTrue(np.array_equal(batch[1].shape, (5, 4)))
         shutil.rmtree(data_gen.prepare_dir)
 
+    def test_PrepareImages_memmap(self):
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 labels=self.labels_ohe, prepare_images=True,
+                                 grayscale=False, batch_size=5)
+        data_ref = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 labels=self.labels_ohe, grayscale=False,
+                                 batch_size=5)
+        self.assertTrue(os.path.exists(os.path.join(data_gen.prepare_dir,
+                                                    "images.npy")))
+        self.assertTrue(np.all(data_gen.prepare_store.offsets >= 0))
+        for i in range(0, 5):
+            batch = data_gen[i]
+            batch_ref = data_ref[i]
+            self.assertTrue(np.allclose(batch[0], batch_ref[0]))
+
+    def test_PrepareImages_fallback(self):
+        # Create images with variable shape
+        tmp_var = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                              suffix=".data")
+        sample_list = []
+        for i in range(0, 6):
+            img = np.random.rand(16 + i % 2, 16, 3) * 255
+            index = "image.sample_" + str(i) + ".png"
+            Image.fromarray(img.astype(np.uint8)).save(
+                                        os.path.join(tmp_var.name, index))
+            sample_list.append(index)
+        data_gen = DataGenerator(sample_list, tmp_var.name, resize=None,
+                                 standardize_mode=None, prepare_images=True,
+                                 grayscale=False, batch_size=2, workers=2)
+        self.assertTrue(np.array_equal(data_gen.prepare_store.offsets,
+                                       [0, -1, 2, -1, 4, -1]))
+        for i in range(0, 6):
+            img = data_gen.preprocess_image(i, prepared_image=True)
+            self.assertTrue(np.array_equal(img.shape, (16 + i % 2, 16, 3)))
+
+    def test_PrepareImages_float_inplace(self):
+        # Float images are standardized in-place (e.g. via Keras functions)
+        for mode in ["tf", "caffe", "torch"]:
+            data_gen = DataGenerator(self.sampleList_rgb_3D, self.tmp_data.name,
+                                     labels=self.labels_ohe, resize=None,
+                                     loader=numpy_loader, two_dim=False,
+                                     standardize_mode=mode,
+                                     prepare_images=True, grayscale=False,
+                                     batch_size=5)
+            data_ref = DataGenerator(self.sampleList_rgb_3D, self.tmp_data.name,
+                                     labels=self.labels_ohe, resize=None,
+                                     loader=numpy_loader, two_dim=False,
+                                     standardize_mode=mode, grayscale=False,
+                                     batch_size=5)
+            for i in range(0, 2):
+                self.assertTrue(np.allclose(data_gen[0][0], data_ref[0][0]))
+
+    #-------------------------------------------------#
+    #              Decode-time Downscaling            #
+    #-------------------------------------------------#
+    def test_DecodeSize(self):
+        # Create large image
+        tmp_large = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                                suffix=".data")
+        img = np.random.rand(256, 192, 3) * 255
+        Image.fromarray(img.astype(np.uint8)).save(os.path.join(tmp_large.name,
+                                                                "large.png"))
+        # Resizing shape is used as decode size by default
+        data_gen = DataGenerator(["large.png"], tmp_large.name, resize=(32, 32),
+                                 standardize_mode=None, batch_size=1)
+        self.assertEqual(data_gen.kwargs["decode_size"], (32, 32))
+        img_loaded = data_gen.sample_loader("large.png", tmp_large.name,
+                                            **data_gen.kwargs)
+        self.assertTrue(img_loaded.shape[0] >= 32 and img_loaded.shape[0] < 256)
+        self.assertTrue(img_loaded.shape[1] == 32)
+        self.assertTrue(np.array_equal(data_gen[0][0].shape, (1, 32, 32, 3)))
+        # No decode size for Subfunctions, volumes or explicit deactivation
+        from aucmedi.data_processing.subfunctions import Crop
+        for data_gen in [DataGenerator(["large.png"], tmp_large.name,
+                                       resize=(32, 32),
+                                       subfunctions=[Crop(shape=(64, 64))]),
+                         DataGenerator(["large.png"], tmp_large.name,
+                                       resize=(32, 32), decode_size=None),
+                         DataGenerator(self.sampleList_rgb_3D,
+                                       self.tmp_data.name, resize=(8, 8, 8),
+                                       loader=numpy_loader, two_dim=False)]:
+            self.assertIsNone(data_gen.kwargs.get("decode_size", None))
+
+    #-------------------------------------------------#
+    #               Persistent Cache                  #
+    #-------------------------------------------------#
+    def test_CacheDir(self):
+        tmp_cache = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                                suffix=".cache")
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 labels=self.labels_ohe, resize=(32, 32),
+                                 cache_dir=tmp_cache.name, batch_size=5)
+        batch_a = data_gen[0]
+        self.assertTrue(len(os.listdir(tmp_cache.name)) == 5)
+        # Reuse cache with a new DataGenerator instance
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 labels=self.labels_ohe, resize=(32, 32),
+                                 cache_dir=tmp_cache.name, batch_size=5)
+        self.assertIsNotNone(data_gen.cache.load(self.sampleList_rgb_2D[0]))
+        batch_b = data_gen[0]
+        self.assertTrue(np.allclose(batch_a[0], batch_b[0]))
+        self.assertTrue(len(os.listdir(tmp_cache.name)) == 5)
+        # Changed pipeline results into different keys
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 labels=self.labels_ohe, resize=(48, 48),
+                                 cache_dir=tmp_cache.name, batch_size=5)
+        self.assertIsNone(data_gen.cache.load(self.sampleList_rgb_2D[0]))
+        batch_c = data_gen[0]
+        self.assertTrue(np.array_equal(batch_c[0].shape, (5, 48, 48, 3)))
+        self.assertTrue(len(os.listdir(tmp_cache.name)) == 10)
+
+    def test_MemoryCache(self):
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 labels=self.labels_ohe, resize=(32, 32),
+                                 memory_cache_size=10*32*32*3,
+                                 batch_size=5)
+        batch_a = data_gen[0]
+        self.assertTrue(data_gen.memory_cache.stats()["misses"] == 5)
+        batch_b = data_gen[0]
+        self.assertTrue(data_gen.memory_cache.stats()["hits"] == 5)
+        self.assertTrue(np.allclose(batch_a[0], batch_b[0]))
+        # Verify LRU eviction based on byte budget
+        for i in range(1, 5):
+            data_gen[i]
+        stats = data_gen.memory_cache.stats()
+        self.assertTrue(stats["entries"] == 10)
+        self.assertTrue(stats["bytes"] <= 10*32*32*3)
+        self.assertIsNone(data_gen.memory_cache.load(0))
+        self.assertIsNotNone(data_gen.memory_cache.load(24))
+
+    def test_MemoryCache_float_inplace(self):
+        # Float images are standardized in-place (e.g. via Keras functions)
+        data_gen = DataGenerator(self.sampleList_rgb_3D, self.tmp_data.name,
+                                 labels=self.labels_ohe, resize=None,
+                                 loader=numpy_loader, two_dim=False,
+                                 standardize_mode="tf", grayscale=False,
+                                 memory_cache_size=10**8, batch_size=5)
+        data_ref = DataGenerator(self.sampleList_rgb_3D, self.tmp_data.name,
+                                 labels=self.labels_ohe, resize=None,
+                                 loader=numpy_loader, two_dim=False,
+                                 standardize_mode="tf", grayscale=False,
+                                 batch_size=5)
+        for i in range(0, 2):
+            self.assertTrue(np.allclose(data_gen[0][0], data_ref[0][0]))
+        self.assertTrue(data_gen.memory_cache.stats()["hits"] == 5)
+        # Cached entry is private and loaded images are writeable
+        img = np.zeros((4, 4))
+        data_gen.memory_cache.store("x", img)
+        self.assertTrue(img.flags.writeable)
+        self.assertTrue(data_gen.memory_cache.load("x").flags.writeable)
+
+    #-------------------------------------------------#
+    #            Batch-level Standardization          #
+    #-------------------------------------------------#
+    def test_StandardizeBatch(self):
+        for mode in ["z-score", "minmax", "tf", "torch"]:
+            data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                     resize=(32, 32), grayscale=False,
+                                     batch_size=8, standardize_mode=mode)
+            data_gen_batch = DataGenerator(self.sampleList_rgb_2D,
+                                           self.tmp_data.name,
+                                           resize=(32, 32), grayscale=False,
+                                           batch_size=8, standardize_mode=mode,
+                                           standardize_batch=True,
+                                           standardize_validate=0.5)
+            for i in range(len(data_gen)):
+                batch = data_gen_batch[i]
+                self.assertTrue(batch[0].dtype == np.float32)
+                self.assertTrue(np.allclose(batch[0], data_gen[i][0],
+                                            atol=1e-3))
+
+    def test_BatchDtype(self):
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 resize=(32, 32), grayscale=False, batch_size=8)
+        for batch_dtype in ["float16", "bfloat16"]:
+            data_gen_half = DataGenerator(self.sampleList_rgb_2D,
+                                          self.tmp_data.name, resize=(32, 32),
+                                          grayscale=False, batch_size=8,
+                                          batch_dtype=batch_dtype)
+            batch = data_gen_half[0][0]
+            self.assertEqual(str(batch.dtype), batch_dtype)
+            self.assertTrue(np.allclose(batch.astype(np.float32),
+                                        data_gen[0][0], atol=0.05, rtol=0.01))
+
+    #-------------------------------------------------#
+    #              TensorFlow Data Export             #
+    #-------------------------------------------------#
+    def test_TFDataset(self):
+        data_gen = DataGenerator(self.sampleList_rgb_2D, self.tmp_data.name,
+                                 labels=self.labels_ohe, resize=(32, 32),
+                                 grayscale=False, batch_size=8)
+        ds = data_gen.to_tf_dataset(cache=True)
+        for i, batch in enumerate(ds):
+            batch_ref = data_gen[i]
+            self.assertTrue(len(batch) == 2)
+            self.assertTrue(np.allclose(batch[0].numpy(), batch_ref[0],
+                                        atol=1e-5))
+            self.assertTrue(np.array_equal(batch[1].numpy(), batch_ref[1]))
+        self.assertTrue(i == 3)
+
+    def test_TFDataset_metadata(self):
+        data_gen = DataGenerator(self.sampleList_rgb_3D, self.tmp_data.name,
+                                 labels=self.labels_ohe, metadata=self.metadata,
+                                 sample_weights=np.ones(25), shuffle=True,
+                                 grayscale=False, batch_size=5, two_dim=False,
+                                 loader=numpy_loader, resize=None,
+                                 standardize_mode=None)
+        ds = data_gen.to_tf_dataset()
+        for batch in ds:
+            self.assertTrue(len(batch) == 3)
+            self.assertTrue(np.array_equal(batch[0][0].shape, (5, 16, 16, 16, 3)))
+            self.assertTrue(np.array_equal(batch[0][1].shape, (5, 10)))
+            self.assertTrue(np.array_equal(batch[1].shape, (5, 4)))
+            self.assertTrue(np.array_equal(batch[2].shape, (5,)))
+
     #-------------------------------------------------#
     #                   Utilization                   #
     #-------------------------------------------------#
@@ -27,7 +27,7 @@ from PIL import Image
 import numpy as np
 #Internal libraries
 from aucmedi import DataGenerator, NeuralNetwork, ImageAugmentation, VolumeAugmentation
-from aucmedi.data_processing.io_loader import numpy_loader
+from aucmedi.data_processing.io_loader import numpy_loader, image_loader
 from aucmedi.ensemble import *
 
 #-----------------------------------------------------#
@@ -103,6 +103,24 @@ class EnsembleTEST(unittest.TestCase):
                                    n_cycles=1, aggregate="mean")
         self.assertTrue(np.array_equal(preds.shape, (3, 2)))
 
+    def test_Augmenting_2D_loadOnce(self):
+        # Initialize DataGenerator with a counting image loader
+        loaded = []
+        def counting_loader(sample, path_imagedir, **kwargs):
+            loaded.append(sample)
+            return image_loader(sample, path_imagedir, **kwargs)
+        datagen = DataGenerator(self.sampleList2D, self.tmp_data.name,
+                                batch_size=8, resize=None, data_aug=None,
+                                grayscale=False, subfunctions=[],
+                                standardize_mode="tf", workers=0,
+                                loader=counting_loader)
+        # Run inference augmenting and verify that samples are loaded once
+        preds = predict_augmenting(self.model2D, datagen,
+                                   n_cycles=4, aggregate="mean")
+        self.assertTrue(np.array_equal(preds.shape, (3, 2)))
+        self.assertTrue(set(loaded) == set(self.sampleList2D))
+        self.assertEqual(len(loaded), 3)
+
     def test_Augmenting_3D_functionality(self):
         # Test functionality with batch_size 3 and n_cycles = 1
         datagen = DataGenerator(self.sampleList3D, self.tmp_data.name,
@@ -179,6 +197,33 @@ class EnsembleTEST(unittest.TestCase):
         del el
         self.assertFalse(os.path.exists(path_tmp_bagging))
 
+    def test_Bagging_training_parallel(self):
+        # Initialize training DataGenerator
+        datagen = DataGenerator(self.sampleList2D, self.tmp_data.name,
+                                labels=self.labels_ohe, batch_size=3, resize=None,
+                                data_aug=None, grayscale=False, subfunctions=[],
+                                standardize_mode="tf", workers=0)
+        # Initialize Bagging object with parallel fold training
+        callbacks = []
+        el = Bagging(model=self.model2D, k_fold=3, n_parallel=2)
+        # Run Bagging based training process
+        hist = el.train(datagen, epochs=2, iterations=None,
+                        callbacks=callbacks)
+
+        self.assertIsInstance(hist, dict)
+        for i in range(3):
+            self.assertTrue("cv_" + str(i) + ".loss" in hist)
+            self.assertTrue("cv_" + str(i) + ".val_loss" in hist)
+            self.assertTrue(os.path.exists(os.path.join(el.cache_dir.name,
+                                           "cv_" + str(i) + ".model.hdf5")))
+        # Check that the provided callback list was not modified
+        self.assertTrue(len(callbacks) == 0)
+
+        # Delete cached models
+        path_tmp_bagging = el.cache_dir.name
+        el.cache_dir.cleanup()
+        self.assertFalse(os.path.exists(path_tmp_bagging))
+
     def test_Bagging_predict(self):
         # Initialize training DataGenerator
         datagen = DataGenerator(self.sampleList2D, self.tmp_data.name,
@@ -203,6 +248,36 @@ class EnsembleTEST(unittest.TestCase):
         self.assertTrue(np.array_equal(preds.shape, (3,2)))
         self.assertTrue(np.array_equal(ensemble.shape, (2,3,2)))
 
+    def test_Bagging_predict_inference(self):
+        # Initialize training DataGenerator
+        datagen = DataGenerator(self.sampleList2D, self.tmp_data.name,
+                                labels=self.labels_ohe, batch_size=3, resize=None,
+                                data_aug=None, grayscale=False, subfunctions=[],
+                                standardize_mode="tf", workers=0)
+        # Check inference mode exception
+        self.assertRaises(ValueError, Bagging, self.model2D, inference="gpu")
+        # Train model and run inference in separate processes
+        el = Bagging(model=self.model2D, k_fold=2)
+        el.train(datagen, epochs=1, iterations=None)
+        preds_process = el.predict(datagen, aggregate="mean")
+        # Run inference with resident models
+        el.inference = "resident"
+        preds = el.predict(datagen, aggregate="mean")
+        self.assertTrue(np.allclose(preds, preds_process, atol=1e-5))
+        self.assertTrue(len(el.resident_models) == 2)
+        models = list(el.resident_models.values())
+        preds = el.predict(datagen, aggregate="mean")
+        self.assertTrue(np.allclose(preds, preds_process, atol=1e-5))
+        self.assertTrue(list(el.resident_models.values()) == models)
+        # Run inference with sequentially loaded models
+        import tensorflow as tf
+        uid = tf.keras.backend.get_uid("aucmedi_probe")
+        el.inference = "sequential"
+        preds = el.predict(datagen, aggregate="mean")
+        self.assertTrue(np.allclose(preds, preds_process, atol=1e-5))
+        # Global Keras state of the user is kept
+        self.assertEqual(tf.keras.backend.get_uid("aucmedi_probe"), uid + 1)
+
     def test_Bagging_dump(self):
         # Initialize training DataGenerator
         datagen = DataGenerator(self.sampleList2D, self.tmp_data.name,
@@ -417,6 +492,59 @@ class EnsembleTEST(unittest.TestCase):
         self.assertTrue(np.array_equal(preds.shape, (12,2)))
         self.assertTrue(np.array_equal(ensemble.shape, (2,12,2)))
 
+    def test_Stacking_predict_inference(self):
+        # Initialize training DataGenerator
+        datagen = DataGenerator(np.repeat(self.sampleList2D, 4),
+                                self.tmp_data.name,
+                                labels=np.repeat(self.labels_ohe, 4, axis=0),
+                                batch_size=3, resize=None,
+                                data_aug=None, grayscale=False, subfunctions=[],
+                                standardize_mode="tf", workers=0)
+        # Train models and run inference in separate processes
+        el = Stacking(model_list=[self.model2D, self.model2D],
+                      metalearner="mean")
+        el.train(datagen, epochs=1, iterations=1)
+        _, ensemble_process = el.predict(datagen, return_ensemble=True)
+        # Run inference in the current process
+        for inference in ["resident", "sequential"]:
+            el.inference = inference
+            _, ensemble = el.predict(datagen, return_ensemble=True)
+            self.assertTrue(np.allclose(ensemble, ensemble_process, atol=1e-5))
+        self.assertTrue(len(el.resident_models) == 2)
+
+    def test_Stacking_predict_fanout(self):
+        # Initialize training DataGenerator
+        datagen = DataGenerator(np.repeat(self.sampleList2D, 4),
+                                self.tmp_data.name,
+                                labels=np.repeat(self.labels_ohe, 4, axis=0),
+                                batch_size=3, resize=None,
+                                data_aug=None, grayscale=False, subfunctions=[],
+                                standardize_mode="tf", workers=0)
+        # Train models
+        el = Stacking(model_list=[self.model2D, self.model2D, self.model2D],
+                      metalearner="mean", inference="resident")
+        el.train(datagen, epochs=1, iterations=1)
+        # Initialize prediction DataGenerator with a counting image loader
+        loaded = []
+        def counting_loader(sample, path_imagedir, **kwargs):
+            loaded.append(sample)
+            return datagen.sample_loader(sample, path_imagedir, **kwargs)
+        datagen_pred = DataGenerator(np.repeat(self.sampleList2D, 4),
+                                     self.tmp_data.name, labels=None,
+                                     batch_size=3, resize=None, data_aug=None,
+                                     grayscale=False, subfunctions=[],
+                                     standardize_mode="tf", workers=0,
+                                     loader=counting_loader)
+        # Run inference and verify that each sample is only loaded once
+        preds, ensemble = el.predict(datagen_pred, return_ensemble=True)
+        self.assertTrue(np.array_equal(ensemble.shape, (3,12,2)))
+        self.assertTrue(len(loaded) == 12)
+        # Compare with sequential inference (one model at a time)
+        el.inference = "sequential"
+        _, ensemble_sequential = el.predict(datagen_pred, return_ensemble=True)
+        self.assertTrue(np.allclose(ensemble, ensemble_sequential, atol=1e-5))
+        self.assertTrue(len(loaded) >= 12 + 3*12)
+
     def test_Stacking_dump(self):
         # Initialize training DataGenerator
         datagen = DataGenerator(np.repeat(self.sampleList2D, 4),
@@ -640,6 +768,26 @@ class EnsembleTEST(unittest.TestCase):
         self.assertTrue(np.array_equal(preds.shape, (18,2)))
         self.assertTrue(np.array_equal(ensemble.shape, (2,18,2)))
 
+    def test_Composite_predict_inference(self):
+        # Initialize training DataGenerator
+        datagen = DataGenerator(np.repeat(self.sampleList2D, 4),
+                                self.tmp_data.name,
+                                labels=np.repeat(self.labels_ohe, 4, axis=0),
+                                batch_size=3, resize=None,
+                                data_aug=None, grayscale=False, subfunctions=[],
+                                standardize_mode="tf", workers=0)
+        # Train models and run inference in separate processes
+        el = Composite(model_list=[self.model2D, self.model2D], k_fold=2,
+                       metalearner="mean")
+        el.train(datagen, epochs=1, iterations=1)
+        _, ensemble_process = el.predict(datagen, return_ensemble=True)
+        # Run inference in the current process
+        for inference in ["resident", "sequential"]:
+            el.inference = inference
+            _, ensemble = el.predict(datagen, return_ensemble=True)
+            self.assertTrue(np.allclose(ensemble, ensemble_process, atol=1e-5))
+        self.assertTrue(len(el.resident_models) == 2)
+
     def test_Composite_dump(self):
         # Initialize training DataGenerator
         datagen = DataGenerator(np.repeat(self.sampleList2D, 6),
@@ -29,6 +29,7 @@ import json
 import os
 #Internal libraries
 from aucmedi.data_processing.io_interfaces import *
+from aucmedi.data_processing.io_data import input_interface
 
 #-----------------------------------------------------#
 #               Unittest: IO Interfaces               #
@@ -234,3 +235,128 @@ class IOinterfacesTEST(unittest.TestCase):
                         ohe=True, col_sample="index")
         self.assertTrue(len(ds[0]), 25)
         self.assertTrue(len(ds[1]), 25)
+
+    def test_CSV_streaming(self):
+        # Create imaging data
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        data = {}
+        for i in range(0, 25):
+            img = np.random.rand(16, 16, 3) * 255
+            img_pillow = Image.fromarray(img.astype(np.uint8))
+            index = "image.sample_" + str(i) + ".png"
+            data[index[:-4]] = ["class_" + str(np.random.randint(5)),
+                                np.random.randint(2), np.random.randint(2)]
+            path_sample = os.path.join(tmp_data.name, index)
+            img_pillow.save(path_sample)
+        # Create CSV data
+        tmp_csv = tempfile.NamedTemporaryFile(mode="w", prefix="tmp.aucmedi.",
+                                              suffix=".csv")
+        df = pd.DataFrame.from_dict(data, orient="index",
+                                    columns=["class", "a", "b"])
+        df.index.name = "index"
+        df.to_csv(tmp_csv.name, index=True, header=True)
+
+        # Compare streamed with complete parsing for all annotation modes
+        for paras in [{"training": False},
+                      {"training": True, "ohe": False, "col_class": "class"},
+                      {"training": True, "ohe": True, "ohe_range": ["a", "b"]}]:
+            ds = csv_loader(path_data=tmp_csv.name,
+                            path_imagedir=tmp_data.name,
+                            allowed_image_formats=self.aif,
+                            col_sample="index", **paras)
+            ds_stream = csv_loader(path_data=tmp_csv.name,
+                                   path_imagedir=tmp_data.name,
+                                   allowed_image_formats=self.aif,
+                                   col_sample="index", chunksize=7, **paras)
+            self.assertIsInstance(ds_stream[0], np.ndarray)
+            self.assertEqual(ds_stream[0].tolist(), ds[0])
+            self.assertEqual(ds_stream[2:], ds[2:])
+            if paras["training"]:
+                self.assertEqual(ds_stream[1].dtype, np.uint8)
+                self.assertTrue(np.array_equal(ds_stream[1], ds[1]))
+
+    #-------------------------------------------------#
+    #             Scanning & Index File               #
+    #-------------------------------------------------#
+    def test_missing_image(self):
+        # Create imaging data
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        data = {}
+        for i in range(0, 10):
+            img = np.random.rand(16, 16, 3) * 255
+            img_pillow = Image.fromarray(img.astype(np.uint8))
+            index = "image.sample_" + str(i) + ".png"
+            data[index[:-4]] = i % 2
+            path_sample = os.path.join(tmp_data.name, index)
+            img_pillow.save(path_sample)
+        data["image.missing"] = 0
+        # Create CSV data
+        tmp_csv = tempfile.NamedTemporaryFile(mode="w", prefix="tmp.aucmedi.",
+                                              suffix=".csv")
+        df = pd.DataFrame.from_dict(data, orient="index", columns=["class"])
+        df.index.name = "index"
+        df.to_csv(tmp_csv.name, index=True, header=True)
+        # Run CSV IO
+        self.assertRaises(Exception, csv_loader, path_data=tmp_csv.name,
+                          path_imagedir=tmp_data.name,
+                          allowed_image_formats=self.aif, training=False,
+                          col_sample="index", workers=4)
+
+    def test_index_file(self):
+        # Create imaging data with subdirectories
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        for i in range(0, 3):
+            os.mkdir(os.path.join(tmp_data.name, "class_" + str(i)))
+        for i in range(0, 12):
+            img = np.random.rand(16, 16, 3) * 255
+            img_pillow = Image.fromarray(img.astype(np.uint8))
+            index = "image.sample_" + str(i) + ".png"
+            label_dir = "class_" + str((i % 3))
+            path_sample = os.path.join(tmp_data.name, label_dir, index)
+            img_pillow.save(path_sample)
+        tmp_index = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                                suffix=".index")
+        index_file = os.path.join(tmp_index.name, "index.npz")
+        # Create index file
+        ds = input_interface("directory", tmp_data.name, workers=4,
+                             index_file=index_file)
+        self.assertTrue(os.path.exists(index_file))
+        mtime = os.stat(index_file).st_mtime_ns
+        # Load dataset from index file
+        ds_index = input_interface("directory", tmp_data.name, workers=4,
+                                   index_file=index_file)
+        self.assertTrue(os.stat(index_file).st_mtime_ns == mtime)
+        self.assertTrue(ds_index[0] == ds[0])
+        self.assertTrue(np.array_equal(ds_index[1], ds[1]))
+        self.assertTrue(ds_index[1].dtype == ds[1].dtype)
+        self.assertTrue(ds_index[2:] == ds[2:])
+        with np.load(index_file) as index:
+            self.assertTrue(len(index["file_sizes"]) == 12)
+        # Overwriting a sample file in-place is only detected via file validation
+        img = np.random.rand(24, 24, 3) * 255
+        Image.fromarray(img.astype(np.uint8)).save(path_sample)
+        ds_index = input_interface("directory", tmp_data.name, workers=4,
+                                   index_file=index_file)
+        self.assertTrue(os.stat(index_file).st_mtime_ns == mtime)
+        ds_index = input_interface("directory", tmp_data.name, workers=4,
+                                   index_file=index_file,
+                                   index_validate="files")
+        self.assertTrue(os.stat(index_file).st_mtime_ns != mtime)
+        self.assertTrue(ds_index[0] == ds[0])
+        self.assertRaises(ValueError, input_interface, "directory",
+                          tmp_data.name, index_file=index_file,
+                          index_validate="all")
+        # Recreate index file after dataset change
+        img_pillow.save(os.path.join(tmp_data.name, "class_0", "new.png"))
+        ds_changed = input_interface("directory", tmp_data.name, workers=4,
+                                     index_file=index_file)
+        self.assertTrue(len(ds_changed[0]) == 13)
+        # Recreate index file after parameter change
+        ds_test = input_interface("directory",
+                                  os.path.join(tmp_data.name, "class_1"),
+                                  training=False, index_file=index_file)
+        self.assertTrue(len(ds_test[0]) == 4)
+        self.assertTrue(ds_test[1] is None)
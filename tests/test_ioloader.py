@@ -99,6 +99,30 @@ class IOloaderTEST(unittest.TestCase):
                                grayscale=False)
             self.assertTrue(np.array_equal(img.shape, self.img_2d_rgb.shape))
 
+    # Test for decode-time downscaling
+    def test_image_loader_decodesize(self):
+        # Create temporary directory
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        img_large = np.random.rand(300, 400, 3) * 255
+        for format in ["jpg", "png"]:
+            # Create image
+            img_pillow = Image.fromarray(img_large.astype(np.uint8))
+            index = "image.sample." + format
+            path_sample = os.path.join(tmp_data.name, index)
+            img_pillow.save(path_sample)
+            # Load image via loader
+            for grayscale in [False, True]:
+                img = image_loader(index, tmp_data.name, image_format=None,
+                                   grayscale=grayscale, decode_size=(64, 48))
+                self.assertTrue(img.shape[0] >= 64 and img.shape[0] < 150)
+                self.assertTrue(img.shape[1] >= 48 and img.shape[1] < 200)
+                self.assertTrue(img.shape[2] == (1 if grayscale else 3))
+        # Test DataGenerator
+        data_gen = DataGenerator(["image.sample.jpg"], tmp_data.name,
+                                 resize=(32, 32), decode_size=(32, 32))
+        self.assertTrue(np.array_equal(data_gen[0][0].shape, (1, 32, 32, 3)))
+
     #-------------------------------------------------#
     #                  NumPy Loader                   #
     #-------------------------------------------------#
@@ -182,6 +206,32 @@ class IOloaderTEST(unittest.TestCase):
                                grayscale=False, two_dim=False)
             self.assertTrue(np.array_equal(img.shape, self.img_3d_rgb.shape))
 
+    # Test for memory-mapped mode
+    def test_numpy_loader_mmap(self):
+        # Create temporary directory
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        # Create images
+        np.save(os.path.join(tmp_data.name, "gray.npy"),
+                np.squeeze(self.img_3d_gray, axis=-1))
+        np.save(os.path.join(tmp_data.name, "rgb.npy"), self.img_3d_rgb)
+        # Load images via loader
+        for mmap_mode in ["r", "c"]:
+            img = numpy_loader("gray.npy", tmp_data.name, grayscale=True,
+                               two_dim=False, mmap_mode=mmap_mode)
+            self.assertTrue(isinstance(img, np.memmap))
+            self.assertTrue(np.array_equal(img, self.img_3d_gray))
+            img = numpy_loader("rgb.npy", tmp_data.name, grayscale=False,
+                               two_dim=False, mmap_mode=mmap_mode)
+            self.assertTrue(isinstance(img, np.memmap))
+            self.assertTrue(np.array_equal(img, self.img_3d_rgb))
+        # Test DataGenerator
+        data_gen = DataGenerator(["gray.npy"], tmp_data.name,
+                                 loader=numpy_loader, grayscale=True,
+                                 two_dim=False, mmap_mode="c", resize=None,
+                                 standardize_mode="tf")
+        self.assertTrue(np.array_equal(data_gen[0][0].shape, (1, 16, 16, 16, 1)))
+
     #-------------------------------------------------#
     #                   sITK Loader                   #
     #-------------------------------------------------#
@@ -281,6 +331,168 @@ class IOloaderTEST(unittest.TestCase):
             batch = data_gen[i]
             self.assertTrue(np.array_equal(batch[0].shape, (1, 18, 10, 10, 1)))
 
+    # Test for patch loading
+    def test_sitk_loader_Patch(self):
+        # Create temporary directory
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        # Create image
+        index = "3Dimage.sample.nii"
+        path_sample = os.path.join(tmp_data.name, index)
+        image_sitk = sitk.GetImageFromArray(self.img_3d_hu)
+        image_sitk.SetSpacing([0.5,1.5,2.0])
+        image_sitk.SetOrigin([3.0,-2.0,5.0])
+        sitk.WriteImage(image_sitk, path_sample)
+        # Compare patches with cropped complete volume
+        for resampling in [(1.0, 1.0, 1.0), None]:
+            img = sitk_loader(index, tmp_data.name, resampling=resampling)
+            img_padded = np.pad(img, [(20, 20)] * 3 + [(0, 0)])
+            for position in [None, (0.0, 0.0, 0.0), (1.0, 0.3, 0.7)]:
+                for patch_shape in [(8, 8, 8), (40, 12, 20)]:
+                    patch = sitk_loader(index, tmp_data.name,
+                                        resampling=resampling,
+                                        patch_shape=patch_shape,
+                                        patch_position=position)
+                    self.assertTrue(np.array_equal(patch.shape,
+                                                   patch_shape + (1,)))
+                    # Identify patch location in complete volume
+                    slices = []
+                    for axis in range(3):
+                        diff = img.shape[axis] - patch_shape[axis]
+                        if diff < 0 : start = -((-diff) // 2)
+                        elif position is None : start = diff // 2
+                        else : start = min(int(position[axis] * (diff + 1)),
+                                           diff)
+                        slices.append(slice(start + 20,
+                                            start + 20 + patch_shape[axis]))
+                    self.assertTrue(np.allclose(patch,
+                                                img_padded[tuple(slices)]))
+        # Load random patches via DataGenerator
+        data_gen = DataGenerator([index], tmp_data.name, loader=sitk_loader,
+                                 resize=None, standardize_mode=None,
+                                 grayscale=True, batch_size=1,
+                                 patch_shape=(8, 8, 8), patch_mode="random")
+        batch = data_gen[0]
+        self.assertTrue(np.array_equal(batch[0].shape, (1, 8, 8, 8, 1)))
+        self.assertRaises(ValueError, DataGenerator, [index], tmp_data.name,
+                          loader=sitk_loader, patch_shape=(8, 8, 8),
+                          memory_cache_size=1000)
+
+    # Test for persistent resampling cache
+    def test_sitk_loader_ResamplingCache(self):
+        # Create temporary directories
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        tmp_cache = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                                suffix=".cache")
+        # Create image
+        index = "3Dimage.sample.mha"
+        path_sample = os.path.join(tmp_data.name, index)
+        image_sitk = sitk.GetImageFromArray(self.img_3d_hu)
+        image_sitk.SetSpacing([0.5,1.5,2.0])
+        sitk.WriteImage(image_sitk, path_sample)
+        img_ref = sitk_loader(index, tmp_data.name)
+        # Create and reuse cache entry
+        for i in range(2):
+            img = sitk_loader(index, tmp_data.name,
+                              resampling_cache=tmp_cache.name)
+            self.assertTrue(np.array_equal(img, img_ref))
+            self.assertTrue(len(os.listdir(tmp_cache.name)) == 1)
+        self.assertTrue(isinstance(img, np.memmap))
+        # Create new entry for other resampling parameters
+        img = sitk_loader(index, tmp_data.name, resampling=(2.0, 2.0, 2.0),
+                          resampling_cache=tmp_cache.name)
+        self.assertTrue(len(os.listdir(tmp_cache.name)) == 2)
+        # Crop patch out of cached volume
+        patch = sitk_loader(index, tmp_data.name, patch_shape=(8, 8, 8),
+                            patch_position=(0.2, 0.5, 1.0),
+                            resampling_cache=tmp_cache.name)
+        patch_ref = sitk_loader(index, tmp_data.name, patch_shape=(8, 8, 8),
+                                patch_position=(0.2, 0.5, 1.0))
+        self.assertTrue(np.allclose(patch, patch_ref))
+
+    #-------------------------------------------------#
+    #                 Archive Loader                  #
+    #-------------------------------------------------#
+    def test_archive_loader(self):
+        # Create temporary directories
+        tmp_data = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                               suffix=".data")
+        tmp_archive = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                                  suffix=".archive")
+        # Create dataset
+        sample_list = []
+        for i in range(0, 6):
+            img_pillow = Image.fromarray(self.img_2d_rgb.astype(np.uint8))
+            index = "image.sample_" + str(i)
+            img_pillow.save(os.path.join(tmp_data.name, index + ".png"))
+            sample_list.append(index)
+        # Build archive with multiple shards
+        path_index = build_archive(sample_list, tmp_data.name,
+                                   tmp_archive.name, image_format="png",
+                                   shard_size=2000)
+        self.assertTrue(os.path.exists(path_index))
+        self.assertTrue(len(os.listdir(tmp_archive.name)) > 2)
+        # Load samples via loader
+        for index in sample_list:
+            for grayscale in [False, True]:
+                img = archive_loader(index, tmp_archive.name,
+                                     image_format="png", grayscale=grayscale)
+                img_ref = image_loader(index, tmp_data.name,
+                                       image_format="png", grayscale=grayscale)
+                self.assertTrue(np.array_equal(img, img_ref))
+        self.assertRaises(ValueError, archive_loader, "unknown",
+                          tmp_archive.name)
+        # Build archive for NumPy files
+        tmp_archive_npy = tempfile.TemporaryDirectory(prefix="tmp.aucmedi.",
+                                                      suffix=".archive")
+        np.save(os.path.join(tmp_data.name, "volume.npy"),
+                np.squeeze(self.img_3d_gray, axis=-1))
+        build_archive(["volume"], tmp_data.name, tmp_archive_npy.name,
+                      image_format="npy")
+        img = archive_loader("volume", tmp_archive_npy.name, grayscale=True,
+                             two_dim=False)
+        self.assertTrue(np.array_equal(img, self.img_3d_gray))
+        # Build archive for compressed NumPy files
+        np.savez(os.path.join(tmp_data.name, "volume_z.npz"),
+                 np.squeeze(self.img_3d_gray, axis=-1))
+        np.savez(os.path.join(tmp_data.name, "multi.npz"), a=np.zeros(1),
+                 b=np.zeros(1))
+        build_archive(["volume_z", "multi"], tmp_data.name,
+                      tmp_archive_npy.name, image_format="npz")
+        img = archive_loader("volume_z", tmp_archive_npy.name, grayscale=True,
+                             two_dim=False)
+        self.assertTrue(np.array_equal(img, self.img_3d_gray))
+        self.assertRaises(ValueError, archive_loader, "multi",
+                          tmp_archive_npy.name)
+        # Rebuilding the archive replaces the cached reader
+        self.assertRaises(ValueError, archive_loader, "volume",
+                          tmp_archive_npy.name)
+        self.assertFalse(any(f.endswith(".tmp") for f in \
+                             os.listdir(tmp_archive_npy.name)))
+        # Index version is not checked for each sample
+        from aucmedi.data_processing.io_loader.archive_loader import get_archive
+        reader = get_archive(tmp_archive_npy.name)
+        checked = reader.checked
+        for i in range(0, 5):
+            archive_loader("volume_z", tmp_archive_npy.name, grayscale=True,
+                           two_dim=False)
+        self.assertIs(get_archive(tmp_archive_npy.name), reader)
+        self.assertEqual(reader.checked, checked)
+        # Empty sample files result in an empty shard
+        open(os.path.join(tmp_data.name, "empty.npy"), "wb").close()
+        build_archive(["empty"], tmp_data.name, tmp_archive_npy.name,
+                      image_format="npy")
+        self.assertEqual(get_archive(tmp_archive_npy.name).read("empty"),
+                         (b"", "npy"))
+        # Test DataGenerator
+        data_gen = DataGenerator(sample_list, tmp_archive.name,
+                                 image_format="png", loader=archive_loader,
+                                 resize=None, grayscale=False, batch_size=2)
+        for i in range(0, 3):
+            batch = data_gen[i]
+            self.assertTrue(np.array_equal(batch[0].shape, (2, 16, 16, 3)))
+
     #-------------------------------------------------#
     #                  Cache Loader                   #
     #-------------------------------------------------#
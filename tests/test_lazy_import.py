@@ -0,0 +1,94 @@
+#==============================================================================#
+#  Author:       Dominik Müller                                                #
+#  Copyright:    2022 IT-Infrastructure for Translational Medical Research,    #
+#                University of Augsburg                                        #
+#                                                                              #
+#  This program is free software: you can redistribute it and/or modify        #
+#  it under the terms of the GNU General Public License as published by        #
+#  the Free Software Foundation, either version 3 of the License, or           #
+#  (at your option) any later version.                                         #
+#                                                                              #
+#  This program is distributed in the hope that it will be useful,             #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+#  GNU General Public License for more details.                                #
+#                                                                              #
+#  You should have received a copy of the GNU General Public License           #
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#==============================================================================#
+#-----------------------------------------------------#
+#                   Library imports                   #
+#-----------------------------------------------------#
+#External libraries
+import unittest
+import subprocess
+import json
+import sys
+#Internal libraries
+from aucmedi.utils.lazy_import import LazyRegistry
+
+#-----------------------------------------------------#
+#                Unittest: Lazy Import                #
+#-----------------------------------------------------#
+class LazyImportTEST(unittest.TestCase):
+    # Import a statement in a fresh interpreter and report loaded modules
+    def run_import(self, statement):
+        script = "import sys, json\n" + \
+                 statement + "\n" + \
+                 "heavy = ['tensorflow', 'SimpleITK', 'albumentations', " + \
+                 "'volumentations', 'batchgenerators', " + \
+                 "'classification_models_3D']\n" + \
+                 "print(json.dumps({'modules': " + \
+                 "[m for m in heavy if m in sys.modules], " + \
+                 "'names': sorted(k for k in dir() if k[0] != '_')}))"
+        output = subprocess.run([sys.executable, "-c", script], check=True,
+                                capture_output=True, text=True).stdout
+        return json.loads(output.strip().split("\n")[-1])
+
+    #-------------------------------------------------#
+    #                 Deferred Imports                #
+    #-------------------------------------------------#
+    def test_import_aucmedi(self):
+        result = self.run_import("import aucmedi")
+        self.assertNotIn("tensorflow", result["modules"])
+        self.assertEqual(result["modules"], [])
+
+    def test_import_architectures(self):
+        result = self.run_import("from aucmedi.neural_network.architectures " + \
+                                 "import architecture_dict, " + \
+                                 "supported_standardize_mode\n" + \
+                                 "assert '3D.ResNet50' in architecture_dict")
+        self.assertEqual(result["modules"], [])
+
+    def test_import_pillars(self):
+        result = self.run_import("from aucmedi import *")
+        self.assertIn("tensorflow", result["modules"])
+        for name in ["DataGenerator", "NeuralNetwork", "input_interface",
+                     "ImageAugmentation", "VolumeAugmentation",
+                     "BatchgeneratorsAugmentation", "data_processing",
+                     "neural_network"]:
+            self.assertIn(name, result["names"])
+
+    def test_import_architectures_star(self):
+        result = self.run_import("from aucmedi.neural_network." + \
+                                 "architectures.volume import *")
+        for name in ["Vanilla", "ResNet50", "architecture_dict",
+                     "architectures", "supported_standardize_mode"]:
+            self.assertIn(name, result["names"])
+
+    #-------------------------------------------------#
+    #                  Lazy Registry                  #
+    #-------------------------------------------------#
+    def test_LazyRegistry(self):
+        registry = LazyRegistry({"dumps": "json", "loads": "json"})
+        self.assertEqual(list(registry), ["dumps", "loads"])
+        self.assertTrue("dumps" in registry)
+        self.assertFalse("dump" in registry)
+        self.assertEqual(registry["dumps"], json.dumps)
+        # Transfer entries and assign common objects
+        combined = LazyRegistry()
+        combined["x.loads"] = registry.entry("loads")
+        combined["x.len"] = len
+        self.assertEqual(combined["x.loads"], json.loads)
+        self.assertEqual(combined["x.len"], len)
+        self.assertRaises(KeyError, combined.__getitem__, "x.dumps")
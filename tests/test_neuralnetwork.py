@@ -110,3 +110,142 @@ class NeuralNetworkTEST(unittest.TestCase):
         self.assertTrue(preds.shape == (10, 4))
         for i in range(0, 10):
             self.assertTrue(np.sum(preds[i]) >= 0.99 and np.sum(preds[i]) <= 1.01)
+
+    #-------------------------------------------------#
+    #            Model Cache & Initial Weights        #
+    #-------------------------------------------------#
+    def test_reset_weights(self):
+        model = NeuralNetwork(n_labels=4, channels=3, batch_queue_size=1)
+        weights_init = model.model.get_weights()
+        model.train(training_generator=self.datagen, epochs=2)
+        model.reset_weights()
+        for w_reset, w_init in zip(model.model.get_weights(), weights_init):
+            self.assertTrue(np.array_equal(w_reset, w_init))
+
+    def test_model_cache(self):
+        from aucmedi.neural_network.model import model_cache, clear_model_cache
+        clear_model_cache()
+        model_a = NeuralNetwork(n_labels=4, channels=3, batch_queue_size=1,
+                                input_shape=(32, 32), cache_model=True)
+        model_b = NeuralNetwork(n_labels=4, channels=3, batch_queue_size=1,
+                                input_shape=(32, 32), cache_model=True)
+        self.assertEqual(len(model_cache), 1)
+        self.assertIsNot(model_a.model, model_b.model)
+        self.assertIs(model_a.initialization_weights,
+                      model_b.initialization_weights)
+        datagen = DataGenerator(self.sampleList_rgb, self.tmp_data.name,
+                                resize=(32, 32), shuffle=False, batch_size=3)
+        preds_a = model_a.predict(datagen)
+        preds_b = model_b.predict(datagen)
+        self.assertTrue(np.allclose(preds_a, preds_b))
+        # Training of a cached model does not affect the other model
+        model_a.train(training_generator=self.datagen, epochs=2)
+        self.assertTrue(np.allclose(model_b.predict(datagen), preds_b))
+        model_a.reset_weights()
+        self.assertTrue(np.allclose(model_a.predict(datagen), preds_b))
+        clear_model_cache()
+        self.assertEqual(len(model_cache), 0)
+
+    #-------------------------------------------------#
+    #                 Mixed Precision                 #
+    #-------------------------------------------------#
+    def test_mixed_precision(self):
+        for precision in ["mixed_float16", "mixed_bfloat16"]:
+            model = NeuralNetwork(n_labels=4, channels=3, batch_queue_size=1,
+                                  input_shape=(32, 32), precision=precision)
+            self.assertEqual(model.model.layers[1].dtype_policy.name, precision)
+            self.assertEqual(model.model.output.dtype, "float32")
+            datagen = DataGenerator(self.sampleList_rgb, self.tmp_data.name,
+                                    labels=self.labels_ohe, resize=(32, 32),
+                                    batch_size=3,
+                                    batch_dtype=model.meta_batch_dtype)
+            hist = model.train(training_generator=datagen, epochs=1)
+            self.assertTrue("loss" in hist)
+            preds = model.predict(datagen)
+            self.assertTrue(preds.shape == (10, 4))
+            self.assertTrue(np.allclose(np.sum(preds, axis=-1), 1.0,
+                                        atol=0.01))
+        self.assertRaises(ValueError, NeuralNetwork, n_labels=4, channels=3,
+                          precision="float8")
+
+    #-------------------------------------------------#
+    #               Compiled Inference                #
+    #-------------------------------------------------#
+    def test_predict_compiled(self):
+        datagen = DataGenerator(self.sampleList_rgb, self.tmp_data.name,
+                                resize=(32, 32), shuffle=False, batch_size=3)
+        model = NeuralNetwork(n_labels=4, channels=3, batch_queue_size=1,
+                              input_shape=(32, 32))
+        preds = model.predict(datagen)
+        for jit_compile in [False, True]:
+            model_compiled = NeuralNetwork(n_labels=4, channels=3,
+                                           batch_queue_size=1,
+                                           input_shape=(32, 32),
+                                           jit_compile=jit_compile,
+                                           graph_predict=True)
+            model_compiled.model.set_weights(model.model.get_weights())
+            preds_compiled = model_compiled.predict(datagen)
+            self.assertTrue(preds_compiled.shape == (10, 4))
+            self.assertTrue(np.allclose(preds, preds_compiled, atol=1e-5))
+            # Final partial batch is padded -> single traced function
+            self.assertEqual(len(model_compiled.predict_functions), 1)
+        # Training with XLA compiled train step
+        hist = model_compiled.train(training_generator=self.datagen, epochs=1)
+        self.assertTrue("loss" in hist)
+
+    def test_predict_compiled_padding(self):
+        model = NeuralNetwork(n_labels=4, channels=3, batch_queue_size=1,
+                              input_shape=(32, 32), architecture="2D.Vanilla")
+        # Batch size exceeds the number of samples -> single padded batch
+        for samples in [self.sampleList_rgb[:1], self.sampleList_rgb[:7]]:
+            datagen = DataGenerator(samples, self.tmp_data.name,
+                                    resize=(32, 32), shuffle=False,
+                                    batch_size=8)
+            preds = model.predict(datagen)
+            for jit_compile in [False, True]:
+                model_compiled = NeuralNetwork(n_labels=4, channels=3,
+                                               batch_queue_size=1,
+                                               input_shape=(32, 32),
+                                               architecture="2D.Vanilla",
+                                               jit_compile=jit_compile,
+                                               graph_predict=True)
+                model_compiled.model.set_weights(model.model.get_weights())
+                preds_compiled = model_compiled.predict(datagen)
+                self.assertEqual(preds_compiled.shape, (len(samples), 4))
+                self.assertTrue(np.allclose(preds, preds_compiled, atol=1e-5))
+
+    #-------------------------------------------------#
+    #              In-Memory Array Inference          #
+    #-------------------------------------------------#
+    def test_predict_arrays(self):
+        from aucmedi.data_processing.io_loader import image_loader
+        model = NeuralNetwork(n_labels=4, channels=3, batch_queue_size=1,
+                              input_shape=(24, 24), architecture="2D.Vanilla")
+        datagen = DataGenerator(self.sampleList_rgb, self.tmp_data.name,
+                                resize=model.meta_input, shuffle=False,
+                                standardize_mode=model.meta_standardize,
+                                batch_size=3)
+        preds = model.predict(datagen)
+        # Load images into memory
+        images = np.stack([image_loader(sample, self.tmp_data.name) \
+                           for sample in self.sampleList_rgb])
+        images_copy = images.copy()
+        # Predict stacked array
+        preds_arrays = model.predict_arrays(images, batch_size=4)
+        self.assertTrue(preds_arrays.shape == (10, 4))
+        self.assertTrue(np.allclose(preds, preds_arrays, atol=1e-4))
+        self.assertTrue(np.array_equal(images, images_copy))
+        # Predict stream of single images and batches
+        def stream():
+            yield images[0]
+            yield images[1:6]
+            for img in images[6:] : yield img
+        preds_stream = model.predict_arrays(stream(), batch_size=4)
+        self.assertTrue(np.allclose(preds, preds_stream, atol=1e-4))
+        # Predict single batch
+        preds_batch = model.predict_on_batch(images[:5])
+        self.assertTrue(np.allclose(preds[:5], preds_batch, atol=1e-4))
+        # Predict partial batch padded to a fixed batch size
+        preds_batch = model.predict_on_batch(images[:3], batch_size=5)
+        self.assertTrue(preds_batch.shape == (3, 4))
+        self.assertTrue(np.allclose(preds[:3], preds_batch, atol=1e-4))
@@ -152,6 +152,26 @@ class SubfunctionsTEST(unittest.TestCase):
                     self.assertTrue(np.amax(img_pp) >= 0)
             # self.assertRaises(ValueError, sf.transform, self.img3Dhu.copy())
 
+    def test_STANDARDIZE_transform_batch(self):
+        for mode in ["z-score", "minmax", "grayscale", "tf", "caffe", "torch"]:
+            sf = Standardize(mode=mode)
+            for data in [self.img2Drgb, self.img3Drgb]:
+                batch = np.stack([data, data[::-1] * 0.5, data * 0.1], axis=0)
+                img_ref = np.stack([sf.transform(img.copy()) for img in batch])
+                batch_pp = sf.transform_batch(batch.copy())
+                self.assertTrue(batch_pp.dtype == np.float32)
+                self.assertTrue(np.array_equal(batch_pp.shape, batch.shape))
+                self.assertTrue(np.allclose(batch_pp, img_ref, atol=1e-3))
+        # Range validation
+        batch = np.stack([self.img2Drgb, self.img2Drgb - 500], axis=0)
+        sf = Standardize(mode="tf")
+        self.assertRaises(ValueError, sf.transform_batch, batch.copy())
+        sf = Standardize(mode="tf", validate=False)
+        batch_pp = sf.transform_batch(batch.copy())
+        sf = Standardize(mode="tf", validate=0.0)
+        batch_pp = sf.transform_batch(batch.copy())
+        self.assertRaises(ValueError, Standardize, mode="tf", validate=2.0)
+
     #-------------------------------------------------#
     #              Subfunction: Cropping              #
     #-------------------------------------------------#
@@ -243,3 +263,59 @@ class SubfunctionsTEST(unittest.TestCase):
         self.assertTrue(np.array_equal(img_filtered.shape, (16, 24, 32, 3)))
         self.assertRaises(ValueError, sf.transform, self.img3Dhu.copy())
         self.assertRaises(ValueError, sf.transform, self.img2Drgb.copy())
+
+    #-------------------------------------------------#
+    #              Subfunction: Pipeline              #
+    #-------------------------------------------------#
+    def test_PIPELINE_create(self):
+        sf = SubfunctionPipeline()
+        sf = SubfunctionPipeline([Padding(), Crop(shape=(8, 8))],
+                                 resize=Resize(shape=(16, 16)))
+        self.assertTrue([s[0] for s in sf.plan] == ["padcrop", "transform"])
+        sf = SubfunctionPipeline([Clip(min=0), Standardize(mode="minmax"),
+                                  Padding(), Crop(shape=(8, 8))])
+        self.assertTrue([s[0] for s in sf.plan] == ["clipscale", "padcrop"])
+
+    def test_PIPELINE_transform(self):
+        chains = [
+            ([Standardize(mode="grayscale"), Padding(mode="square"),
+              Crop(shape=(20, 12, 16)), Chromer(target="rgb"),
+              Standardize(mode="z-score")], Resize(shape=(8, 8, 8)),
+             [self.img3Dgray, self.img3Dhu]),
+            ([Clip(min=0, max=200), Padding(mode="constant", shape=(20, 20)),
+              Crop(shape=(18, 10)), Standardize(mode="minmax")],
+             Resize(shape=(12, 12)), [self.img2Dgray, self.img2Drgb]),
+            ([Padding(mode="edge", shape=(32, 16)), Crop(shape=(24, 24)),
+              Clip(max=100.0)], None, [self.img2Drgb]),
+            ([Padding(mode="square"), Crop(shape=(10, 10)),
+              Standardize(mode="z-score")], None, [self.img2Drgb]),
+            ([Padding(mode="square"), Crop(shape=(24, 10))], None,
+             [self.img2Drgb]),
+            ([Clip(min=-200, max=300), Standardize(mode="minmax")], None,
+             [self.img3Dhu, self.img2Dgray]),
+            ([Clip(min=100.3), Standardize(mode="grayscale")], None,
+             [self.img3Dhu, self.img2Drgb, self.img2Drgb.astype(np.float64)]),
+            ([Clip(max=-1000), Standardize(mode="minmax")], None,
+             [self.img3Dhu]),
+            ([Clip(min=10, max=20), Standardize(mode="grayscale")], None,
+             [np.uint8(self.img2Drgb)]),
+        ]
+        for (sf_list, sf_resize, data_list) in chains:
+            pipeline = SubfunctionPipeline(sf_list, resize=sf_resize)
+            for data in data_list:
+                # Sequential application
+                img_seq = data.copy()
+                for sf in sf_list : img_seq = sf.transform(img_seq)
+                if sf_resize is not None : img_seq = sf_resize.transform(img_seq)
+                # Pipeline application
+                img_input = data.copy()
+                img_pp = pipeline.transform(img_input)
+                self.assertTrue(np.array_equal(img_input, data))
+                self.assertTrue(img_pp.dtype == img_seq.dtype)
+                self.assertTrue(np.array_equal(img_pp, img_seq))
+                self.assertFalse(np.may_share_memory(img_pp, img_input))
+        # Cropping error is kept
+        pipeline = SubfunctionPipeline([Padding(mode="edge", shape=(8, 8)),
+                                        Crop(shape=(32, 32))],
+                                       resize=Resize(shape=(8, 8)))
+        self.assertRaises(ValueError, pipeline.transform, self.img2Drgb.copy())